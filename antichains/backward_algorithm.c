@@ -213,12 +213,12 @@ pre_I(antichain* a, antichain* prev_a, graph_p graph) {
         tup = (tuple*) curlink->data;
         node = tup->node;
         //get predecessors of node
-        adjlist_node_p adjListPtr = graph->pred[node].head;
+        int k;
         // Go trough predecessors
-        while (adjListPtr)
+        for (k = graph->pred_offsets[node]; k < graph->pred_offsets[node + 1]; k++)
         {
             // current predecessor
-            pred = adjListPtr->vertex;
+            pred = graph->pred[k];
 
             // only consider predecessors that belong to player 1 (0) not 2 (1)
             if(graph->players[pred] == 1) {
@@ -247,8 +247,6 @@ pre_I(antichain* a, antichain* prev_a, graph_p graph) {
                     toremove[pred] = 1;
                 }
             }
-
-            adjListPtr = adjListPtr->next;
         }
         /**
         int i;
@@ -300,11 +298,11 @@ pre_1(antichain *a, antichain *prev_a, graph_p graph) {
         if (graph->players[i] == 1) {
             //printf("Node %d player %d\n",i,graph->players[i] );
             //pour chaque successuer
-            adjlist_node_p adjListPtr = graph->succ[i].head;
             int first_iter = 0;
+            int k;
 
-            while (adjListPtr) {
-                succ = adjListPtr->vertex;
+            for (k = graph->succ_offsets[i]; k < graph->succ_offsets[i + 1]; k++) {
+                succ = graph->succ[k];
 
                 //on considère ce succ et on applique down sur l'ensemble des noeuds (v,m) de l'anti ou v est le succ considere ici
                 GSList *curlink = a->incomparable_elements;
@@ -357,8 +355,6 @@ pre_1(antichain *a, antichain *prev_a, graph_p graph) {
                     temp2 = compute_antichains_intersection(temp2,   temp1
                             ,(void*)compare_tuples,(void*)compute_tuples_intersection, (void*)clone_tuple, (void*)free_tuple_full);
                 }
-
-                adjListPtr = adjListPtr->next;
             }
 
             cur_antichain = compute_antichains_union(cur_antichain, temp2, (void*)compare_tuples, (void*)free_tuple_full);
@@ -390,12 +386,12 @@ pre_O(antichain* a, antichain* prev_a, graph_p graph) {
         tup = (tuple*) curlink->data;
         node = tup->node;
         //get predecessors of node
-        adjlist_node_p adjListPtr = graph->pred[node].head;
+        int k;
         // Go trough predecessors
-        while (adjListPtr)
+        for (k = graph->pred_offsets[node]; k < graph->pred_offsets[node + 1]; k++)
         {
             // current predecessor
-            pred = adjListPtr->vertex;
+            pred = graph->pred[k];
 
             // only consider predecessors that belong to player 1 (0) not 2 (1)
             if(graph->players[pred] == 0) {
@@ -405,8 +401,6 @@ pre_O(antichain* a, antichain* prev_a, graph_p graph) {
                     add_element_to_antichain_and_free(cur_antichain, down, (void*)compare_tuples, (void*)free_tuple_full);
                 }
             }
-
-            adjListPtr = adjListPtr->next;
         }
         /**
         int i;
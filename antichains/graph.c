@@ -22,57 +22,61 @@ __inline void err_exit(char* msg)
     exit(1);
 }
 
-/* Function to create an adjacency list node*/
-adjlist_node_p createNode(int v)
+/* Function to create a graph with n vertices from flat arrays. The successors of vertex v are
+   succ_targets[succ_offsets[v]] to succ_targets[succ_offsets[v+1]-1], the ids used in succ_targets start at first
+   (they are shifted so vertices are numbered from 0). Predecessors are computed using a counting sort, so the
+   predecessors of a vertex are ordered by increasing id. The arrays are copied.*/
+graph_p createGraph(int n, int *priorities, int *players, int *succ_offsets, int *succ_targets, int first)
 {
-    adjlist_node_p newNode = (adjlist_node_p)malloc(sizeof(adjlist_node_t));
-    if(!newNode)
-        err_exit("Unable to allocate memory for new node");
-
-    newNode->vertex = v;
-    newNode->next = NULL;
-
-    return newNode;
-}
-
-/* Function to create a graph with n vertices; Creates both directed and undirected graphs*/
-graph_p createGraph(int n, int *priorities, int* players )
-{
-    int i;
+    int i, k, m, target;
+    int *fill;
     graph_p graph = (graph_p)malloc(sizeof(graph_t));
     if(!graph)
         err_exit("Unable to allocate memory for graph");
+    m = succ_offsets[n] - succ_offsets[0];
     graph->num_vertices = n;
+    graph->num_edges = m;
 
     graph->priorities = (int*)malloc(n*sizeof(int));
+    graph->players = (int*)malloc(n*sizeof(int));
+    graph->succ_offsets = (int*)malloc((n+1)*sizeof(int));
+    graph->succ = (int*)malloc((m > 0 ? m : 1)*sizeof(int));
+    graph->pred_offsets = (int*)calloc(n+1, sizeof(int));
+    graph->pred = (int*)malloc((m > 0 ? m : 1)*sizeof(int));
+    fill = (int*)malloc((n+1)*sizeof(int));
+    if(!graph->priorities || !graph->players || !graph->succ_offsets || !graph->succ || !graph->pred_offsets
+       || !graph->pred || !fill)
+        err_exit("Unable to allocate memory for adjacency arrays");
 
     for(i=0; i<n; i++) {
         graph->priorities[i] = priorities[i];
+        graph->players[i] = players[i];
     }
 
-    graph->players = (int*)malloc(n*sizeof(int));
-
-    for(i=0; i<n; i++) {
-        graph->players[i] = players[i];
+    for(i=0; i<=n; i++) {
+        graph->succ_offsets[i] = succ_offsets[i] - succ_offsets[0];
     }
 
-    /* Create an array of adjacency lists*/
-    graph->succ = (adjlist_p)malloc(n * sizeof(adjlist_t));
-    if(!graph->succ)
-        err_exit("Unable to allocate memory for adjacency list array");
+    for(k=0; k<m; k++) {
+        target = succ_targets[succ_offsets[0] + k] - first;
+        graph->succ[k] = target;
+        graph->pred_offsets[target + 1]++;
+    }
 
-    graph->pred = (adjlist_p)malloc(n * sizeof(adjlist_t));
-    if(!graph->pred)
-        err_exit("Unable to allocate memory for adjacency list array");
+    for(i=0; i<n; i++) {
+        graph->pred_offsets[i + 1] += graph->pred_offsets[i];
+    }
 
-    for(i = 0; i < n; i++)
-    {
-        graph->succ[i].head = NULL;
-        graph->succ[i].num_members = 0;
+    for(i=0; i<=n; i++) {
+        fill[i] = graph->pred_offsets[i];
+    }
 
-        graph->pred[i].head = NULL;
-        graph->pred[i].num_members = 0;
+    for(i=0; i<n; i++) {
+        for(k=graph->succ_offsets[i]; k<graph->succ_offsets[i+1]; k++) {
+            graph->pred[fill[graph->succ[k]]++] = i;
+        }
     }
+    free(fill);
 
     return graph;
 }
@@ -122,85 +126,37 @@ void destroyGraph(graph_p graph)
 {
     if(graph)
     {
-        if(graph->succ)
-        {
-            int v;
-            /*Free up the nodes*/
-            for (v = 0; v < graph->num_vertices; v++)
-            {
-                adjlist_node_p adjListPtr = graph->succ[v].head;
-                while (adjListPtr)
-                {
-                    adjlist_node_p tmp = adjListPtr;
-                    adjListPtr = adjListPtr->next;
-                    free(tmp);
-                }
-            }
-            /*Free the adjacency list array*/
-            free(graph->succ);
-        }
-
-        if(graph->pred)
-        {
-            int v;
-            /*Free up the nodes*/
-            for (v = 0; v < graph->num_vertices; v++)
-            {
-                adjlist_node_p adjListPtr = graph->pred[v].head;
-                while (adjListPtr)
-                {
-                    adjlist_node_p tmp = adjListPtr;
-                    adjListPtr = adjListPtr->next;
-                    free(tmp);
-                }
-            }
-            /*Free the adjacency list array*/
-            free(graph->pred);
-        }
+        free(graph->priorities);
+        free(graph->players);
+        free(graph->succ_offsets);
+        free(graph->succ);
+        free(graph->pred_offsets);
+        free(graph->pred);
         /*Free the graph*/
         free(graph);
     }
 }
 
-/* Adds an edge to a graph*/
-void addEdge(graph_t *graph, int src, int dest)
-{
-    /* Add an edge from src to dst in the adjacency list*/
-    adjlist_node_p newNode = createNode(dest);
-    newNode->next = graph->succ[src].head;
-    graph->succ[src].head = newNode;
-    graph->succ[src].num_members++;
-
-    newNode = createNode(src);
-    newNode->next = graph->pred[dest].head;
-    graph->pred[dest].head = newNode;
-    graph->pred[dest].num_members++;
-}
-
-/* Function to print the adjacency list of graph*/
+/* Function to print the adjacency lists of graph*/
 void displayGraph(graph_p graph)
 {
-    int i;
+    int i, k;
     for (i = 0; i < graph->num_vertices; i++)
     {
-        adjlist_node_p adjListPtr = graph->succ[i].head;
         printf("%d: ", i);
-        while (adjListPtr)
+        for (k = graph->succ_offsets[i]; k < graph->succ_offsets[i+1]; k++)
         {
-            printf("%d->", adjListPtr->vertex);
-            adjListPtr = adjListPtr->next;
+            printf("%d->", graph->succ[k]);
         }
         printf("NULL\n");
     }
     printf("--------------------------\n");
     for (i = 0; i < graph->num_vertices; i++)
     {
-        adjlist_node_p adjListPtr = graph->pred[i].head;
         printf("%d: ", i);
-        while (adjListPtr)
+        for (k = graph->pred_offsets[i]; k < graph->pred_offsets[i+1]; k++)
         {
-            printf("%d->", adjListPtr->vertex);
-            adjListPtr = adjListPtr->next;
+            printf("%d->", graph->pred[k]);
         }
         printf("NULL\n");
     }
@@ -209,4 +165,4 @@ void displayGraph(graph_p graph)
     {
         printf("node %d, priority %d, player %d\n", i, graph->priorities[i], graph->players[i]);
     }
-}
\ No newline at end of file
+}
@@ -43,26 +43,16 @@ GNode._fields_ = [("data", POINTER(c_void_p)),
                   ("parent", POINTER(GNode)),
                   ("children", POINTER(GNode))]
 
-#### Graph C structure
-class Adjlist_node(Structure):
-    pass
-
-Adjlist_node._fields_ = [("vertex", c_int),
-                ("next", POINTER(Adjlist_node))]
-
-#### Graph C structure
-class Adjlist(Structure):
-    _fields_ = [("num_members", c_int),
-                ("head", POINTER(Adjlist_node))]
-
-
 #### Graph C structure
 class Graph(Structure):
     _fields_ = [("num_vertices", c_int),
+                ("num_edges", c_int),
                 ("priorities", POINTER(c_int)),
                 ("players", POINTER(c_int)),
-                ("succ", POINTER(Adjlist)),
-                ("pred", POINTER(Adjlist))]
+                ("succ_offsets", POINTER(c_int)),
+                ("succ", POINTER(c_int)),
+                ("pred_offsets", POINTER(c_int)),
+                ("pred", POINTER(c_int))]
 
 #### Antichain C structure      
 class Antichain(Structure):
@@ -85,11 +75,54 @@ def error_print(text):
     print(text)
     exit(0)
 
+#### Library loaded on first use
+class Library(object):
+    """
+    The C library. It is only loaded the first time one of its functions is called, so importing this module (and the
+    solvers which use it) does not cost anything to the programs which do not call the library.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.handle = None
+
+    def load(self):
+        """
+        :return: the loaded library.
+        """
+        if self.handle is None:
+            self.handle = cdll.LoadLibrary(self.path)
+        return self.handle
+
+    def __getattr__(self, name):
+        return Function(self, name)
+
+
+class Function(object):
+    """
+    A function of the C library. Its argument and return types are given to ctypes when the library is loaded.
+    """
+
+    def __init__(self, library, name):
+        self.library = library
+        self.name = name
+        self.argtypes = None
+        self.restype = c_int
+        self.function = None
+
+    def __call__(self, *args):
+        if self.function is None:
+            function = getattr(self.library.load(), self.name)
+            function.argtypes = self.argtypes
+            function.restype = self.restype
+            self.function = function
+        return self.function(*args)
+
 #### FUNCTIONS LOADING ####
 if platform.system() == "Windows":
-    lib = cdll.LoadLibrary(MAIN_DIR_PATH+"game_solver.dylib")
+    lib = Library(MAIN_DIR_PATH+"game_solver.dylib")
 elif platform.system() == "Linux":
-    lib = cdll.LoadLibrary("antichains/game_solver.so")
+    lib = Library("antichains/game_solver.so")
 else:
     error_print("OS not supported")
 
@@ -104,17 +137,13 @@ get_link_data_c.restype = POINTER(Tuple)
 
 ##Graph
 createGraph_c = lib.createGraph
-createGraph_c.argtypes = [c_int, POINTER(c_int), POINTER(c_int)]
+createGraph_c.argtypes = [c_int, POINTER(c_int), POINTER(c_int), POINTER(c_int), POINTER(c_int), c_int]
 createGraph_c.restype =  POINTER(Graph)
 
 destroyGraph_c = lib.destroyGraph
 destroyGraph_c.argtypes = [POINTER(Graph)]
 destroyGraph_c.restype =  None
 
-addEdge_c = lib.addEdge
-addEdge_c.argtypes = [POINTER(Graph),c_int, c_int]
-addEdge_c.restype =  None
-
 maximal_counter_c = lib.maximal_counter
 maximal_counter_c.argtypes = [POINTER(Graph)]
 maximal_counter_c.restype = POINTER(c_int)
@@ -123,6 +152,19 @@ displayGraph_c = lib.displayGraph
 displayGraph_c.argtypes = [POINTER(Graph)]
 displayGraph_c.restype =  None
 
+##Zielonka
+attractor_c = lib.attractor
+attractor_c.argtypes = [POINTER(Graph), POINTER(c_int), c_int, c_int]
+attractor_c.restype = POINTER(c_int)
+
+zielonka_c = lib.zielonka
+zielonka_c.argtypes = [POINTER(Graph)]
+zielonka_c.restype = POINTER(c_int)
+
+free_solution_c = lib.free_solution
+free_solution_c.argtypes = [POINTER(c_int)]
+free_solution_c.restype = None
+
 ##Tuple
 set_not_defined_tuple_c = lib.set_not_defined_tuple
 set_not_defined_tuple_c.argtypes = None
@@ -0,0 +1,308 @@
+/*
+ * This file is part of Game solver, a python implementation of game solving algorithms.
+ * Copyright (C) 2018 Clément Tamines
+ *
+ * Native implementation of the attractor computation and of the recursive (Zielonka) algorithm for parity games.
+ * Sub-games are never copied : each node has a level and the nodes of the sub-game solved at recursion depth d are
+ * the nodes whose level is at least d. Attractors are marked with a stamp which is different for each computation,
+ * so the working arrays are allocated once for the whole game.
+ */
+
+#include <stdio.h>
+#include <stdlib.h>
+#include "zielonka.h"
+
+/* Working memory shared by every attractor computation */
+typedef struct context
+{
+    graph_p graph;
+    int *level;     /*level[v] >= d iff v belongs to the sub-game solved at depth d*/
+    int *mark;      /*mark[v] == stamp iff v belongs to the attractor being computed*/
+    int *out;       /*number of successors of v not yet in the attractor, valid iff out_mark[v] == stamp*/
+    int *out_mark;
+    int stamp;
+    int *winner;    /*player winning each node*/
+    int *strategy;  /*successor chosen in each node*/
+}context_t;
+
+static context_t* create_context(graph_p graph)
+{
+    int n = graph->num_vertices;
+    int v;
+    context_t *ctx = (context_t*)malloc(sizeof(context_t));
+    if(!ctx)
+        err_exit("Unable to allocate memory for the solver");
+
+    ctx->graph = graph;
+    ctx->level = (int*)calloc(n, sizeof(int));
+    ctx->mark = (int*)calloc(n, sizeof(int));
+    ctx->out = (int*)malloc(n * sizeof(int));
+    ctx->out_mark = (int*)calloc(n, sizeof(int));
+    ctx->stamp = 0;
+    ctx->winner = (int*)malloc(n * sizeof(int));
+    ctx->strategy = (int*)malloc(n * sizeof(int));
+    if(!ctx->level || !ctx->mark || !ctx->out || !ctx->out_mark || !ctx->winner || !ctx->strategy)
+        err_exit("Unable to allocate memory for the solver");
+
+    for(v = 0; v < n; v++)
+    {
+        ctx->winner[v] = -1;
+        ctx->strategy[v] = -1;
+    }
+    return ctx;
+}
+
+/* Builds the solution array from the winners and strategies and frees the context */
+static int* destroy_context(context_t *ctx)
+{
+    int n = ctx->graph->num_vertices;
+    int v;
+    int *solution = (int*)malloc(2 * n * sizeof(int));
+    if(!solution)
+        err_exit("Unable to allocate memory for the solution");
+
+    for(v = 0; v < n; v++)
+    {
+        solution[v] = ctx->winner[v];
+        /* strategies may remain from sub-games in which the node was won by its owner */
+        solution[n + v] = (ctx->graph->players[v] == ctx->winner[v]) ? ctx->strategy[v] : -1;
+    }
+
+    free(ctx->level);
+    free(ctx->mark);
+    free(ctx->out);
+    free(ctx->out_mark);
+    free(ctx->winner);
+    free(ctx->strategy);
+    free(ctx);
+    return solution;
+}
+
+/* Counts the successors of a node in the sub-game of depth depth */
+static int count_successors(context_t *ctx, int node, int depth)
+{
+    int count = 0;
+    int k;
+    for(k = ctx->graph->succ_offsets[node]; k < ctx->graph->succ_offsets[node + 1]; k++)
+    {
+        if(ctx->level[ctx->graph->succ[k]] >= depth)
+            count++;
+    }
+    return count;
+}
+
+/* Computes the attractor for player of the target set in the sub-game of depth depth. The nodes of the attractor are
+   written in queue (in the order in which they are added) and marked with the current stamp, their number is returned.
+   The successor from which a node of player is attracted is saved as its strategy. If target_strategy is not 0, the
+   nodes of player in the target set choose their first successor in the sub-game. */
+static int compute_attractor(context_t *ctx, int depth, int *target, int target_size, int player,
+                             int target_strategy, int *queue)
+{
+    graph_p graph = ctx->graph;
+    int stamp = ++ctx->stamp;
+    int head = 0;
+    int tail = 0;
+    int i, k, s, v;
+
+    for(i = 0; i < target_size; i++)
+    {
+        v = target[i];
+        if(ctx->mark[v] == stamp)
+            continue;
+        ctx->mark[v] = stamp;
+        queue[tail++] = v;
+        if(target_strategy && graph->players[v] == player)
+        {
+            ctx->strategy[v] = -1;
+            for(k = graph->succ_offsets[v]; k < graph->succ_offsets[v + 1]; k++)
+            {
+                if(ctx->level[graph->succ[k]] >= depth)
+                {
+                    ctx->strategy[v] = graph->succ[k];
+                    break;
+                }
+            }
+        }
+    }
+
+    while(head < tail)
+    {
+        s = queue[head++];
+        for(k = graph->pred_offsets[s]; k < graph->pred_offsets[s + 1]; k++)
+        {
+            v = graph->pred[k];
+            if(ctx->level[v] < depth || ctx->mark[v] == stamp)
+                continue;
+            if(graph->players[v] == player)
+            {
+                ctx->mark[v] = stamp;
+                queue[tail++] = v;
+                ctx->strategy[v] = s;
+            }
+            else
+            {
+                /* counters are only initialized for the nodes of the opponent which are reached */
+                if(ctx->out_mark[v] != stamp)
+                {
+                    ctx->out[v] = count_successors(ctx, v, depth);
+                    ctx->out_mark[v] = stamp;
+                }
+                ctx->out[v]--;
+                if(ctx->out[v] == 0)
+                {
+                    ctx->mark[v] = stamp;
+                    queue[tail++] = v;
+                }
+            }
+        }
+    }
+    return tail;
+}
+
+/* Solves the sub-game made of the size nodes in nodes, which is the sub-game of depth depth. Every node of the
+   sub-game gets a winner and every node of a winning region which belongs to the winner gets a strategy. */
+static void solve_subgame(context_t *ctx, int *nodes, int size, int depth)
+{
+    graph_p graph = ctx->graph;
+    int *target, *attr, *sub;
+    int i, j, opponent, max, target_size, attr_size, sub_size, stamp, v;
+
+    if(size == 0)
+        return;
+
+    target = (int*)malloc(size * sizeof(int));
+    attr = (int*)malloc(size * sizeof(int));
+    sub = (int*)malloc(size * sizeof(int));
+    if(!target || !attr || !sub)
+        err_exit("Unable to allocate memory for the solver");
+
+    /* target set : nodes of maximal priority */
+    max = -1;
+    for(i = 0; i < size; i++)
+    {
+        if(graph->priorities[nodes[i]] > max)
+            max = graph->priorities[nodes[i]];
+    }
+    target_size = 0;
+    for(i = 0; i < size; i++)
+    {
+        if(graph->priorities[nodes[i]] == max)
+            target[target_size++] = nodes[i];
+    }
+    j = max % 2;
+    opponent = 1 - j;
+
+    /* sub-game G\A where A is the attractor of the nodes of maximal priority */
+    attr_size = compute_attractor(ctx, depth, target, target_size, j, 1, attr);
+    stamp = ctx->stamp;
+    sub_size = 0;
+    for(i = 0; i < size; i++)
+    {
+        v = nodes[i];
+        if(ctx->mark[v] == stamp)
+            ctx->level[v] = depth;
+        else
+        {
+            ctx->level[v] = depth + 1;
+            sub[sub_size++] = v;
+        }
+    }
+    solve_subgame(ctx, sub, sub_size, depth + 1);
+
+    /* winning region of the opponent in G\A */
+    target_size = 0;
+    for(i = 0; i < sub_size; i++)
+    {
+        if(ctx->winner[sub[i]] == opponent)
+            target[target_size++] = sub[i];
+    }
+
+    if(target_size == 0)
+    {
+        for(i = 0; i < attr_size; i++)
+            ctx->winner[attr[i]] = j;
+    }
+    else
+    {
+        /* the attractor B of the opponent is won by the opponent, the strategies of the nodes of its winning
+           region in G\A are kept, the rest of the game is solved as the sub-game G\B */
+        attr_size = compute_attractor(ctx, depth, target, target_size, opponent, 0, attr);
+        stamp = ctx->stamp;
+        for(i = 0; i < attr_size; i++)
+            ctx->winner[attr[i]] = opponent;
+        sub_size = 0;
+        for(i = 0; i < size; i++)
+        {
+            v = nodes[i];
+            if(ctx->mark[v] == stamp)
+                ctx->level[v] = depth;
+            else
+            {
+                ctx->level[v] = depth + 1;
+                sub[sub_size++] = v;
+            }
+        }
+        solve_subgame(ctx, sub, sub_size, depth + 1);
+    }
+
+    free(target);
+    free(attr);
+    free(sub);
+}
+
+/* Solves the reachability game in which player wants to reach the target set. The player who does not reach the
+   target chooses its last successor outside of the attractor. */
+int* attractor(graph_p graph, int *target, int target_size, int player)
+{
+    int n = graph->num_vertices;
+    context_t *ctx = create_context(graph);
+    int *queue = (int*)malloc(n * sizeof(int));
+    int k, v, stamp;
+    if(!queue)
+        err_exit("Unable to allocate memory for the solver");
+
+    compute_attractor(ctx, 0, target, target_size, player, 1, queue);
+    stamp = ctx->stamp;
+    for(v = 0; v < n; v++)
+    {
+        if(ctx->mark[v] == stamp)
+            ctx->winner[v] = player;
+        else
+        {
+            ctx->winner[v] = 1 - player;
+            if(graph->players[v] != player)
+            {
+                for(k = graph->succ_offsets[v]; k < graph->succ_offsets[v + 1]; k++)
+                {
+                    if(ctx->mark[graph->succ[k]] != stamp)
+                        ctx->strategy[v] = graph->succ[k];
+                }
+            }
+        }
+    }
+    free(queue);
+    return destroy_context(ctx);
+}
+
+/* Solves the parity game using the recursive algorithm */
+int* zielonka(graph_p graph)
+{
+    int n = graph->num_vertices;
+    context_t *ctx = create_context(graph);
+    int *nodes = (int*)malloc(n * sizeof(int));
+    int v;
+    if(!nodes)
+        err_exit("Unable to allocate memory for the solver");
+
+    for(v = 0; v < n; v++)
+        nodes[v] = v;
+    solve_subgame(ctx, nodes, n, 0);
+    free(nodes);
+    return destroy_context(ctx);
+}
+
+/* Frees a solution returned by attractor or zielonka */
+void free_solution(int *solution)
+{
+    free(solution);
+}
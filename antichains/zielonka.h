@@ -0,0 +1,19 @@
+/*
+ * This file is part of Game solver, a python implementation of game solving algorithms.
+ * Copyright (C) 2018 Clément Tamines
+ *
+ * Native implementation of the attractor computation and of the recursive (Zielonka) algorithm for parity games.
+ */
+
+#ifndef ZIELONKA_H_
+#define ZIELONKA_H_
+
+#include "graph.h"
+
+/* Solutions are returned as an array of 2n integers : position v is the player winning node v and position n+v is the
+   successor chosen by the winning strategy in node v (-1 if v does not belong to the player winning it) */
+int* attractor(graph_p, int*, int, int);
+int* zielonka(graph_p);
+void free_solution(int*);
+
+#endif /* ZIELONKA_H_ */
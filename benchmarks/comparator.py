@@ -458,4 +458,15 @@ compare_algorithms(sp.strong_parity_solver_no_strategies, sp.strong_parity_solve
 compare_algorithms(sp.strong_parity_solver_no_strategies, sp.strong_parity_solver_no_strategies,generators.strong_parity_worst_case, 25, iterations=3,preprocess2=optimizations.compress_priorities
                    , step=1, plot=True, path="COMPARE-REC-REC-WORST-25n-1s-optsvsnoopt.pdf",
                   title="Recursive algorithm runtime comparison (worst-case graphs)", label1="Without compression", label2="With compression")
-"""
\ No newline at end of file
+
+# Compare recursive vs priority promotion on random, ladder and worst case graphs
+compare_algorithms(sp.strong_parity_solver, sp.strong_parity_solver_promotion, gen, 2000, iterations=3
+                   , step=10, plot=True, path="COMPARE-REC-PROM-RAND-2000n-10s.pdf",
+                  title="Parity game algorithms runtime comparison (random graphs)", label1="Recursive", label2="Priority promotion")
+compare_algorithms(sp.strong_parity_solver, sp.strong_parity_solver_promotion, generators.ladder, 2000, iterations=3
+                   , step=10, plot=True, path="COMPARE-REC-PROM-LADDER-2000n-10s.pdf",
+                  title="Parity game algorithms runtime comparison (ladder graphs)", label1="Recursive", label2="Priority promotion")
+compare_algorithms(sp.strong_parity_solver, sp.strong_parity_solver_promotion, generators.strong_parity_worst_case, 25, iterations=3
+                   , step=1, plot=True, path="COMPARE-REC-PROM-WORST-25n-1s.pdf",
+                  title="Parity game algorithms runtime comparison (worst-case graphs)", label1="Recursive", label2="Priority promotion")
+"""
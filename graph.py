@@ -1,4 +1,6 @@
+from array import array
 from collections import defaultdict
+from itertools import izip
 
 
 class Graph(object):
@@ -88,10 +90,20 @@ class Graph(object):
     def remove_predecessor(self, node, predecessor):
         self.predecessors[node].remove(predecessor)
 
-    def subgame(self, set):
+    def out_degrees(self):
+        """
+        :return: a dictionary where keys are nodes and values are their number of successors
+        """
+        out = defaultdict(int)
+        for node in self.nodes:
+            out[node] = len(self.successors[node])
+        return out
+
+    def subgame(self, set, removed=None):
         """
         Creates a sub-game from the current game. The sub-game will contain all nodes in the provided set.
         :param set: the list of nodes that the sub-game will contain.
+        :param removed: the nodes of the current game which are not in set (unused, the sub-game is a copy).
         :return: a sub-game.
         """
         sub = self.__class__()
@@ -112,3 +124,739 @@ class Graph(object):
                 rep += str(succ) + ", "
             rep += "\n"
         return rep
+
+
+class _NodeDescriptors(object):
+    """
+    Read/write view over the player and priority arrays of a CompactGraph (or of a SubGame of it) which behaves like
+    the dictionary Graph.nodes : keys are node ids and values are tuples (player, priority_1, ..., priority_k).
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __len__(self):
+        return len(self.graph.node_list)
+
+    def __contains__(self, node):
+        return self.graph.has_node(node)
+
+    def __getitem__(self, node):
+        g = self.graph
+        return tuple([g.players[node]] + [priorities[node] for priorities in g.priorities])
+
+    def __setitem__(self, node, info):
+        g = self.graph
+        if len(info) != len(g.priorities) + 1:
+            raise ValueError("a node of this arena needs a player and exactly " + str(len(g.priorities)) +
+                             " priorities")
+        g.players[node] = info[0]
+        for i in range(len(g.priorities)):
+            g.priorities[i][node] = info[i + 1]
+
+    def __iter__(self):
+        return iter(self.graph.node_list)
+
+    def keys(self):
+        return list(self.graph.node_list)
+
+    def iterkeys(self):
+        return iter(self.graph.node_list)
+
+    def itervalues(self):
+        for node in self.graph.node_list:
+            yield self[node]
+
+    def values(self):
+        return list(self.itervalues())
+
+    def iteritems(self):
+        for node in self.graph.node_list:
+            yield node, self[node]
+
+    def items(self):
+        return list(self.iteritems())
+
+
+class _Adjacency(object):
+    """
+    Read-only view over the successors or the predecessors of a CompactGraph (or of a SubGame of it) which behaves
+    like the dictionaries Graph.successors and Graph.predecessors.
+    """
+
+    def __init__(self, graph, accessor):
+        self.graph = graph
+        self.accessor = accessor
+
+    def __len__(self):
+        return len(self.graph.node_list)
+
+    def __getitem__(self, node):
+        return self.accessor(node)
+
+    def __iter__(self):
+        return iter(self.graph.node_list)
+
+
+class CompactGraph(object):
+    """
+    Array-backed game graph. Nodes are dense integer ids 0 to n-1 and the graph is stored in compressed sparse row
+    (CSR) format : the successors of node v are succ_targets[succ_offsets[v]:succ_offsets[v+1]] and its predecessors
+    are pred_targets[pred_offsets[v]:pred_offsets[v+1]]. Players and priorities are kept in separate arrays indexed
+    by node id. An id which does not correspond to a node of the game (e.g. id 0 when nodes are numbered from 1) has
+    player -1. The accessors are the same as the ones of Graph so the solvers can work on both representations.
+    """
+
+    def __init__(self, players, priorities, succ_offsets, succ_targets, pred_offsets=None, pred_targets=None,
+                 node_list=None):
+        """
+        Builds the predecessors from the successors using a counting sort, so predecessors of a node are ordered by
+        increasing id of their source. The arrays may be any sequence of integers supporting the buffer interface
+        (e.g. ctypes arrays over a memory-mapped file, see tools.file_handler.load_binary_arena).
+        :param players: array of length n, players[v] is the player of node v (-1 if v is not a node).
+        :param priorities: list of k arrays of length n, one per priority function.
+        :param succ_offsets: array of length n+1 containing the offsets of the successors of each node.
+        :param succ_targets: array containing the successors of every node, node after node.
+        :param pred_offsets: optionally, the offsets of the predecessors if they are already known.
+        :param pred_targets: optionally, the predecessors of every node if they are already known.
+        :param node_list: optionally, the list of node ids if it is already known.
+        """
+        self.players = players
+        self.priorities = priorities
+        self.succ_offsets = succ_offsets
+        self.succ_targets = succ_targets
+
+        n = len(players)
+        if pred_offsets is None:
+            pred_offsets = array('i', [0]) * (n + 1)
+            for target in succ_targets:
+                pred_offsets[target + 1] += 1
+            for v in xrange(n):
+                pred_offsets[v + 1] += pred_offsets[v]
+            fill = array('i', pred_offsets)
+            pred_targets = array('i', [0]) * len(succ_targets)
+            for v in xrange(n):
+                for k in xrange(succ_offsets[v], succ_offsets[v + 1]):
+                    target = succ_targets[k]
+                    pred_targets[fill[target]] = v
+                    fill[target] += 1
+        self.pred_offsets = pred_offsets
+        self.pred_targets = pred_targets
+
+        # list of node ids, an xrange when the only ids which are not nodes are the first ones
+        if node_list is None:
+            first = 0
+            while first < n and players[first] == -1:
+                first += 1
+            if all(players[v] != -1 for v in xrange(first, n)):
+                node_list = xrange(first, n)
+            else:
+                node_list = [v for v in xrange(first, n) if players[v] != -1]
+        self.node_list = node_list
+
+        self.nodes = _NodeDescriptors(self)
+        self.successors = _Adjacency(self, self.get_successors)
+        self.predecessors = _Adjacency(self, self.get_predecessors)
+        self.degrees = None
+        self.views = None  # membership of the sub-games of the arena, created with the first one (see _ViewChain)
+        self.numpy_csr = None  # NumPy views of the arrays, created by solvers.reachability_numpy when first needed
+
+    @classmethod
+    def from_node_list(cls, ids, players, priorities, degrees, targets):
+        """
+        Creates a CompactGraph from nodes given in any order, as they appear in a PGSolver file for instance.
+        :param ids: the node ids.
+        :param players: players[i] is the player of node ids[i].
+        :param priorities: list of k sequences, priorities[f][i] is the priority of node ids[i] for function f+1.
+        :param degrees: degrees[i] is the number of successors of node ids[i].
+        :param targets: the successors of every node, in the order of ids. An array('i') may be used by the graph.
+        :return: the corresponding CompactGraph.
+        """
+        n = max(max(ids) if len(ids) else -1, max(targets) if len(targets) else -1) + 1
+        node_players = array('b', [-1]) * n
+        node_priorities = [array('i', [0]) * n for _ in priorities]
+        node_degrees = array('i', [0]) * n
+        ordered = True
+        previous = -1
+        for i in xrange(len(ids)):
+            node = ids[i]
+            node_players[node] = players[i]
+            for f in xrange(len(priorities)):
+                node_priorities[f][node] = priorities[f][i]
+            node_degrees[node] = degrees[i]
+            if node <= previous:
+                ordered = False
+            previous = node
+
+        succ_offsets = array('i', [0]) * (n + 1)
+        for v in xrange(n):
+            succ_offsets[v + 1] = succ_offsets[v] + node_degrees[v]
+
+        if ordered:
+            # nodes are given by increasing id, targets are already in CSR order (and are not copied if they are
+            # already stored in an array)
+            if isinstance(targets, array) and targets.typecode == 'i':
+                succ_targets = targets
+            else:
+                succ_targets = array('i', targets)
+        else:
+            succ_targets = array('i', [0]) * len(targets)
+            position = 0
+            for i in xrange(len(ids)):
+                start = succ_offsets[ids[i]]
+                for k in xrange(degrees[i]):
+                    succ_targets[start + k] = targets[position + k]
+                position += degrees[i]
+
+        return cls(node_players, node_priorities, succ_offsets, succ_targets)
+
+    @classmethod
+    def from_graph(cls, g):
+        """
+        Converts a Graph whose node ids are non-negative integers into a CompactGraph.
+        :param g: a Graph.
+        :return: the corresponding CompactGraph.
+        """
+        ids = sorted(g.get_nodes())
+        nbr_functions = len(g.nodes[ids[0]]) - 1 if ids else 1
+        players = [g.nodes[node][0] for node in ids]
+        priorities = [[g.nodes[node][f] for node in ids] for f in range(1, nbr_functions + 1)]
+        degrees = [len(g.get_successors(node)) for node in ids]
+        targets = [succ for node in ids for succ in g.get_successors(node)]
+        return cls.from_node_list(ids, players, priorities, degrees, targets)
+
+    def get_nodes_descriptors(self):
+        """
+        :return: a view behaving like the dictionary containing the node information
+        """
+        return self.nodes
+
+    def get_nodes(self):
+        """
+        :return: returns the list of every node in the games
+        """
+        return list(self.node_list)
+
+    def get_node_player(self, node):
+        """
+        :param node: a node id
+        :return: the player to which a node belongs
+        """
+        return self.players[node]
+
+    def get_node_priority(self, node):
+        """
+        :param node: a node id
+        :return: the priority of the node (or the first one in case of generalized parity)
+        """
+        return self.priorities[0][node]
+
+    def get_node_priority_function_i(self, node, i):
+        """
+        Retrieves the priority of a node according to priority function i.
+        :param node: the node id
+        :param i: the priority function (1 to k)
+        :return: the priority of the node according to priority function i
+        """
+        return self.priorities[i - 1][node]
+
+    def get_successors(self, node):
+        """
+        :param node: a node id
+        :return: the successors of the node
+        """
+        return self.succ_targets[self.succ_offsets[node]:self.succ_offsets[node + 1]]
+
+    def get_predecessors(self, node):
+        """
+        :param node: a node id
+        :return: the predecessors of the node
+        """
+        return self.pred_targets[self.pred_offsets[node]:self.pred_offsets[node + 1]]
+
+    def has_node(self, node):
+        """
+        :param node: a node id
+        :return: True if node is a node of the game
+        """
+        return 0 <= node < len(self.players) and self.players[node] != -1
+
+    def out_degrees(self):
+        """
+        The out-degrees are computed from the successor offsets the first time they are requested. The array is shared
+        with the sub-games of the arena (see _ViewChain), it is brought back to the degrees of the arena if a sub-game
+        modified it.
+        :return: an array where position v is the number of successors of node v
+        """
+        if self.degrees is None:
+            offsets = self.succ_offsets
+            self.degrees = array('i', [offsets[v + 1] - offsets[v] for v in xrange(len(self.players))])
+        elif self.views is not None:
+            self.views.out_degrees(0)
+        return self.degrees
+
+    def subgame(self, set, removed=None):
+        """
+        Creates a sub-game from the current game. The sub-game will contain all nodes in the provided set. Nothing is
+        copied : the sub-game is a view of this game restricted to the nodes of set.
+        :param set: the list of nodes that the sub-game will contain.
+        :param removed: optionally, the nodes of the current game which are not in set. When provided, the out-degrees
+        of the sub-game are derived from the ones of this game by only visiting the edges entering removed nodes.
+        :return: a sub-game.
+        """
+        return SubGame(self, set, self, removed)
+
+    def __str__(self):
+        rep = ""
+        for node in self.node_list:
+            rep += str(node) + " " + str(self.nodes[node]) + "\n" + str(node) + " -> "
+            for succ in self.get_successors(node):
+                rep += str(succ) + ", "
+            rep += "\n"
+        return rep
+
+
+class _Members(dict):
+    """
+    Membership of a view which left the chain of its arena : its nodes are mapped to 1 and the other ids to 0.
+    """
+
+    def __missing__(self, node):
+        return 0
+
+
+class _ViewChain(object):
+    """
+    Membership of the nested sub-games of a CompactGraph, shared by the views instead of a mask per view. The views
+    using it form a chain in which each view is a sub-game of the previous one, the view at depth d contains node v
+    if level[v] >= d. Creating a view then only writes the level of its nodes. A view whose parent is not the last
+    one of the chain (e.g. the second sub-game of a game) first pops the views following its parent : their levels
+    are rolled back and each of them gets its own membership, built from its list of nodes.
+
+    The views of the chain also share the out-degrees of the arena : the array holds the out-degrees of the view at
+    depth applied. Going one view deeper decrements the degrees once per edge entering a node removed from the parent
+    (or counts the successors of the nodes of the view when the removed nodes are unknown, saving the previous
+    values), going back up undoes it, so each view only pays for the nodes removed from its parent.
+    """
+
+    def __init__(self, graph):
+        """
+        :param graph: the arena, a CompactGraph.
+        """
+        self.graph = graph
+        self.level = array('i', [0]) * len(graph.players)  # depth of the deepest view of the chain containing v
+        self.chain = []  # the view at position d - 1 has depth d
+        self.applied = 0  # depth of the view whose out-degrees are in the array of the arena
+
+    def push(self, view, parent):
+        """
+        Adds a view at the end of the chain, after its parent, or gives it its own membership if its parent is not in
+        the chain.
+        :param view: the new view, whose nodes are nodes of parent.
+        :param parent: the arena or the view the new view is taken from.
+        """
+        if parent is self.graph:
+            depth = 0
+        elif parent.level is self.level:
+            depth = parent.depth
+        else:
+            view.detach()
+            return
+        while len(self.chain) > depth:
+            self.pop()
+        self.chain.append(view)
+        level = self.level
+        depth += 1
+        for node in view.node_list:
+            level[node] = depth
+        view.level = level
+        view.depth = depth
+
+    def pop(self):
+        """
+        Removes the last view of the chain, the level of its nodes goes back to the depth of its parent.
+        """
+        if self.applied == len(self.chain):
+            self.undo()
+        view = self.chain.pop()
+        level = self.level
+        depth = len(self.chain)
+        for node in view.node_list:
+            level[node] = depth
+        view.detach()
+
+    def out_degrees(self, depth):
+        """
+        Brings the shared out-degrees to the ones of the view at the given depth.
+        :param depth: the depth of a view of the chain, 0 for the arena.
+        :return: the array of the arena, valid until the out-degrees of another view or of the arena are requested.
+        """
+        if self.graph.degrees is None:
+            self.graph.out_degrees()
+        while self.applied > depth:
+            self.undo()
+        while self.applied < depth:
+            self.apply()
+        return self.graph.degrees
+
+    def apply(self):
+        """
+        Goes from the out-degrees of a view to the ones of the following view of the chain.
+        """
+        view = self.chain[self.applied]
+        self.applied += 1
+        degrees = self.graph.degrees
+        if view.removed is not None:
+            for node in view.removed:
+                for pred in self.graph.get_predecessors(node):
+                    degrees[pred] -= 1
+        else:
+            level, depth = self.level, self.applied
+            view.saved = array('i', [degrees[node] for node in view.node_list])
+            for node in view.node_list:
+                count = 0
+                for succ in self.graph.get_successors(node):
+                    if level[succ] >= depth:
+                        count += 1
+                degrees[node] = count
+
+    def undo(self):
+        """
+        Goes back from the out-degrees of the last applied view to the ones of its parent.
+        """
+        self.applied -= 1
+        view = self.chain[self.applied]
+        degrees = self.graph.degrees
+        if view.removed is not None:
+            for node in view.removed:
+                for pred in self.graph.get_predecessors(node):
+                    degrees[pred] += 1
+        else:
+            for node, value in izip(view.node_list, view.saved):
+                degrees[node] = value
+            view.saved = None
+
+
+class SubGame(object):
+    """
+    Zero-copy view of a sub-game of a CompactGraph. The view only holds the list of its nodes, its membership is
+    shared with the other sub-games of the arena (see _ViewChain) : node v is in the view if level[v] >= depth.
+    Successors and predecessors are those of the arena filtered using the membership. A sub-game of a SubGame is again
+    a view of the arena itself, so nested sub-games are created in O(|set|) and their accessors do not get slower with
+    the nesting depth.
+    """
+
+    def __init__(self, graph, set, parent=None, removed=None):
+        """
+        :param graph: the arena, a CompactGraph.
+        :param set: the list of nodes of the arena that the sub-game contains.
+        :param parent: the game (arena or view) this sub-game is taken from.
+        :param removed: the nodes of parent which are not in set, if known.
+        """
+        self.graph = graph
+        self.players = graph.players
+        self.priorities = graph.priorities
+        self.node_list = list(set)
+
+        self.nodes = _NodeDescriptors(self)
+        self.successors = _Adjacency(self, self.get_successors)
+        self.predecessors = _Adjacency(self, self.get_predecessors)
+
+        # out-degrees are derived from the parent ones when we know which nodes were removed from it, the list is
+        # copied since it is used again to undo the removal after the caller may have modified it
+        self.removed = list(removed) if removed is not None else None
+        self.saved = None  # out-degrees of the nodes before they were counted for this view (see _ViewChain)
+        self.degrees = None  # own out-degrees, once the view left the chain
+        if graph.views is None:
+            graph.views = _ViewChain(graph)
+        graph.views.push(self, parent if parent is not None else graph)  # sets level and depth
+
+    def get_nodes_descriptors(self):
+        """
+        :return: a view behaving like the dictionary containing the node information
+        """
+        return self.nodes
+
+    def get_nodes(self):
+        """
+        :return: returns the list of every node in the games
+        """
+        return list(self.node_list)
+
+    def out_degrees(self):
+        """
+        Out-degrees of the nodes in the sub-game. A view of the chain of its arena gets the out-degrees array of the
+        arena, brought to the degrees of the view (see _ViewChain) : it is only valid until the out-degrees of another
+        view or of the arena are requested. A view which left the chain counts the successors of its nodes once.
+        :return: an array or a dictionary where position v is the number of successors of node v in the sub-game (only
+        meaningful for the nodes of the sub-game)
+        """
+        if self.level is self.graph.views.level:
+            return self.graph.views.out_degrees(self.depth)
+        if self.degrees is None:
+            degrees = {}
+            level = self.level
+            for node in self.node_list:
+                count = 0
+                for succ in self.graph.get_successors(node):
+                    count += level[succ]
+                degrees[node] = count
+            self.degrees = degrees
+        return self.degrees
+
+    def has_node(self, node):
+        """
+        :param node: a node id
+        :return: True if node is a node of the sub-game
+        """
+        return 0 <= node < len(self.players) and self.level[node] >= self.depth
+
+    def get_node_player(self, node):
+        """
+        :param node: a node id
+        :return: the player to which a node belongs
+        """
+        return self.players[node]
+
+    def get_node_priority(self, node):
+        """
+        :param node: a node id
+        :return: the priority of the node (or the first one in case of generalized parity)
+        """
+        return self.priorities[0][node]
+
+    def get_node_priority_function_i(self, node, i):
+        """
+        Retrieves the priority of a node according to priority function i.
+        :param node: the node id
+        :param i: the priority function (1 to k)
+        :return: the priority of the node according to priority function i
+        """
+        return self.priorities[i - 1][node]
+
+    def get_successors(self, node):
+        """
+        :param node: a node id
+        :return: the list of successors of the node which belong to the sub-game (empty if the node is not in the
+        sub-game, like in a copy of the sub-game)
+        """
+        level, depth = self.level, self.depth
+        if level[node] < depth:
+            return []
+        return [succ for succ in self.graph.get_successors(node) if level[succ] >= depth]
+
+    def get_predecessors(self, node):
+        """
+        :param node: a node id
+        :return: the list of predecessors of the node which belong to the sub-game (empty if the node is not in the
+        sub-game, like in a copy of the sub-game)
+        """
+        level, depth = self.level, self.depth
+        if level[node] < depth:
+            return []
+        return [pred for pred in self.graph.get_predecessors(node) if level[pred] >= depth]
+
+    def subgame(self, set, removed=None):
+        """
+        Creates a sub-game from the current sub-game, as a view of the arena. The provided set must only contain nodes
+        of the current sub-game.
+        :param set: the list of nodes that the sub-game will contain.
+        :param removed: optionally, the nodes of the current sub-game which are not in set (see CompactGraph.subgame).
+        :return: a sub-game.
+        """
+        return SubGame(self.graph, set, self, removed)
+
+    def detach(self):
+        """
+        Gives the view its own membership, when it leaves the chain of its arena or cannot join it.
+        """
+        self.level = _Members.fromkeys(self.node_list, 1)
+        self.depth = 1
+        self.removed = None
+
+    def __str__(self):
+        rep = ""
+        for node in self.node_list:
+            rep += str(node) + " " + str(self.nodes[node]) + "\n" + str(node) + " -> "
+            for succ in self.get_successors(node):
+                rep += str(succ) + ", "
+            rep += "\n"
+        return rep
+
+
+class OutDegree(dict):
+    """
+    Out-degree counters used by the attractor computations. Only the counters of the nodes which are actually
+    decremented are stored, the others are read from the (shared, never modified) out-degrees of the game. This way
+    an attractor computation only pays for the edges it traverses.
+    """
+
+    def __init__(self, degrees):
+        """
+        :param degrees: the out-degrees of the game, indexed by node.
+        """
+        dict.__init__(self)
+        self.degrees = degrees
+
+    def __missing__(self, node):
+        return self.degrees[node]
+
+
+class PriorityIndex(object):
+    """
+    Index of the nodes of a game by priority, built once per arena. The nodes of each priority are kept in a doubly
+    linked list threaded through arrays indexed by node id, so removing a node and restoring it (dancing links) takes
+    constant time. The distinct priorities are sorted once and the position of the maximal priority which still has
+    nodes is maintained, so the recursive solvers get the maximal priority of the current sub-game and its nodes in
+    time proportional to the answer instead of scanning every node.
+
+    The index follows the sub-games by removing the nodes which are not in them : nodes must be restored in the reverse
+    order of their removal (a solver removes the attractor before a recursive call and restores it after).
+    """
+
+    def __init__(self, g, function=1):
+        """
+        :param g: the game graph, whose node ids are non-negative integers.
+        :param function: the priority function to index (1 to k).
+        """
+        nodes = g.get_nodes()
+        size = max(nodes) + 1 if nodes else 0
+        self.priority = array('i', [0]) * size
+        self.next = array('i', [-1]) * size
+        self.prev = array('i', [-1]) * size
+        self.head = {}  # first node of each priority
+        tail = {}
+        self.count = defaultdict(int)  # number of nodes of each priority which are not removed
+        self.size = len(nodes)
+
+        for node in nodes:
+            p = g.get_node_priority_function_i(node, function)
+            self.priority[node] = p
+            if p in tail:
+                last = tail[p]
+                self.next[last] = node
+                self.prev[node] = last
+            else:
+                self.head[p] = node
+            tail[p] = node
+            self.count[p] += 1
+
+        self.levels = sorted(self.head)  # distinct priorities, in increasing order
+        self.position = {p: k for k, p in enumerate(self.levels)}
+        self.top = len(self.levels) - 1  # position of the maximal priority which may still have nodes
+
+    def __len__(self):
+        """
+        :return: the number of nodes which are not removed.
+        """
+        return self.size
+
+    def max_priority(self):
+        """
+        :return: the maximal priority of the nodes which are not removed (-1 if every node is removed).
+        """
+        while self.top >= 0 and self.count[self.levels[self.top]] == 0:
+            self.top -= 1
+        return self.levels[self.top] if self.top >= 0 else -1
+
+    def nodes(self, p):
+        """
+        :param p: a priority.
+        :return: the list of nodes of priority p which are not removed, in the order of the game.
+        """
+        result = []
+        node = self.head.get(p, -1) if self.count[p] else -1
+        following = self.next
+        while node != -1:
+            result.append(node)
+            node = following[node]
+        return result
+
+    def remove(self, nodes):
+        """
+        Removes nodes from the index. Every node must currently be in the index.
+        :param nodes: the nodes to remove.
+        """
+        following, previous, priority, count, head = self.next, self.prev, self.priority, self.count, self.head
+        for node in nodes:
+            p = priority[node]
+            before, after = previous[node], following[node]
+            if before != -1:
+                following[before] = after
+            else:
+                head[p] = after
+            if after != -1:
+                previous[after] = before
+            count[p] -= 1
+        self.size -= len(nodes)
+
+    def restore(self, nodes):
+        """
+        Restores nodes removed by remove. The links of a removed node are left untouched, so restoring the nodes in
+        the reverse order of their removal puts them back at their place.
+        :param nodes: the nodes given to the last call to remove which was not undone yet.
+        """
+        following, previous, priority, count, head = self.next, self.prev, self.priority, self.count, self.head
+        top = self.top
+        for node in reversed(nodes):
+            p = priority[node]
+            before, after = previous[node], following[node]
+            if before != -1:
+                following[before] = node
+            else:
+                head[p] = node
+            if after != -1:
+                previous[after] = node
+            count[p] += 1
+            if self.position[p] > top:
+                top = self.position[p]
+        self.top = top
+        self.size += len(nodes)
+
+
+class RemovalMask(object):
+    """
+    Mask of the nodes removed from a game, shared by every level of a recursive solver instead of being copied for
+    each sub-game. The nodes are removed by batches recorded in a journal, so a solver removes the attractor before a
+    recursive call and undoes the removal after it, and the number of nodes which are not removed is maintained, so
+    each level only costs the nodes it removes.
+    """
+
+    def __init__(self, removed, size):
+        """
+        :param removed: the removed nodes, a bitarray indexed by node id which is modified in place (the removals are
+        undone, so it is back to its initial value when every batch is undone).
+        :param size: the number of nodes of the game.
+        """
+        self.removed = removed
+        self.journal = []  # batches of removed nodes, the last one is undone first
+        self.live = size - removed.count(True)  # number of nodes which are not removed
+
+    def __len__(self):
+        """
+        :return: the number of nodes which are not removed.
+        """
+        return self.live
+
+    def remove(self, nodes):
+        """
+        Removes a batch of nodes. Every node must currently be in the game.
+        :param nodes: the nodes to remove.
+        """
+        removed = self.removed
+        for node in nodes:
+            removed[node] = True
+        self.journal.append(nodes)
+        self.live -= len(nodes)
+
+    def undo(self):
+        """
+        Puts back the nodes of the last batch which was not undone yet.
+        :return: the nodes of that batch.
+        """
+        nodes = self.journal.pop()
+        removed = self.removed
+        for node in nodes:
+            removed[node] = False
+        self.live += len(nodes)
+        return nodes
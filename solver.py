@@ -1,19 +1,30 @@
 # coding=utf-8
 import argparse
-from benchmarks import reachability_benchmark as r_bench
-from benchmarks import strongparity_benchmark as sp_bench
-from benchmarks import generalizedparity_benchmark as gp_bench
-from benchmarks import weakparity_benchmark as wp_bench
-from solvers import reachability, weakparity, strongparity, generalizedparity
-from tools import file_handler as tools
-from tools import generators
-from tools import operations as ops
-from test import strongparity_test as sp_test
-from test import weakparity_test as wp_test
-from test import reachability_test as r_test
-from test import generalizedparity_test as gp_test
+import sys
 
 
+def add_objective_arguments(parser):
+    """
+    Adds the options used to select the objective of the games (mutually exclusive and required) and the compression of
+    the priorities to a parser.
+    :param parser: the parser of the solve or batch command.
+    """
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('-r', type=str, action='store', dest='target', nargs=2,
+                       help='Solve a reachability game for a PLAYER and a TARGET_SET', metavar=('PLAYER', 'TARGET_SET'))
+    group.add_argument('-s', type=str, action='store', dest='safe', nargs = 1,
+                       help='Solve a safety game with SAFE_SET for player 1', metavar=('SAFE_SET'))
+    group.add_argument('-wp', action='store', nargs='?', const='strategies', choices=['strategies', 'regions'],
+                       help='Solve a weak parity game (regions skips the strategies and runs in linear time)')
+    group.add_argument('-sp',action='store', choices=['recursive', 'safety', 'antichain', 'native', 'scc',
+                                                   'promotion', 'tangle', 'quasi-polynomial', 'progress-measures',
+                                                   'strategy-improvement'],
+                       dest='parity_algorithm', help='Solve a strong parity game')
+    group.add_argument('-gp', action='store', nargs='?', const='classical', choices=['classical', 'scc'],
+                       help='Solve a generalized parity game')
+    parser.add_argument('-compress', action='store_true',
+                        help='Compress the priorities before solving a parity game (same solution, fewer priorities)')
+
 
 def command_line_handler():
     """
@@ -27,27 +38,51 @@ def command_line_handler():
                                        description='This tool implements algorithms used to solve reachability/safety, '
                                                    'parity, weak parity and generalized parity games. '
                                                    'This program can solve a game given in the PGSolver format (solve),  '
+                                                   'solve many games in parallel (batch), '
+                                                   'answer requests with warm worker processes (serve), '
+                                                   'convert a game to a binary format (convert), '
                                                    'benchmark one of the implemented algorithms (bench) or run unit tests (test).',
                                        help='Solve a game, benchmark an algorithm or run tests.', dest='mode')
 
     # create the parser for the "solve" command
     parser_solve = subparsers.add_parser('solve', help='Solve a game')
 
-    # adding the game options (mutually exclusive and required)
-    group_solve = parser_solve.add_mutually_exclusive_group(required=True)
-    group_solve.add_argument('-r', type=str, action='store', dest='target', nargs=2,
-                             help='Solve a reachability game for a PLAYER and a TARGET_SET', metavar=('PLAYER', 'TARGET_SET'))
-    group_solve.add_argument('-s', type=str, action='store', dest='safe', nargs = 1,
-                             help='Solve a safety game with SAFE_SET for player 1', metavar=('SAFE_SET'))
-    group_solve.add_argument('-wp', action='store_true', help='Solve a weak parity game')
-    group_solve.add_argument('-sp',action='store', choices=['recursive', 'safety', 'antichain'],
-                             dest='parity_algorithm', help='Solve a strong parity game')
-    group_solve.add_argument('-gp', action='store_true', help='Solve a generalized parity game')
+    add_objective_arguments(parser_solve)
 
     parser_solve.add_argument('-i', required=True, type=str, action='store', dest='inputFile',
                               help='Path to the arena of the game to solve')
     parser_solve.add_argument('-o', required=False, type=str, action='store', dest='outputFile',
                               help='Path to the file in which to save the solution')
+    parser_solve.add_argument('-component-workers', required=False, type=int, action='store',
+                              dest='component_workers',
+                              help='Number of processes solving independent components in parallel (scc algorithms)')
+
+    # create the parser for the "batch" command
+    parser_batch = subparsers.add_parser('batch', help='Solve many games on a pool of processes')
+    add_objective_arguments(parser_batch)
+    parser_batch.add_argument('-i', required=True, type=str, action='store', dest='inputFiles',
+                              help='Directory containing the arenas or manifest listing one arena per line')
+    parser_batch.add_argument('-o', required=False, type=str, action='store', dest='outputFile',
+                              help='Path to the file in which to write the results (standard output by default)')
+    parser_batch.add_argument('-workers', required=False, type=int, action='store', dest='workers',
+                              help='Number of worker processes (number of CPUs by default)')
+
+    # create the parser for the "serve" command
+    parser_serve = subparsers.add_parser('serve', help='Answer requests read from the standard input')
+    parser_serve.add_argument('-workers', required=False, type=int, action='store', dest='workers', default=1,
+                              help='Number of worker processes (1 by default)')
+    parser_serve.add_argument('-queue', required=False, type=int, action='store', dest='queue', default=16,
+                              help='Maximal number of requests waiting for a worker (16 by default)')
+    parser_serve.add_argument('-timeout', required=False, type=float, action='store', dest='timeout',
+                              help='Number of seconds after which a request is abandoned (no limit by default)')
+
+    # create the parser for the "convert" command
+    parser_convert = subparsers.add_parser('convert', help='Convert an arena to the binary format')
+    parser_convert.add_argument('-i', required=True, type=str, action='store', dest='inputFile',
+                                help='Path to the arena in PGSolver format')
+    parser_convert.add_argument('-o', required=True, type=str, action='store', dest='outputFile',
+                                help='Path to the binary file to create')
+    parser_convert.add_argument('-gp', action='store_true', help='The arena is a generalized parity game arena')
 
     # create the parser for the "benchmark" command
     parser_benchmark = subparsers.add_parser('bench', help='Benchmark selected algorithm')
@@ -86,59 +121,24 @@ def solver():
     # Parsing the command line arguments
     args = command_line_handler()
 
+    # each mode only imports the modules it needs (the benchmarks import matplotlib, which is slow to import)
     if args.mode == "solve":
 
         """ ----- Solving mode ----- """
-        if args.gp:
-            g = tools.load_generalized_from_file(args.inputFile)  # we have a generalized parity game arena
+        from tools import batch
+        from tools import file_handler as tools
+        from tools import operations as ops
+
+        # games are loaded in the array-backed representation which is much more compact than the dictionaries, a
+        # binary arena is memory-mapped and nothing is parsed
+        g = tools.load_arena(args.inputFile, args.gp)
+
+        # the solution comes out as (W_player,sigma_player), (W_opponent,sigma_opponent) if the algorithm computes
+        # strategies, else as (W_0, W_1)
+        solution, player, strategies = batch.solve_game(g, vars(args))
+        if strategies:
+            ops.print_solution(solution, player)  # printing the solution (with strategy)
         else:
-            g = tools.load_from_file(args.inputFile)  # loading game from the input file
-        player = 0  # default player is 0, so solution comes as (W_0,sigma_0), (W_1,sigma_1) or (W_0, W_1)
-
-        # Reachability (target and player is set)
-        if args.target is not None:
-            player = int(args.target[0])  # getting player (as int), replacing default player
-            target = map(int, args.target[1].split(","))  # getting node ids in target (transforming them into int)
-            solution = reachability.reachability_solver(g, target, player)  # calling reachability solver
-            ops.print_solution(solution, player)  # printing the solution
-
-        # Safety (safe set provided)
-        if args.safe is not None:
-            player = 1 # the player with the reachability objective (to write the solution later)
-            safe_set = map(int, args.safe[0].split(","))  # getting node ids in safe set (transforming them into int)
-            target_set = []
-            # adds every node not in the safe set to the target set
-            for node in g.get_nodes():
-                if not (node in safe_set):
-                    target_set.append(node)
-            # the solution comes out as (W_1,sigma_1), (W_0,sigma_0)
-            solution = reachability.reachability_solver(g, target_set, 1)  # calling reachability solver with target set for player 1 (2)
-            ops.print_solution(solution, 1)  # printing the solution, player 1 (2) has the reachability objective
-
-        # Weak parity
-        elif args.wp:
-            solution = weakparity.weak_parity_solver(g)  # calling weak parity solver on the game
-            ops.print_solution(solution, player)  # printing the solution
-
-        # Strong parity (an algorithm is chosen)
-        elif args.parity_algorithm is not None:
-            if (args.parity_algorithm == 'recursive'):
-                solution = strongparity.strong_parity_solver(g)  # calling recursive algorithm for parity games
-                ops.print_solution(solution, player)  # printing the solution (with strategy)
-            elif (args.parity_algorithm == 'safety'):
-                solution = strongparity.reduction_to_safety_parity_solver(g)  # calling reduction to safety algorithm
-                ops.print_winning_regions(solution[0], solution[1]) # printing the solution (without strategy)
-            elif (args.parity_algorithm == 'antichain'):
-                # calling antichain-based algorithm, assumes indexes start with 1
-                solution = strongparity.strong_parity_antichain_based(g,1)
-                ops.print_winning_regions(solution[0], solution[1]) # printing the solution (without strategy)
-            else:
-                # this should not happen
-                solution = None
-
-        # Generalized parity
-        elif args.gp:
-            solution = generalizedparity.generalized_parity_solver(g)  # calling classical algorithm for generalized parity games
             ops.print_winning_regions(solution[0], solution[1])  # printing the solution (without strategy)
 
         # If output option is chosen and the algorithm is the classical algo for generalized parity games, use special
@@ -146,17 +146,44 @@ def solver():
         if (args.outputFile is not None) and args.gp:
             tools.write_generalized_solution_to_file(g, solution[0], solution[1], args.outputFile)
 
-        # If output option is chosen and the algorithm is the reduction to safety algorithm for parity games or the
-        # antichain-based algorithm for parity games then the output is only the winning regions, not the strategies
-        elif (args.outputFile is not None) and (args.parity_algorithm == 'safety' or args.parity_algorithm == 'antichain'):
+        # If output option is chosen and the algorithm only computes the winning regions (reduction to safety and
+        # antichain-based algorithms for parity games, regions-only weak parity solver) then the output is only the
+        # winning regions, not the strategies
+        elif (args.outputFile is not None) and not strategies:
             tools.write_solution_to_file_no_strategies(g, solution[0], solution[1], args.outputFile)
 
         # Else the regular regions + strategies are output
         elif args.outputFile is not None:
             tools.write_solution_to_file(g, solution, player, args.outputFile)
 
+    elif args.mode == "batch":
+        """ ----- Batch mode ----- """
+        from tools import batch
+        paths = batch.list_games(args.inputFiles)
+        if args.outputFile is not None:
+            with open(args.outputFile, 'w') as output:
+                batch.solve_batch(paths, vars(args), output, args.workers)
+        else:
+            batch.solve_batch(paths, vars(args), sys.stdout, args.workers)
+
+    elif args.mode == "serve":
+        """ ----- Server mode ----- """
+        from tools import server
+        server.serve(sys.stdin, sys.stdout, args.workers, args.queue, args.timeout)
+
+    elif args.mode == "convert":
+        """ ----- Conversion mode ----- """
+        from tools import file_handler as tools
+        tools.convert_to_binary_arena(args.inputFile, args.outputFile, args.gp)
+
     elif args.mode == "bench":
         """ ----- Benchmark mode ----- """
+        from benchmarks import reachability_benchmark as r_bench
+        from benchmarks import strongparity_benchmark as sp_bench
+        from benchmarks import generalizedparity_benchmark as gp_bench
+        from benchmarks import weakparity_benchmark as wp_bench
+        from tools import generators
+
         max = args.max
         step = args.step
         rep = args.repetitions
@@ -208,14 +235,22 @@ def solver():
             gp_bench.benchmark_random_k_functions(max,3,iterations=rep, step=step, plot=plot, path=args.outputPlot)
 
     elif args.mode == "test":
+        from test import strongparity_test as sp_test
+        from test import weakparity_test as wp_test
+        from test import reachability_test as r_test
+        from test import generalizedparity_test as gp_test
+        from test import startup_test
+
         sp_test_result = sp_test.launch_tests()
         wp_test_result = wp_test.launch_tests()
         r_test_result = r_test.launch_tests()
         gp_test_result = gp_test.launch_tests()
-        if (sp_test_result and wp_test_result and r_test_result and gp_test_result):
+        startup_test_result = startup_test.launch_tests()
+        if (sp_test_result and wp_test_result and r_test_result and gp_test_result and startup_test_result):
             print("All tests passed with success")
         else:
             print("Some tests failed")
 
 
-solver()
+if __name__ == "__main__":
+    solver()
@@ -0,0 +1,161 @@
+"""
+This module solves games by decomposing them into strongly connected components. The components are considered
+bottom-up : the winning regions of the components below a component are attracted (by each player, to their own
+region) before it is considered, and only the nodes of the component which are not attracted are solved by the solver
+of the objective. Since the objectives are prefix-independent (parity, generalized parity), the winning regions of what
+remains of a component are winning regions of the whole game.
+
+The components of the same level of the condensation of the game (a component is at level 0 if it only has edges to
+itself, else at one more than the highest level it has edges to) do not depend on each other, so they can be solved in
+parallel by a pool of worker processes.
+"""
+import multiprocessing
+from collections import defaultdict, deque
+from copy import copy
+
+from graph import Graph, OutDegree
+from tools import operations as ops
+
+PARALLEL_SIZE = 64  # components with fewer nodes to solve are solved in the current process
+
+
+def component_levels(g, components):
+    """
+    Computes the level of each component in the condensation of the game.
+    :param g: the game graph.
+    :param components: the strongly connected components of g in reverse topological order.
+    :return: the list of levels, each level being the list of the indexes of its components.
+    """
+    component_of = {}
+    for i, component in enumerate(components):
+        for node in component:
+            component_of[node] = i
+
+    level = [0] * len(components)
+    levels = []
+    for i, component in enumerate(components):
+        # the components a component has edges to come before it
+        for node in component:
+            for succ in g.get_successors(node):
+                j = component_of[succ]
+                if j != i and level[j] + 1 > level[i]:
+                    level[i] = level[j] + 1
+        if level[i] == len(levels):
+            levels.append([])
+        levels[level[i]].append(i)
+    return levels
+
+
+def component_game(g, nodes):
+    """
+    Copies the sub-game of g made of some nodes into a new Graph, which can be sent to a worker process.
+    :param g: the game graph.
+    :param nodes: the nodes of the sub-game.
+    :return: the sub-game, a Graph.
+    """
+    sub = Graph()
+    descriptors = g.get_nodes_descriptors()
+    for node in nodes:
+        sub.add_node(node, descriptors[node])
+    for node in nodes:
+        for succ in g.get_successors(node):
+            if succ in sub.nodes:
+                sub.add_successor(node, succ)
+                sub.add_predecessor(succ, node)
+    return sub
+
+
+def _solve_component(task):
+    """
+    Solves a component in a worker process.
+    :param task: a tuple (solver, game, strategies).
+    :return: the solution of the game, the strategies are converted to dictionaries so they can be sent back.
+    """
+    solver, game, strategies = task
+    solution = solver(game)
+    if strategies:
+        (W_0, sigma_0), (W_1, sigma_1) = solution
+        return (W_0, dict(sigma_0)), (W_1, dict(sigma_1))
+    return solution
+
+
+def solve_components(g, solver, strategies, workers=None):
+    """
+    Solves a game component by component (see the module documentation).
+    :param g: the game to solve.
+    :param solver: the function solving a sub-game, it must be defined at the top level of a module when workers is
+    used, so it can be sent to the worker processes.
+    :param strategies: True if solver computes the strategies, i.e. returns (W_0, sigma_0), (W_1, sigma_1) instead of
+    W_0, W_1.
+    :param workers: the number of worker processes solving the components of a level in parallel, None to solve them
+    in the current process.
+    :return: the solution in the format of solver.
+    """
+    W = ([], [])  # winning regions of player 0 and 1
+    sigma = (defaultdict(lambda: -1), defaultdict(lambda: -1))  # winning strategies of player 0 and 1
+    winner = {}  # player winning each solved node
+    # number of successors of each node which are not won by the opponent of its player, only decremented values are
+    # stored (a node whose successors are all won by the opponent of its player is attracted by this opponent). The
+    # sub-games of the components share the out-degrees of the arena of g and modify them, so they are copied.
+    out = OutDegree(copy(g.out_degrees()))
+    queue = deque()
+
+    def win(node, player):
+        winner[node] = player
+        W[player].append(node)
+        queue.append(node)
+
+    def merge(solution):
+        for player in (0, 1):
+            if strategies:
+                region, strategy = solution[player]
+                sigma[player].update(strategy)
+            else:
+                region = solution[player]
+            for node in region:
+                win(node, player)
+
+    components = ops.strongly_connected_components(g)
+    pool = None
+    try:
+        for level in component_levels(g, components):
+            # the components of a level do not have edges to each other, so solving one of them does not attract nodes
+            # of the others and they are solved independently before the propagation
+            residuals = [[node for node in components[i] if node not in winner] for i in level]
+            large = [residual for residual in residuals if len(residual) >= PARALLEL_SIZE]
+            if workers is not None and workers > 1 and len(large) > 1:
+                if pool is None:
+                    pool = multiprocessing.Pool(workers)
+                tasks = [(solver, component_game(g, residual), strategies) for residual in large]
+                for solution in pool.map(_solve_component, tasks):
+                    merge(solution)
+                residuals = [residual for residual in residuals if len(residual) < PARALLEL_SIZE]
+
+            # every node of a residual game has a successor in it (the others are attracted), the edges leaving it go
+            # to lower components which are solved and are only useful to the player who does not own their source
+            for residual in residuals:
+                if residual:
+                    merge(solver(g.subgame(residual)))
+
+            # the winning regions are propagated upward : attractor of each newly solved node in the unsolved nodes
+            while queue:
+                s = queue.popleft()
+                player = winner[s]
+                for sbis in g.get_predecessors(s):
+                    if sbis in winner:
+                        continue
+                    if g.get_node_player(sbis) == player:
+                        win(sbis, player)
+                        sigma[player][sbis] = s
+                    else:
+                        out[sbis] -= 1
+                        if out[sbis] == 0:
+                            win(sbis, player)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    if strategies:
+        return (W[0], sigma[0]), (W[1], sigma[1])
+    return W[0], W[1]
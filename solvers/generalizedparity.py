@@ -1,6 +1,8 @@
 import copy
 
 import reachability
+from graph import Graph
+from solvers import decomposition
 from tools import operations as ops
 
 
@@ -87,7 +89,8 @@ def disj_parity_win2(g, maxValues, k, u):
                 #print("G empty")
                 break
 
-            if set(W2) == set(H1.get_nodes()):
+            # W1 and W2 partition H1, the regions are only compared when their sizes match
+            if len(W2) == len(H1.nodes) and set(W2) == set(H1.get_nodes()):
                 #print("hello")
                 B, compl_B = reachability.attractor(g,  G1.get_nodes(),1)
                 W1, W2 = disj_parity_win2(g.subgame(compl_B), maxValues, k, u+1)
@@ -121,9 +124,9 @@ def disj_parity_win(g, maxValues, k, u):
 
     for i in range(k):
         attMaxOdd, compl_attMaxOdd = reachability.attractor(g, ops.i_priority_node_function_j(g, maxValues[i],i+1),0)
-        G1 = g.subgame(compl_attMaxOdd)
+        G1 = g.subgame(compl_attMaxOdd, attMaxOdd)
         attMaxEven, compl_attMaxEven = reachability.attractor(G1,  ops.i_priority_node_function_j(G1, maxValues[i]-1,i+1),1)
-        H1 = G1.subgame(compl_attMaxEven)
+        H1 = G1.subgame(compl_attMaxEven, attMaxEven)
         j = 0
         while True:
             j+=1
@@ -134,14 +137,15 @@ def disj_parity_win(g, maxValues, k, u):
             if len(G1.nodes) == 0:
                 break
 
-            if set(W2) == set(H1.get_nodes()):
+            # W1 and W2 partition H1, the regions are only compared when their sizes match
+            if len(W2) == len(H1.nodes) and set(W2) == set(H1.get_nodes()):
                 B, compl_B = reachability.attractor(g,  G1.get_nodes(),1)
-                W1, W2 = disj_parity_win(g.subgame(compl_B), maxValues, k, u+1)
+                W1, W2 = disj_parity_win(g.subgame(compl_B, B), maxValues, k, u+1)
                 B.extend(W2)
                 return W1, B
 
             T, compl_T = reachability.attractor(G1, W1,0)
-            G1 = G1.subgame(compl_T)
+            G1 = G1.subgame(compl_T, T)
             E, compl_E = reachability.attractor(G1, ops.i_priority_node_function_j(g, maxValues[i]-1,i+1),0)
             H1 = G1.subgame(compl_E)
     return g.get_nodes(), []
@@ -179,6 +183,21 @@ def generalized_parity_solver(g):
 
     return disj_parity_win(transformed,maxValues, nbrFunctions,0)
 
+def generalized_parity_solver_scc(g, workers=None):
+    """
+    Generalized parity games solver which decomposes the game into strongly connected components and applies the
+    classical algorithm to what remains of each component once the winning regions of the lower components are
+    attracted (see solvers.decomposition).
+    :param g: the arena of the generalized parity game
+    :param workers: the number of worker processes solving independent components in parallel (None for none).
+    :return: the solution in the following format : W_0, W_1
+    """
+    if not isinstance(g, Graph):
+        # the classical algorithm copies the games it is given, views of an arena are converted once
+        g = decomposition.component_game(g, g.get_nodes())
+    return decomposition.solve_components(g, generalized_parity_solver, False, workers)
+
+
 def generalized_parity_solver_nocall(g):
     """
     Generalized parity games solver. This is an implementation of the classical algorithm used to solve generalized
@@ -1,20 +1,21 @@
 # coding=utf-8
+import ctypes
 from collections import defaultdict, deque
+
+from antichains.library_linker import attractor_c, destroyGraph_c
+from graph import OutDegree
 from tools import operations as op
 
 
 def init_out(g):
     """
-    Computes the number of outgoing edges for each node in the graph g.
+    Returns the counters of outgoing edges used by an attractor computation in the graph g. The out-degrees are
+    maintained by the graph (or sub-game) itself and are not recounted, the counters only store the nodes which
+    are decremented during the computation.
     :param g: the graph g.
-    :return: a dictionary where keys are nodes and values are the number of outgoing edges of that node.
+    :return: a dictionary-like structure where keys are nodes and values are the number of outgoing edges of that node.
     """
-    out = defaultdict(int)
-
-    for node in g.get_nodes():
-        out[node] = len(g.get_successors(node))
-
-    return out
+    return OutDegree(g.out_degrees())
 
 
 def reachability_solver(g, U, j):
@@ -87,7 +88,8 @@ def reachability_solver(g, U, j):
 
 def init_out_non_removed(g, removed):
     """
-    Computes the number of outgoing edges for each node that hasn't been removed in the graph g.
+    Computes the number of outgoing edges for each node that hasn't been removed in the graph g. This is only done
+    once per game, the result is then kept up to date by remove_from_out_non_removed when nodes are removed.
     :param removed: the removed nodes from g.
     :param g: the graph g.
     :return: a dictionary where keys are nodes and values are the number of outgoing edges of that node.
@@ -96,11 +98,40 @@ def init_out_non_removed(g, removed):
 
     for node in g.get_nodes():
         if not removed[node]:
-            out[node] = len(filter(lambda x: not removed[x], g.get_successors(node)))
+            count = 0
+            for succ in g.get_successors(node):
+                if not removed[succ]:
+                    count += 1
+            out[node] = count
     return out
 
 
-def reachability_solver_non_removed(g, U, j, removed):
+def remove_from_out_non_removed(g, out, nodes):
+    """
+    Updates the number of outgoing edges computed by init_out_non_removed when nodes are removed from g. Only the
+    edges entering the removed nodes are visited.
+    :param g: the graph g.
+    :param out: the number of outgoing edges of each node, updated in place.
+    :param nodes: the nodes which are removed.
+    """
+    for node in nodes:
+        for pred in g.get_predecessors(node):
+            out[pred] -= 1
+
+
+def restore_to_out_non_removed(g, out, nodes):
+    """
+    Undoes remove_from_out_non_removed when nodes which were removed from g are put back.
+    :param g: the graph g.
+    :param out: the number of outgoing edges of each node, updated in place.
+    :param nodes: the nodes which are put back.
+    """
+    for node in nodes:
+        for pred in g.get_predecessors(node):
+            out[pred] += 1
+
+
+def reachability_solver_non_removed(g, U, j, removed, degrees=None):
     """
     Reachability games solver. Uses a list of removed nodes instead of creation of subgames. This function computes
     Att_j^g(U), the attractor for player j of target set U in the game g. That attractor is the winning region of player
@@ -112,10 +143,14 @@ def reachability_solver_non_removed(g, U, j, removed):
     :param g: the game graph.
     :param U: the target set.
     :param j: the player with the reachability objective.
+    :param degrees: optionally, the number of outgoing edges of each non-removed node (see init_out_non_removed),
+    maintained by the caller. They are only read, never modified.
     :return: two tuples : (w_j, strat_j), (w_jbar, strat_jbar) where w_j and w_jbar are lists containing nodes of their
     respective winning regions and where strat_j and strat_jbar are dictionaries containing winning strategies.
     """
-    out = init_out_non_removed(g, removed)  # init out
+    if degrees is None:
+        degrees = init_out_non_removed(g, removed)
+    out = OutDegree(degrees)  # init out
     queue = deque()  # init queue (deque is part of standard library and allows O(1) append() and pop() at either end)
     # this dictionary is used to know if a node belongs to a winning region without
     # iterating over both winning regions lists (we can check in O(1) in average)
@@ -221,3 +256,30 @@ def attractor(g, U, j):
             if regions[node] != j:
                 Wbis.append(node)
     return W, Wbis
+
+
+def reachability_solver_native(g, U, j, start_index):
+    """
+    Reachability games solver implemented in the C library. Computes Att_j^g(U) and the winning strategies of both
+    players (see reachability_solver) in a single call to the C library.
+    :param g: the game graph.
+    :param U: the target set.
+    :param j: the player with the reachability objective.
+    :param start_index: the start index for the numbering of nodes in the game (0 or 1).
+    :return: two tuples : (w_j, strat_j), (w_jbar, strat_jbar) where w_j and w_jbar are lists containing nodes of their
+    respective winning regions and where strat_j and strat_jbar are dictionaries containing winning strategies.
+    """
+    if start_index == 1:
+        c_graph, nbr_nodes = op.transform_graph_into_c(g)
+    else:
+        c_graph, nbr_nodes = op.transform_graph_into_c_spec(g)
+
+    target = [node - start_index for node in U]
+    res = attractor_c(c_graph, (ctypes.c_int * len(target))(*target), len(target), j)
+    solution = op.read_solution_from_c(res, nbr_nodes, start_index)
+    destroyGraph_c(c_graph)
+
+    if j == 0:
+        return solution
+    else:
+        return solution[1], solution[0]
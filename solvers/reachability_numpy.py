@@ -0,0 +1,309 @@
+# coding=utf-8
+from array import array
+from collections import defaultdict
+from itertools import izip
+
+import numpy as np
+
+from graph import CompactGraph, SubGame
+from tools import operations as op
+
+"""
+Vectorized attractor engine. The functions of this module have the same signatures and return the same winning
+regions and strategies as the ones of solvers.reachability, but the attractor is computed frontier by frontier on
+NumPy arrays over the CSR representation of the arena instead of node by node : the predecessors of the whole frontier
+are gathered at once, the out-degree counters of the opponent nodes are decremented in bulk and the region is marked
+in a boolean mask.
+"""
+
+
+def csr_arrays(graph):
+    """
+    Returns NumPy views of the CSR arrays of an arena. Nothing is copied, the arrays share the memory of the arena.
+    The views are created once and kept in the arena.
+    :param graph: a CompactGraph.
+    :return: a tuple (players, succ_offsets, succ_targets, pred_offsets, pred_targets, sources) where sources[e] is the
+    source of the edge stored at position e of succ_targets.
+    """
+    if graph.numpy_csr is None:
+        players = np.frombuffer(graph.players, dtype=np.int8)
+        succ_offsets = np.frombuffer(graph.succ_offsets, dtype=np.int32)
+        succ_targets = np.frombuffer(graph.succ_targets, dtype=np.int32)
+        pred_offsets = np.frombuffer(graph.pred_offsets, dtype=np.int32)
+        pred_targets = np.frombuffer(graph.pred_targets, dtype=np.int32)
+        sources = np.repeat(np.arange(len(players), dtype=np.int32), np.diff(succ_offsets))
+        graph.numpy_csr = (players, succ_offsets, succ_targets, pred_offsets, pred_targets, sources)
+    return graph.numpy_csr
+
+
+def game_arrays(g, removed=None):
+    """
+    Returns the arena of a game along with the membership mask of its nodes.
+    :param g: a CompactGraph, a SubGame or a Graph whose nodes are non-negative integers (converted to a CompactGraph,
+    which costs a pass over the graph).
+    :param removed: optionally, the nodes removed from g (a list indexed by node id, see reachability_solver_non_removed).
+    :return: the arena as a CompactGraph and a boolean array whose position v is True if v is a node of the game.
+    """
+    if isinstance(g, SubGame):
+        arena = g.graph
+        member = np.zeros(len(arena.players), dtype=np.bool_)
+        member[np.asarray(g.node_list, dtype=np.intp)] = True
+    elif isinstance(g, CompactGraph):
+        arena = g
+        member = csr_arrays(arena)[0] != -1
+    else:
+        arena = CompactGraph.from_graph(g)
+        # predecessors are listed in the order of g, which is the order followed by the pure-Python attractor
+        arena.pred_targets = array('i', [pred for node in xrange(len(arena.players)) if node in g.predecessors
+                                         for pred in g.predecessors[node]])
+        member = csr_arrays(arena)[0] != -1
+
+    if removed is not None:
+        bits = np.unpackbits(np.frombuffer(removed.tobytes(), dtype=np.uint8))
+        if removed.endian() == 'little':
+            bits = bits.reshape(-1, 8)[:, ::-1].ravel()
+        size = min(len(member), len(removed))
+        member = member.copy()
+        member[:size] &= bits[:size] == 0
+
+    return arena, member
+
+
+def gather(offsets, targets, nodes):
+    """
+    Gathers the adjacency lists of several nodes of a CSR array at once.
+    :param offsets: the offsets of the adjacency lists.
+    :param targets: the adjacency lists, node after node.
+    :param nodes: an array of nodes.
+    :return: two arrays (neighbours, bounds) : neighbours contains the adjacency lists concatenated in the order of
+    nodes, the list of nodes[i] ends at position bounds[i] (see origins).
+    """
+    starts = offsets[nodes]
+    counts = offsets[nodes + 1] - starts
+    bounds = np.cumsum(counts)
+    total = bounds[-1] if len(bounds) else 0
+    if total == 0:
+        return np.empty(0, dtype=targets.dtype), bounds
+    shift = np.repeat(starts - (bounds - counts), counts)
+    return targets[np.arange(total) + shift], bounds
+
+
+def origins(nodes, bounds, positions):
+    """
+    :param nodes: the array of nodes given to gather.
+    :param bounds: the bounds returned by gather.
+    :param positions: positions in the neighbours returned by gather.
+    :return: the array of the nodes whose adjacency list contains each position.
+    """
+    return nodes[np.searchsorted(bounds, positions, side='right')]
+
+
+def first_successors(arena, member, nodes, last=False):
+    """
+    Selects, for each node, one of its successors which belongs to the mask.
+    :param arena: the arena.
+    :param member: boolean mask of the allowed successors.
+    :param nodes: an array of nodes.
+    :param last: if True, the last allowed successor is selected instead of the first one.
+    :return: two arrays (origins, successors) : successors[i] is the successor selected for origins[i].
+    """
+    players, succ_offsets, succ_targets = csr_arrays(arena)[:3]
+    successors, bounds = gather(succ_offsets, succ_targets, nodes)
+    positions = np.flatnonzero(member[successors])
+    sources = origins(nodes, bounds, positions)
+    # the last assignment to a position of stamp is kept, positions are assigned in reverse order to keep the first
+    stamp = np.empty(len(players), dtype=np.intp)
+    if last:
+        stamp[sources] = positions
+    else:
+        stamp[sources[::-1]] = positions[::-1]
+    positions = positions[stamp[sources] == positions]
+    return origins(nodes, bounds, positions), successors[positions]
+
+
+def count(nodes):
+    """
+    Counts the occurrences of each node in an array, using a histogram over the range of the nodes when it is small
+    enough and a sort otherwise.
+    :param nodes: a non-empty array of nodes.
+    :return: two arrays (distinct, counts) : the distinct nodes and their number of occurrences.
+    """
+    low = nodes.min()
+    high = nodes.max()
+    if high - low <= 32 * len(nodes):
+        counts = np.bincount(nodes - low)
+        distinct = np.flatnonzero(counts)
+        return distinct + low, counts[distinct]
+    return np.unique(nodes, return_counts=True)
+
+
+def out_degrees(g, arena, member, removed=None):
+    """
+    :param g: the game graph.
+    :param arena: the arena of g.
+    :param member: boolean mask of the nodes of the game.
+    :param removed: optionally, the nodes removed from g.
+    :return: a new array whose position v is the number of successors of node v in the game (only meaningful for the
+    nodes of the game).
+    """
+    players, succ_offsets, succ_targets, pred_offsets, pred_targets, sources = csr_arrays(arena)
+    if removed is None and isinstance(g, CompactGraph):
+        return np.diff(succ_offsets).astype(np.intp)
+    # only the edges whose target is in the game are counted
+    return np.bincount(sources[member[succ_targets]], minlength=len(member))
+
+
+def attract(arena, member, out, U, j, strategies=True):
+    """
+    Computes the attractor for player j of the set U in the game made of the nodes of the arena in member. Nodes are
+    added to the attractor in the same order as in the queue of solvers.reachability : inside a frontier, a node of
+    player j is added at the first edge leading to it and a node of the opponent at the edge which sets its counter
+    to 0, edges being visited in the order of the frontier.
+    :param arena: the arena.
+    :param member: boolean mask of the nodes of the game.
+    :param out: the out-degrees of the nodes of the game, used as counters (modified).
+    :param U: the target set.
+    :param j: the player for which we compute the attractor.
+    :param strategies: if False, the strategy of player j is not computed.
+    :return: the boolean mask of the attractor, the list of the arrays of nodes added to the attractor (one array per
+    frontier, U excluded) and the list of the arrays of successors selected as strategy for these nodes (-1 for the
+    nodes of the opponent).
+    """
+    players, succ_offsets, succ_targets, pred_offsets, pred_targets, sources = csr_arrays(arena)
+    region = np.zeros(len(players), dtype=np.bool_)
+    available = member.copy()  # nodes of the game which are not in the attractor
+    # stamp[v] is the position of the edge which attracts v in the current frontier
+    stamp = np.empty(len(players), dtype=np.intp)
+    frontier = np.asarray(U, dtype=np.int32)
+    frontier = frontier[frontier < len(players)]  # target nodes which are not in the arena have no predecessors
+    region[frontier] = True
+    available[frontier] = False
+    added, strategy = [], []
+
+    while len(frontier):
+        # predecessors of the whole frontier which are in the game and not yet in the attractor
+        preds, bounds = gather(pred_offsets, pred_targets, frontier)
+        positions = np.flatnonzero(available[preds])
+        candidates = preds[positions]
+        owned = players[candidates] == j
+        chosen = np.zeros(len(preds), dtype=np.bool_)
+
+        # nodes of player j are attracted by the first edge leading to them (the assignment in reverse order leaves
+        # the smallest position in stamp)
+        nodes_j, positions_j = candidates[owned], positions[owned]
+        stamp[nodes_j[::-1]] = positions_j[::-1]
+        chosen[stamp[nodes_j]] = True
+
+        # nodes of the opponent are attracted when all their successors are, each edge decrements their counter
+        nodes_opponent, positions_opponent = candidates[~owned], positions[~owned]
+        if len(nodes_opponent):
+            decremented, counts = count(nodes_opponent)
+            out[decremented] -= counts
+            attracted_opponent = decremented[out[decremented] == 0]
+            stamp[nodes_opponent] = positions_opponent  # the largest position is left in stamp
+            chosen[stamp[attracted_opponent]] = True
+
+        # bulk marking of the new frontier, ordered by the position of the edge which attracted each node
+        chosen = np.flatnonzero(chosen)
+        attracted = preds[chosen]
+        region[attracted] = True
+        available[attracted] = False
+        added.append(attracted)
+        if strategies:
+            strategy.append(np.where(players[attracted] == j, origins(frontier, bounds, chosen), -1))
+        frontier = attracted
+
+    return region, added, strategy
+
+
+def game_nodes(g, member, removed=None):
+    """
+    :param g: the game graph.
+    :param member: boolean mask of the nodes of the game.
+    :param removed: optionally, the nodes removed from g.
+    :return: the array of the nodes of the game, in the order of g.get_nodes().
+    """
+    if isinstance(g, CompactGraph):
+        return np.flatnonzero(member).astype(np.int32)  # nodes of an arena are listed by increasing id
+    nodes = np.asarray(g.get_nodes(), dtype=np.int32)
+    if removed is not None:
+        nodes = nodes[member[nodes]]
+    return nodes
+
+
+def solve(g, U, j, removed=None):
+    """
+    Computes the winning regions and strategies of a reachability game (see reachability_solver).
+    """
+    arena, member = game_arrays(g, removed)
+    players = csr_arrays(arena)[0]
+    opponent = op.opponent(j)
+    region, added, strategy = attract(arena, member, out_degrees(g, arena, member, removed), U, j)
+
+    region_j = list(U)
+    strat_j = defaultdict(lambda: -1)
+    # nodes of player j in the target set select their first successor in the game
+    targets = np.asarray(U, dtype=np.int32)
+    origins, successors = first_successors(arena, member, targets[players[targets] == j])
+    strat_j.update(izip(origins.tolist(), successors.tolist()))
+    if added:
+        added = np.concatenate(added)
+        strategy = np.concatenate(strategy)
+        region_j.extend(added.tolist())
+        owned = players[added] == j
+        strat_j.update(izip(added[owned].tolist(), strategy[owned].tolist()))
+
+    nodes = game_nodes(g, member, removed)
+    nodes = nodes[~region[nodes]]
+    region_opponent = nodes.tolist()
+    strat_opponent = defaultdict(lambda: -1)
+    # nodes of the opponent outside of the attractor select their last successor which is also outside of it
+    origins, successors = first_successors(arena, member & ~region, nodes[players[nodes] == opponent], last=True)
+    strat_opponent.update(izip(origins.tolist(), successors.tolist()))
+
+    return (region_j, strat_j), (region_opponent, strat_opponent)
+
+
+def reachability_solver(g, U, j):
+    """
+    Reachability games solver. Computes Att_j^g(U), the attractor for player j of target set U in the game g, which is
+    the winning region of player j, and the winning region of player jbar along with the winning strategies.
+    :param g: the game graph.
+    :param U: the target set.
+    :param j: the player with the reachability objective.
+    :return: two tuples : (w_j, strat_j), (w_jbar, strat_jbar) where w_j and w_jbar are lists containing nodes of their
+    respective winning regions and where strat_j and strat_jbar are dictionaries containing winning strategies.
+    """
+    return solve(g, U, j)
+
+
+def reachability_solver_non_removed(g, U, j, removed, degrees=None):
+    """
+    Reachability games solver. Uses a list of removed nodes instead of creation of subgames (see reachability_solver).
+    :param removed: the removed nodes from g.
+    :param g: the game graph.
+    :param U: the target set.
+    :param j: the player with the reachability objective.
+    :param degrees: unused, the out-degrees are recomputed from the removed nodes in bulk. Only present so that this
+    function can be used in place of solvers.reachability.reachability_solver_non_removed.
+    :return: two tuples : (w_j, strat_j), (w_jbar, strat_jbar) where w_j and w_jbar are lists containing nodes of their
+    respective winning regions and where strat_j and strat_jbar are dictionaries containing winning strategies.
+    """
+    return solve(g, U, j, removed)
+
+
+def attractor(g, U, j):
+    """
+    Computes the attractor for player j of the set U in g. Does not create any strategy.
+    :param g: the game graph.
+    :param U: the target set.
+    :param j: the player for which we compute the attractor.
+    :return: W the list of nodes corresponding to the attractor and Wbis the list of the other nodes of g.
+    """
+    arena, member = game_arrays(g)
+    region, added, strategy = attract(arena, member, out_degrees(g, arena, member), U, j, strategies=False)
+    W = list(U)
+    for frontier in added:
+        W.extend(frontier.tolist())
+    nodes = game_nodes(g, member)
+    return W, nodes[~region[nodes]].tolist()
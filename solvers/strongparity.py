@@ -1,20 +1,90 @@
+from array import array
 from collections import defaultdict, deque
-
-from bitarray import bitarray
+from types import GeneratorType
 
 import reachability
-from antichains.library_linker import winning_region_c
-from graph import Graph
+from solvers import decomposition
+from antichains.library_linker import winning_region_c, zielonka_c, destroyGraph_c
+from graph import Graph, CompactGraph, PriorityIndex, RemovalMask
 from tools import operations as ops
 from tools.operations import transform_graph_into_c_spec, transform_graph_into_c
-import ast
 
-def strong_parity_solver(g):
+def _unroll(steps):
+    """
+    Runs a recursive algorithm written as a generator of steps without using the call stack of Python. A step yields
+    the generator of each recursive call it makes, receives the solution of the call in return, and its last yielded
+    value is its own solution. The pending steps are kept in an explicit stack, so the depth of the recursion (one or
+    two levels per priority for the recursive algorithm) is not limited by the recursion limit of Python.
+    :param steps: the generator of the outermost call.
+    :return: the solution of the outermost call.
+    """
+    stack = [steps]
+    value = None
+    while stack:
+        # the value is the solution of the call which just returned, None when a step is started
+        value = stack[-1].send(value)
+        if type(value) is GeneratorType:
+            stack.append(value)
+            value = None
+        else:
+            stack.pop()
+    return value
+
+
+def strong_parity_solver(g, index=None):
     """
     Strong parity games solver. This is an implementation of the recursive algorithm used to solve parity games.
+    The recursion is unrolled on an explicit stack (see _unroll), so any number of priorities can be handled.
+    :param g: the game to solve.
+    :param index: the priority index of the nodes of g (built if not provided, see graph.PriorityIndex).
+    :return: the solution in the following format : (W_0, sigma_0), (W_1, sigma_1).
+    """
+    return _unroll(_strong_parity_steps(g, index))
+
+
+def strong_parity_solver_no_strategies(g, index=None):
+    """
+    Strong parity games solver. This is an implementation of the recursive algorithm used to solve parity games.
+    This implementation does not compute the winning strategies (for comparison purpose with other algorithms
+    which don't). The recursion is unrolled on an explicit stack (see _unroll).
+    :param g: the game to solve.
+    :param index: the priority index of the nodes of g (built if not provided, see graph.PriorityIndex).
+    :return: the solution in the following format : W_0, W_1.
+    """
+    return _unroll(_strong_parity_no_strategies_steps(g, index))
+
+
+def strong_parity_solver_non_removed(g, removed, degrees=None, index=None):
+    """
+    Strong parity games solver. This algorithm is an implementation of the recursive algorithm used to solve parity
+    games. It uses a list of non-removed nodes as a way to track sub-games. The attractor computation also uses this
+    technique. The value at position i in the list is true if node i is removed from the original game arena.
+    The list is shared by every level of the recursion (see graph.RemovalMask) : the nodes removed before a recursive
+    call are put back after it, so removed is back to its initial value when the solver returns.
+    The number of outgoing edges of each non-removed node is computed once and then decremented when nodes are removed
+    (and incremented when they are put back). The recursion is unrolled on an explicit stack (see _unroll).
+    :param removed: the removed nodes.
     :param g: the game to solve.
+    :param degrees: the number of outgoing edges of each non-removed node (computed if not provided), they are
+    modified during the computation and restored at the end.
+    :param index: the priority index of the non-removed nodes (built if not provided, see graph.PriorityIndex).
     :return: the solution in the following format : (W_0, sigma_0), (W_1, sigma_1).
     """
+    if degrees is None:
+        degrees = reachability.init_out_non_removed(g, removed)
+    if index is None:
+        index = PriorityIndex(g)
+        index.remove([node for node in g.get_nodes() if removed[node]])
+    mask = RemovalMask(removed, len(g.nodes))
+    return _unroll(_strong_parity_non_removed_steps(g, mask, degrees, index))
+
+
+def _strong_parity_steps(g, index):
+    """
+    Steps of strong_parity_solver on a sub-game, to be run by _unroll.
+    :param g: the game to solve.
+    :param index: the priority index of the nodes of g (built if None).
+    """
     W1 = []  # Winning region of player 0
     W2 = []  # Winning region of player 1
     strat1 = defaultdict(lambda: -1)  # Winning strategy of player 0
@@ -22,10 +92,13 @@ def strong_parity_solver(g):
 
     # if the game is empty, return the empty regions and strategies
     if len(g.nodes) == 0:
-        return (W1, strat1), (W2, strat2)
+        yield (W1, strat1), (W2, strat2)
 
     else:
-        i = ops.max_priority(g)  # get max priority occurring in g
+        if index is None:
+            index = PriorityIndex(g)
+
+        i = index.max_priority()  # get max priority occurring in g
 
         # determining which player we are considering, if i is even : player 0 and else player 1
         if i % 2 == 0:
@@ -35,16 +108,19 @@ def strong_parity_solver(g):
 
         opponent = ops.opponent(j)  # getting the opponent of the player
 
-        U = ops.i_priority_node(g, i)  # target set for the attractor : nodes of priority i
+        U = index.nodes(i)  # target set for the attractor : nodes of priority i
 
         # getting the attractor A and the attractor strategy tau and discarding the region and strategy for the opponent
         (A, tau1), (discard1, discard2) = reachability.reachability_solver(g, U, j)
 
         # The subgame G\A is composed of the nodes not in the attractor, thus the nodes of the opposite player's region
-        G_A = g.subgame(discard1)
+        G_A = g.subgame(discard1, A)
 
         # Recursively solving the subgame G\A, solution comes as (W_0, sigma_0), (W_1, sigma_1)
-        sol_player1, sol_player2 = strong_parity_solver(G_A)
+        # the nodes of A are removed from the index while G\A is solved
+        index.remove(A)
+        sol_player1, sol_player2 = (yield _strong_parity_steps(G_A, index))
+        index.restore(A)
 
         # depending on which player we are considering, assign regions and strategies to the proper variables
         # W'_j is noted W_j, sigma'_j is noted sig_j; the same aplies for jbar
@@ -72,10 +148,12 @@ def strong_parity_solver(g):
             # compute attractor B and strategy nu
             (B, nu), (discard1, discard2) = reachability.reachability_solver(g, W_jbar, opponent)
             # The subgame G\B is composed of the nodes not in the attractor, so of the opposite player's winning region
-            G_B = g.subgame(discard1)
+            G_B = g.subgame(discard1, B)
 
             # recursively solve subgame G\B, solution comes as (W_0, sigma_0), (W_1, sigma_1)
-            sol_player1_, sol_player2_ = strong_parity_solver(G_B)
+            index.remove(B)
+            sol_player1_, sol_player2_ = (yield _strong_parity_steps(G_B, index))
+            index.restore(B)
 
             # depending on which player we are considering, assign regions and strategies to the proper variables
             # W''_j is noted W__j, sigma''_j is noted sig__j; the same aplies for jbar
@@ -109,25 +187,26 @@ def strong_parity_solver(g):
                 strat1.update(sig__jbar)
                 strat1.update(sig_jbar)
 
-    return (W1, strat1), (W2, strat2)
+    yield (W1, strat1), (W2, strat2)
 
-def strong_parity_solver_no_strategies(g):
+def _strong_parity_no_strategies_steps(g, index):
     """
-    Strong parity games solver. This is an implementation of the recursive algorithm used to solve parity games.
-    This implementation does not compute the winning strategies (for comparison purpose with other algorithms
-    which don't)
+    Steps of strong_parity_solver_no_strategies on a sub-game, to be run by _unroll.
     :param g: the game to solve.
-    :return: the solution in the following format : (W_0, sigma_0), (W_1, sigma_1).
+    :param index: the priority index of the nodes of g (built if None).
     """
     W1 = []  # Winning region of player 0
     W2 = []  # Winning region of player 1
 
     # if the game is empty, return the empty regions
     if len(g.nodes) == 0:
-        return W1, W2
+        yield W1, W2
 
     else:
-        i = ops.max_priority(g)  # get max priority occurring in g
+        if index is None:
+            index = PriorityIndex(g)
+
+        i = index.max_priority()  # get max priority occurring in g
 
         # determining which player we are considering, if i is even : player 0 and else player 1
         if i % 2 == 0:
@@ -137,16 +216,18 @@ def strong_parity_solver_no_strategies(g):
 
         opponent = ops.opponent(j)  # getting the opponent of the player
 
-        U = ops.i_priority_node(g, i)  # target set for the attractor : nodes of priority i
+        U = index.nodes(i)  # target set for the attractor : nodes of priority i
 
         # getting the attractor A and discarding the region for the opponent
         A, discard1 = reachability.attractor(g,U,j)
 
         # The subgame G\A is composed of the nodes not in the attractor, thus the nodes of the opposite player's region
-        G_A = g.subgame(discard1)
+        G_A = g.subgame(discard1, A)
 
         # Recursively solving the subgame G\A, solution comes as (W_0, W_1)
-        sol_player1, sol_player2 = strong_parity_solver_no_strategies(G_A)
+        index.remove(A)
+        sol_player1, sol_player2 = (yield _strong_parity_no_strategies_steps(G_A, index))
+        index.restore(A)
 
         # depending on which player we are considering, assign regions to the proper variables
         # W'_j is noted W_j, sigma'_j is noted sig_j; the same aplies for jbar
@@ -170,10 +251,12 @@ def strong_parity_solver_no_strategies(g):
             # compute attractor B
             B, discard1 = reachability.attractor(g, W_jbar, opponent)
             # The subgame G\B is composed of the nodes not in the attractor, so of the opposite player's winning region
-            G_B = g.subgame(discard1)
+            G_B = g.subgame(discard1, B)
 
             # recursively solve subgame G\B, solution comes as (W_0, W_1)
-            sol_player1_, sol_player2_ = strong_parity_solver_no_strategies(G_B)
+            index.remove(B)
+            sol_player1_, sol_player2_ = (yield _strong_parity_no_strategies_steps(G_B, index))
+            index.restore(B)
 
             # depending on which player we are considering, assign regions to the proper variables
             # W''_j is noted W__j, sigma''_j is noted sig__j; the same aplies for jbar
@@ -197,16 +280,15 @@ def strong_parity_solver_no_strategies(g):
                 W1.extend(W__jbar)
                 W1.extend(B)
 
-    return W1, W2
+    yield W1, W2
 
-def strong_parity_solver_non_removed(g, removed):
+def _strong_parity_non_removed_steps(g, mask, degrees, index):
     """
-    Strong parity games solver. This algorithm is an implementation of the recursive algorithm used to solve parity
-    games. It uses a list of non-removed nodes as a way to track sub-games. The attractor computation also uses this
-    technique. The value at position i in the list is true if node i is removed from the original game arena.
-    :param removed: the removed nodes.
+    Steps of strong_parity_solver_non_removed on a sub-game, to be run by _unroll.
     :param g: the game to solve.
-    :return: the solution in the following format : (W_0, sigma_0), (W_1, sigma_1).
+    :param mask: the mask of the removed nodes, shared by every step.
+    :param degrees: the number of outgoing edges of each non-removed node, shared by every step.
+    :param index: the priority index of the non-removed nodes.
     """
 
     W1 = []  # Winning region of player 0
@@ -215,13 +297,14 @@ def strong_parity_solver_non_removed(g, removed):
     strat2 = defaultdict(lambda: -1)  # Winning strategy of player 1
 
     # if the game is empty, return the empty regions and strategies
-    # removed is a bitarray, count(42) counts the occurrences of True
-    # if every element in the list is true, every node is removed and the game is empty
-    if removed.count(42) == len(g.nodes):
-        return (W1, strat1), (W2, strat2)
+    # the mask counts the nodes which are not removed, the game is empty if every node is removed
+    if len(mask) == 0:
+        yield (W1, strat1), (W2, strat2)
 
     else:
-        i = ops.max_priority_non_removed(g, removed)  # get max priority occurring in g, considering the removed nodes
+        removed = mask.removed  # the bitarray of the removed nodes, read by the attractor
+
+        i = index.max_priority()  # get max priority occurring in g, considering the removed nodes
         # determining which player we are considering, if i is even : player 0 and else player 1
         if i % 2 == 0:
             j = 0
@@ -231,19 +314,22 @@ def strong_parity_solver_non_removed(g, removed):
         opponent = ops.opponent(j)  # getting the opponent of the player
 
         # target set for the attractor : nodes of priority i, considering the removed nodes
-        U = ops.i_priority_node_non_removed(g, i, removed)
+        U = index.nodes(i)
 
         # getting the attractor A and the attractor strategy tau and discarding the region and strategy for the opponent
         # using the attractor function which considers the non removed nodes
-        (A, tau1), (discard1, discard2) = reachability.reachability_solver_non_removed(g, U, j, removed)
+        (A, tau1), (discard1, discard2) = reachability.reachability_solver_non_removed(g, U, j, removed, degrees)
 
         # The subgame G\A is composed of the nodes not in the attractor, thus the nodes of the opposite player's region
-        # Copy the bitarray and remove the nodes of the attractor by setting their value to True in the list
-        copy_removed1 = bitarray(removed)
-        for nodes in A:
-            copy_removed1[nodes] = True
+        # The nodes of the attractor are removed in the shared mask and put back after the recursive call
+        mask.remove(A)
+        # the out-degrees are updated by only visiting the edges entering the attractor
+        reachability.remove_from_out_non_removed(g, degrees, A)
         # Recursively solving the subgame G\A, solution comes as (W_0, sigma_0), (W_1, sigma_1)
-        sol_player1, sol_player2 = strong_parity_solver_non_removed(g, copy_removed1)
+        index.remove(A)
+        sol_player1, sol_player2 = (yield _strong_parity_non_removed_steps(g, mask, degrees, index))
+        index.restore(A)
+        reachability.restore_to_out_non_removed(g, degrees, mask.undo())
 
         # depending on which player we are considering, assign regions and strategies to the proper variables
         # W'_j is noted W_j, sigma'_j is noted sig_j; the same aplies for jbar
@@ -269,14 +355,17 @@ def strong_parity_solver_non_removed(g, removed):
                 strat2.update(sig_j)
         else:
             # compute attractor B and strategy nu
-            (B, nu), (discard1, discard2) = reachability.reachability_solver_non_removed(g, W_jbar, opponent, removed)
+            (B, nu), (discard1, discard2) = reachability.reachability_solver_non_removed(g, W_jbar, opponent, removed,
+                                                                                        degrees)
             # The subgame G\B is composed of the nodes not in the attractor, so of the opposite player's winning region
-            copy_removed2 = bitarray(removed)
-            for nodes in B:
-                copy_removed2[nodes] = True
+            mask.remove(B)
+            reachability.remove_from_out_non_removed(g, degrees, B)
 
             # recursively solve subgame G\B, solution comes as (W_0, sigma_0), (W_1, sigma_1)
-            sol_player1_, sol_player2_ = strong_parity_solver_non_removed(g, copy_removed2)
+            index.remove(B)
+            sol_player1_, sol_player2_ = (yield _strong_parity_non_removed_steps(g, mask, degrees, index))
+            index.restore(B)
+            reachability.restore_to_out_non_removed(g, degrees, mask.undo())
 
             # depending on which player we are considering, assign regions and strategies to the proper variables
             # W''_j is noted W__j, sigma''_j is noted sig__j; the same aplies for jbar
@@ -310,9 +399,851 @@ def strong_parity_solver_non_removed(g, removed):
                 strat1.update(sig__jbar)
                 strat1.update(sig_jbar)
 
-    return (W1, strat1), (W2, strat2)
+    yield (W1, strat1), (W2, strat2)
+
+
+def _quasi_polynomial_region(g, d, precision, opponent_precision):
+    """
+    Recursive step of the quasi-polynomial algorithm (Parys, with the precisions of Lehtinen, Schewe and Wojtczuk).
+    Player j of parity d removes from g the attractors of the regions the opponent wins in the sub-games left by the
+    attractor of the nodes of priority d, as in the recursive algorithm, but the regions of the opponent are searched
+    with half of its precision as long as some are found, and only then with its full precision. Every dominion of the
+    opponent of size at most opponent_precision is removed and every dominion of j of size at most precision is kept,
+    so the result is the winning region of j when both precisions are at least the number of nodes of g.
+    :param g: the game graph, whose priorities are at most d.
+    :param d: the priority of the current level.
+    :param precision: the precision of the player j of parity d.
+    :param opponent_precision: the precision of the opponent of j.
+    :return: the list of the nodes of g which are left to j.
+    """
+    if len(g.get_nodes()) == 0 or opponent_precision == 0:
+        return g.get_nodes()
+
+    # levels without nodes are skipped, while keeping the parity of the player considered
+    top = max(g.get_node_priority(node) for node in g.get_nodes())
+    if top < d:
+        d = top if top % 2 == d % 2 else top + 1
+    j = d % 2
+    opponent = ops.opponent(j)
+
+    half = True  # the opponent precision is halved until no region is found
+    while True:
+        U = [node for node in g.get_nodes() if g.get_node_priority(node) == d]
+        A, discard = reachability.attractor(g, U, j)
+        H = g.subgame(discard, A)
+        W_opponent = []
+        if len(discard) != 0:
+            # the roles are exchanged in the sub-game : the opponent is the player of parity d - 1
+            sub_precision = opponent_precision // 2 if half else opponent_precision
+            W_opponent = _quasi_polynomial_region(H, d - 1, sub_precision, precision)
+
+        if not W_opponent:
+            if half:
+                half = False
+                continue
+            return g.get_nodes()
+
+        B, discard = reachability.attractor(g, W_opponent, opponent)
+        g = g.subgame(discard, B)
+        half = True
+
+
+def strong_parity_solver_quasi_polynomial(g):
+    """
+    Strong parity games solver in quasi-polynomial time. This is the recursive algorithm in which the regions of the
+    opponent are searched with a precision (the size of the dominions they are guaranteed to find) which is halved in
+    every recursive call but the last one of each level (see _quasi_polynomial_region), which bounds the number of
+    recursive calls by a quasi-polynomial in the number of nodes. This implementation does not compute the strategies.
+    :param g: the game to solve.
+    :return: the solution in the following format : W_0, W_1.
+    """
+    nodes = g.get_nodes()
+    if len(nodes) == 0:
+        return [], []
+
+    d = max(g.get_node_priority(node) for node in nodes)
+    j = d % 2
+    W_j = _quasi_polynomial_region(g, d, len(nodes), len(nodes))
+    in_W_j = set(W_j)
+    W_jbar = [node for node in nodes if node not in in_W_j]
+    if j == 0:
+        return list(W_j), W_jbar
+    return W_jbar, list(W_j)
+
+
+def small_progress_measures(g, j, lost=()):
+    """
+    Computes the least small progress measure (Jurdzinski) for player j. A measure counts, for each priority of the
+    parity of the opponent (from the highest), how many times it can still be seen before a higher priority of the
+    parity of j is seen. The measures are stored in a flat array, one row of k integers per node, and a node whose
+    measure exceeds the number of nodes of each of these priorities is marked as top. The measures are lifted (a node of
+    j takes the least measure of its successors, a node of the opponent the greatest one, increased when its priority
+    is of the parity of the opponent) with a worklist : the predecessors of a lifted node are lifted again.
+    :param g: the game graph.
+    :param j: the player for which the measures are computed.
+    :param lost: nodes known to be won by the opponent, their measure is top from the start.
+    :return: the winning region of j (the nodes which are not top), the winning strategy of j in it (the successor of
+    least measure) and the winning region of the opponent.
+    """
+    nodes = g.get_nodes()
+    opponent_priorities = sorted(set(g.get_node_priority(node) for node in nodes if g.get_node_priority(node) % 2 != j),
+                                 reverse=True)
+    component = {p: i for i, p in enumerate(opponent_priorities)}
+    k = len(opponent_priorities)
+    limit = [0] * k  # greatest value of each component : the number of nodes of its priority
+    for node in nodes:
+        p = g.get_node_priority(node)
+        if p in component:
+            limit[component[p]] += 1
+
+    row = {node: i for i, node in enumerate(nodes)}
+    measures = array('i', [0]) * (k * len(nodes))
+    top = bytearray(len(nodes))
+    for node in lost:
+        top[row[node]] = 1
+    cut = []  # number of components a node keeps : the ones of the opponent priorities at least equal to its priority
+    increase = bytearray(len(nodes))  # 1 for the nodes whose priority is of the parity of the opponent
+    for node in nodes:
+        p = g.get_node_priority(node)
+        cut.append(sum(1 for q in opponent_priorities if q >= p))
+        increase[row[node]] = p % 2 != j
+
+    def progress(v, w):
+        # least measure at least equal to the one of w on the components kept by v, greater if the priority of v is of
+        # the parity of the opponent; None stands for top
+        r = row[w]
+        if top[r]:
+            return None
+        c = cut[row[v]]
+        m = measures[r * k:r * k + c].tolist()
+        if increase[row[v]]:
+            i = c - 1
+            while True:
+                if i < 0:
+                    return None
+                m[i] += 1
+                if m[i] <= limit[i]:
+                    break
+                m[i] = 0
+                i -= 1
+        return m
+
+    def best(v):
+        # successor of v whose progress is the least for j and the greatest for the opponent, and this progress
+        least = g.get_node_player(v) == j
+        choice, value = None, None
+        for w in g.get_successors(v):
+            m = progress(v, w)
+            if choice is None:
+                better = True
+            elif least:
+                better = m is not None and (value is None or m < value)
+            else:
+                better = value is not None and (m is None or m > value)
+            if better:
+                choice, value = w, m
+        return choice, value
+
+    queue = deque(nodes)
+    queued = bytearray([1]) * len(nodes)
+    while queue:
+        v = queue.popleft()
+        r = row[v]
+        queued[r] = 0
+        if top[r]:
+            continue
+        choice, value = best(v)
+        c = cut[r]
+        if value is None:
+            top[r] = 1
+        elif value > measures[r * k:r * k + c].tolist():
+            measures[r * k:r * k + c] = array('i', value)
+        else:
+            continue
+        # the measure of v increased, its predecessors may have to be lifted
+        for u in g.get_predecessors(v):
+            if not queued[row[u]] and not top[row[u]]:
+                queued[row[u]] = 1
+                queue.append(u)
+
+    W_j = []
+    W_jbar = []
+    strategy = defaultdict(lambda: -1)
+    for node in nodes:
+        if top[row[node]]:
+            W_jbar.append(node)
+        else:
+            W_j.append(node)
+            if g.get_node_player(node) == j:
+                strategy[node] = best(node)[0]
+    return W_j, strategy, W_jbar
+
+
+def strong_parity_solver_progress_measures(g):
+    """
+    Strong parity games solver based on small progress measures. The least progress measure of each player yields its
+    winning region and its winning strategy (see small_progress_measures). The running time is polynomial in the
+    number of nodes and exponential in the number of priorities only. The measures of player 1 are computed knowing
+    the winning region of player 0, whose nodes do not have to be lifted up to top again.
+    :param g: the game to solve.
+    :return: the solution in the following format : (W_0, sigma_0), (W_1, sigma_1).
+    """
+    W_0, sigma_0, W_1 = small_progress_measures(g, 0)
+    # the nodes won by player 0 are top for player 1, only the measures of the region of player 1 are lifted
+    W_1, sigma_1, discard = small_progress_measures(g, 1, W_0)
+    return (W_0, sigma_0), (W_1, sigma_1)
+
+
+def _valuation(t, offsets, targets, sources, entering):
+    """
+    Computes the valuation of a strategy of player 0 (Voge and Jurdzinski) : the play profile of every node when player
+    1 plays its best counter strategy. Nodes are dense positions 0 to n-1 whose relevance is the absolute value of t, t
+    being positive for the nodes of even priority and negative for the others. The profile of a node is (w, P, e) where
+    w is the most relevant node of the cycle the play ends in, P the set of the nodes more relevant than w visited
+    before w and e the number of moves before w. It is returned as a key : a tuple which is greater when the profile
+    is better for player 0.
+    Every search marks the positions it visits with its number and the edges removed by the counter strategy are
+    marked with the number of their cycle, so the arrays are allocated once and never cleared.
+    :param t: t[v] is the signed relevance of position v.
+    :param offsets: the edges leaving position v in the game restricted to the strategy of player 0 are the edges
+    offsets[v] to offsets[v + 1] - 1.
+    :param targets: targets[e] is the target of edge e.
+    :param sources: sources[e] is the source of edge e.
+    :param entering: entering[v] is the list of the edges entering position v.
+    :return: the list of the keys of the profiles of the positions.
+    """
+    n = len(t)
+    keys = [None] * n
+    valued = bytearray(n)
+    in_R = bytearray(n)
+    mark = array('i', [0]) * n  # positions visited by the current search are marked with its number
+    dead = array('i', [0]) * len(targets)  # edges removed from the current cycle are marked with its number
+    distance = array('i', [0]) * n
+    remaining = array('i', [0]) * n  # edges of a position which still lead to positions of unknown distance
+    profile = [None] * n  # P for each position of the current cycle
+    search = 0
+    cycle = 0
+
+    # the cycles are considered from the worst to the best for player 0
+    for w in sorted(xrange(n), key=lambda v: t[v]):
+        if valued[w]:
+            continue
+        relevance = abs(t[w])
+
+        # w is considered if it is the most relevant position of a cycle of positions which are not valued yet
+        search += 1
+        stack = [w]
+        found = False
+        while stack and not found:
+            y = stack.pop()
+            for e in entering[y]:
+                x = sources[e]
+                if x == w:
+                    found = True
+                    break
+                if mark[x] != search and not valued[x] and abs(t[x]) < relevance:
+                    mark[x] = search
+                    stack.append(x)
+        if not found:
+            continue
+
+        # R : the positions which are not valued yet and can reach w
+        cycle += 1
+        search += 1
+        mark[w] = search
+        R = [w]
+        stack = [w]
+        while stack:
+            y = stack.pop()
+            for e in entering[y]:
+                x = sources[e]
+                if mark[x] != search and not valued[x]:
+                    mark[x] = search
+                    R.append(x)
+                    stack.append(x)
+        for v in R:
+            in_R[v] = 1
+            profile[v] = []
+
+        for u in sorted((v for v in R if abs(t[v]) > relevance), key=lambda v: -abs(t[v])):
+            # player 1 avoids the even node u whenever w can be reached without visiting it (the other nodes visit it
+            # once and then move to the nodes avoiding it) and visits the odd node u whenever it can be reached before
+            # w : U is the set of the nodes which reach the target without going through the blocked node
+            if t[u] > 0:
+                target, blocked = w, u
+            else:
+                target, blocked = u, w
+            search += 1
+            mark[target] = search
+            U = [target]
+            stack = [target]
+            while stack:
+                y = stack.pop()
+                for e in entering[y]:
+                    x = sources[e]
+                    if mark[x] != search and x != blocked and in_R[x] and dead[e] != cycle:
+                        mark[x] = search
+                        U.append(x)
+                        stack.append(x)
+            if t[u] > 0:
+                for v in R:
+                    if mark[v] != search:
+                        profile[v].append(t[u])
+                U.append(u)  # the edges leaving U and u are removed
+                first = 0
+            else:
+                for v in U:
+                    profile[v].append(t[u])
+                first = 1  # the edges leaving U, except the ones of u, are removed
+            for k in xrange(first, len(U)):
+                x = U[k]
+                for e in xrange(offsets[x], offsets[x + 1]):
+                    y = targets[e]
+                    if in_R[y] and mark[y] != search:
+                        dead[e] = cycle
+
+        # distance to w : the shortest one if w is odd (player 0 delays the cycle), else the longest one, which is
+        # computed in topological order since the remaining edges outside of w form an acyclic graph
+        search += 1
+        mark[w] = search
+        distance[w] = 0
+        queue = deque([w])
+        if t[w] < 0:
+            while queue:
+                y = queue.popleft()
+                for e in entering[y]:
+                    x = sources[e]
+                    if mark[x] != search and in_R[x] and dead[e] != cycle:
+                        mark[x] = search
+                        distance[x] = distance[y] + 1
+                        queue.append(x)
+        else:
+            for x in R:
+                count = 0
+                for e in xrange(offsets[x], offsets[x + 1]):
+                    if in_R[targets[e]] and dead[e] != cycle:
+                        count += 1
+                remaining[x] = count
+                distance[x] = 0
+            while queue:
+                y = queue.popleft()
+                for e in entering[y]:
+                    x = sources[e]
+                    if x != w and in_R[x] and dead[e] != cycle:
+                        if distance[y] + 1 > distance[x]:
+                            distance[x] = distance[y] + 1
+                        remaining[x] -= 1
+                        if remaining[x] == 0:
+                            queue.append(x)
+
+        for v in R:
+            valued[v] = 1
+            in_R[v] = 0
+            keys[v] = (t[w], tuple(profile[v]) + (0,), -distance[v] if t[w] > 0 else distance[v])
+            profile[v] = None
+    return keys
+
+
+def strong_parity_solver_strategy_improvement(g):
+    """
+    Strong parity games solver based on the discrete strategy improvement algorithm of Voge and Jurdzinski. Starting
+    from any strategy of player 0, every node of player 0 switches to a successor of better valuation (see _valuation)
+    as long as one exists, all the switches of an iteration being applied before the next valuation. The game is
+    indexed once into arrays and the game restricted to the strategy of player 0 is updated edge by edge when the
+    strategy switches. The final strategy of player 0 and the best counter strategy of player 1 are winning strategies
+    of both players.
+    :param g: the game to solve.
+    :return: the solution in the following format : (W_0, sigma_0), (W_1, sigma_1).
+    """
+    nodes = list(g.get_nodes())
+    n = len(nodes)
+    position = dict((node, i) for i, node in enumerate(nodes))
+    players = array('b', [g.get_node_player(node) for node in nodes])
+
+    # relevance : priorities with ties broken by position, signed by parity
+    t = array('i', [0]) * n
+    for rank, i in enumerate(sorted(xrange(n), key=lambda v: g.get_node_priority(nodes[v]))):
+        t[i] = rank + 1 if g.get_node_priority(nodes[i]) % 2 == 0 else -(rank + 1)
+
+    succ_offsets = array('i', [0])
+    succ_targets = array('i')
+    for node in nodes:
+        succ_targets.extend(position[succ] for succ in g.get_successors(node))
+        succ_offsets.append(len(succ_targets))
+
+    # game restricted to the strategy sigma of player 0 (initially its first successor in every node) : a node of
+    # player 0 has a single edge, whose target is changed when sigma switches, the other nodes keep all their edges
+    sigma = array('i', [-1]) * n
+    offsets = array('i', [0])
+    targets = array('i')
+    sources = array('i')
+    entering = [[] for _ in xrange(n)]  # edges entering each node
+    for v in xrange(n):
+        if players[v] == 0:
+            sigma[v] = succ_targets[succ_offsets[v]]
+            edges = (sigma[v],)
+        else:
+            edges = succ_targets[succ_offsets[v]:succ_offsets[v + 1]]
+        for y in edges:
+            entering[y].append(len(targets))
+            targets.append(y)
+            sources.append(v)
+        offsets.append(len(targets))
+
+    while True:
+        keys = _valuation(t, offsets, targets, sources, entering)
+        switches = []
+        for v in xrange(n):
+            if players[v] == 0:
+                best = max(succ_targets[succ_offsets[v]:succ_offsets[v + 1]], key=lambda u: keys[u])
+                if keys[best] > keys[sigma[v]]:
+                    switches.append((v, best))
+        if not switches:
+            break
+        for v, best in switches:
+            e = offsets[v]
+            entering[sigma[v]].remove(e)
+            entering[best].append(e)
+            sigma[v] = best
+            targets[e] = best
+
+    W_0, W_1 = [], []
+    sigma_0, sigma_1 = defaultdict(lambda: -1), defaultdict(lambda: -1)
+    for v in xrange(n):
+        if keys[v][0] > 0:
+            W_0.append(nodes[v])
+            if players[v] == 0:
+                sigma_0[nodes[v]] = nodes[sigma[v]]
+        else:
+            W_1.append(nodes[v])
+            if players[v] == 1:
+                best = min(succ_targets[succ_offsets[v]:succ_offsets[v + 1]], key=lambda u: keys[u])
+                sigma_1[nodes[v]] = nodes[best]
+    return (W_0, sigma_0), (W_1, sigma_1)
+
+
+def strong_parity_solver_scc(g, workers=None):
+    """
+    Strong parity games solver which decomposes the game into strongly connected components. The components are
+    considered bottom-up and only the nodes of a component which are not attracted to the winning regions of the lower
+    components are solved by the recursive algorithm (see solvers.decomposition). The exponential behaviour of the
+    recursive algorithm is thus limited to the components.
+    :param g: the game to solve.
+    :param workers: the number of worker processes solving independent components in parallel (None for none).
+    :return: the solution in the following format : (W_0, sigma_0), (W_1, sigma_1).
+    """
+    return decomposition.solve_components(g, strong_parity_solver, True, workers)
+
+
+def promotion_search(g):
+    """
+    Searches a dominion in a game using priority promotions. Every node has a region priority, initially its own
+    priority. The region of the highest region priority p is the attractor, for the player alpha of parity p, of the
+    nodes of region priority p in the sub-game of the nodes of region priority at most p. If the opponent can escape
+    from it to the rest of that sub-game, it is a quasi-dominion : its nodes get the region priority p and the search
+    continues with the next lower region priority. Else, if the opponent can only escape to regions of higher priority,
+    it is promoted to the lowest of them (the nodes of lower region priority get back their own priority). Else, it is
+    a dominion of alpha.
+    :param g: the game in which the dominion is searched (it must not be empty).
+    :return: the dominion, the player alpha winning it and the strategy of alpha in it.
+    """
+    priority = {node: g.get_node_priority(node) for node in g.get_nodes()}
+    region = dict(priority)  # region priority of each node
+    sigma = {}  # strategy of alpha in the quasi-dominions, kept while they are promoted
+    p = max(region.itervalues())
+
+    while True:
+        alpha = p % 2
+        H = [node for node in g.get_nodes() if region[node] <= p]
+        sub = g.subgame(H)
+        target = [node for node in H if region[node] == p]
+        R, rest = reachability.attractor(sub, target, alpha)
+        position = {node: i for i, node in enumerate(R)}
+
+        # strategy of alpha in R : the attracted nodes move towards the target (to a node attracted before them), the
+        # nodes of priority p stay in R and the promoted nodes keep the strategy of their quasi-dominion
+        closed = True
+        for i, node in enumerate(R):
+            if sub.get_node_player(node) == alpha:
+                if region[node] != p:
+                    sigma[node] = next(s for s in sub.get_successors(node) if position.get(s, i) < i)
+                elif priority[node] == p or sigma.get(node) not in position:
+                    sigma.pop(node, None)
+                    for s in sub.get_successors(node):
+                        if s in position:
+                            sigma[node] = s
+                            break
+                    else:
+                        closed = False  # alpha cannot stay in R
+            elif region[node] == p and any(s not in position for s in sub.get_successors(node)):
+                closed = False  # the opponent can escape to the rest of the sub-game
+
+        if not closed:
+            for node in R:
+                region[node] = p
+            p = max(region[node] for node in rest)
+            continue
+
+        # priorities of the regions the opponent can escape to
+        escapes = [region[s] for node in R if g.get_node_player(node) != alpha
+                   for s in g.get_successors(node) if region[s] > p]
+        if not escapes:
+            return R, alpha, {node: sigma[node] for node in R if g.get_node_player(node) == alpha}
+
+        p = min(escapes)
+        for node in g.get_nodes():
+            if region[node] < p:
+                region[node] = priority[node]
+        for node in R:
+            region[node] = p
+
+
+def strong_parity_solver_promotion(g):
+    """
+    Strong parity games solver based on priority promotion. A dominion is searched (see promotion_search), its
+    attractor for the player winning it is added to the winning region of this player and the search is repeated in the
+    rest of the game. The quasi-dominions are promoted instead of being solved recursively, which avoids the
+    exponential behaviour of the recursive algorithm on many games.
+    :param g: the game to solve.
+    :return: the solution in the following format : (W_0, sigma_0), (W_1, sigma_1).
+    """
+    W = ([], [])  # winning regions of player 0 and 1
+    strat = (defaultdict(lambda: -1), defaultdict(lambda: -1))  # winning strategies of player 0 and 1
+
+    while len(g.get_nodes()) != 0:
+        D, alpha, sigma = promotion_search(g)
+        # the opponent cannot leave the dominion, the strategy of alpha in it replaces the one of the attractor
+        (A, tau), (rest, discard) = reachability.reachability_solver(g, D, alpha)
+        tau.update(sigma)
+        W[alpha].extend(A)
+        strat[alpha].update(tau)
+        g = g.subgame(rest, A)
+
+    return (W[0], strat[0]), (W[1], strat[1])
 
 
+class TangleStore(object):
+    """
+    Tangles learned by the tangle learning solver. A tangle of player alpha is a set of nodes which is strongly
+    connected when alpha plays its strategy in it and in which every cycle is won by alpha : the opponent can only
+    leave it through its escapes. The tangles are stored in flat arrays (the nodes of tangle i are
+    nodes[offsets[i]:offsets[i + 1]] and moves holds the strategy of alpha for each of them, -1 for the nodes of the
+    opponent, the same goes for the escapes) and are indexed by their escapes, so an attractor can find the tangles
+    whose escapes are attracted.
+
+    The store follows the game the attractors are computed in, without scanning the tangles : the nodes removed from
+    the game for good are given to discard, which drops the tangles containing them from the lists of live tangles of
+    each player, and the nodes removed from it while the regions of a search are computed are given to exclude, which
+    marks the tangles containing them until reset is called. The number of removed escapes of every tangle is counted
+    along the way, so the live tangles of a player which are inside the game and their number of escapes in the game
+    are known in time proportional to the number of live tangles.
+    """
+
+    def __init__(self):
+        self.players = array('b')  # player of each tangle
+        self.alive = bytearray()  # 0 for the tangles containing nodes which were removed from the game
+        self.live = ([], [])  # tangles of each player which are alive
+        self.gone = array('i')  # number of escapes of each tangle which were removed from the game
+        self.epoch = 1  # the marks of the tangles excluded since the last reset are equal to the epoch
+        self.excluded = array('i')  # mark of the tangles containing excluded nodes
+        self.counted = array('i')  # mark of the tangles whose excluded escapes are counted in self.cut
+        self.cut = array('i')  # number of excluded escapes of each tangle
+        self.offsets = array('i', [0])
+        self.nodes = array('i')
+        self.moves = array('i')
+        self.escape_offsets = array('i', [0])
+        self.escapes = array('i')
+        self.by_node = defaultdict(list)  # tangles containing each node
+        self.by_escape = defaultdict(list)  # tangles escaping to each node
+
+    def __len__(self):
+        return len(self.players)
+
+    def add(self, player, nodes, strategy, escapes):
+        """
+        Adds a tangle to the store.
+        :param player: the player alpha of the tangle.
+        :param nodes: the nodes of the tangle.
+        :param strategy: the strategy of alpha in the tangle, a dictionary defined on the nodes of alpha.
+        :param escapes: the nodes outside of the tangle the opponent can move to.
+        :return: the index of the tangle.
+        """
+        t = len(self.players)
+        self.players.append(player)
+        self.alive.append(1)
+        self.live[player].append(t)
+        self.gone.append(0)
+        self.excluded.append(0)
+        self.counted.append(0)
+        self.cut.append(0)
+        for node in nodes:
+            self.nodes.append(node)
+            self.moves.append(strategy.get(node, -1))
+            self.by_node[node].append(t)
+        self.offsets.append(len(self.nodes))
+        for node in escapes:
+            self.escapes.append(node)
+            self.by_escape[node].append(t)
+        self.escape_offsets.append(len(self.escapes))
+        return t
+
+    def tangle_nodes(self, t):
+        """
+        :param t: the index of a tangle.
+        :return: the nodes of the tangle.
+        """
+        return self.nodes[self.offsets[t]:self.offsets[t + 1]]
+
+    def tangle_strategy(self, t):
+        """
+        :param t: the index of a tangle.
+        :return: the pairs (node, move) of the strategy of the player of the tangle.
+        """
+        return [(self.nodes[i], self.moves[i]) for i in xrange(self.offsets[t], self.offsets[t + 1])
+                if self.moves[i] != -1]
+
+    def tangle_escapes(self, t):
+        """
+        :param t: the index of a tangle.
+        :return: the escapes of the tangle.
+        """
+        return self.escapes[self.escape_offsets[t]:self.escape_offsets[t + 1]]
+
+    def tangles(self, player):
+        """
+        :param player: a player.
+        :return: the indexes of the tangles of the player which were not discarded, nor excluded since the last reset.
+        """
+        excluded, epoch = self.excluded, self.epoch
+        return [t for t in self.live[player] if excluded[t] != epoch]
+
+    def escapes_inside(self, t):
+        """
+        :param t: the index of a tangle.
+        :return: the number of escapes of the tangle which were not discarded, nor excluded since the last reset.
+        """
+        count = self.escape_offsets[t + 1] - self.escape_offsets[t] - self.gone[t]
+        if self.counted[t] == self.epoch:
+            count -= self.cut[t]
+        return count
+
+    def escaping_to(self, node):
+        """
+        :param node: a node.
+        :return: the indexes of the tangles which have this node as an escape (discarded tangles included).
+        """
+        return self.by_escape.get(node, ())
+
+    def discard(self, nodes):
+        """
+        Discards the tangles containing some nodes, which are removed from the game.
+        :param nodes: the removed nodes.
+        """
+        discarded = False
+        for node in nodes:
+            for t in self.by_node.get(node, ()):
+                if self.alive[t]:
+                    self.alive[t] = 0
+                    discarded = True
+            for t in self.by_escape.get(node, ()):
+                self.gone[t] += 1
+        if discarded:
+            for player in (0, 1):
+                self.live[player][:] = [t for t in self.live[player] if self.alive[t]]
+
+    def exclude(self, nodes):
+        """
+        Excludes nodes from the game until the next reset : the tangles containing them are not given by tangles and
+        they are not counted as escapes in the game.
+        :param nodes: the excluded nodes.
+        """
+        epoch = self.epoch
+        for node in nodes:
+            for t in self.by_node.get(node, ()):
+                self.excluded[t] = epoch
+            for t in self.by_escape.get(node, ()):
+                if self.counted[t] != epoch:
+                    self.counted[t] = epoch
+                    self.cut[t] = 0
+                self.cut[t] += 1
+
+    def reset(self):
+        """
+        Puts back every node excluded since the last reset.
+        """
+        self.epoch += 1
+
+
+def tangle_attractor(g, U, j, store, strategy=None):
+    """
+    Computes the tangle attractor for player j of the set U in g : the attractor in which a tangle of player j
+    contained in g is also attracted (with the strategy of j in it) when all its escapes which are in g are attracted.
+    :param g: the game graph.
+    :param U: the target set.
+    :param j: the player for which we compute the attractor.
+    :param store: the learned tangles (see TangleStore), following g : the tangles it gives are contained in g.
+    :param strategy: the strategy of j on the target set, if any (else a successor in the attractor is chosen).
+    :return: the attractor (in the order in which the nodes are attracted) and the strategy of j in it.
+    """
+    out = reachability.init_out(g)
+    queue = deque()
+    Z = []
+    in_Z = set()
+    rho = {}
+
+    # number of escapes in g which are not attracted for every tangle of j contained in g
+    pending = {}
+    ready = []
+    for t in store.tangles(j):
+        pending[t] = store.escapes_inside(t)
+        if pending[t] == 0:
+            ready.append(t)
+
+    def attract(node):
+        queue.append(node)
+        in_Z.add(node)
+        Z.append(node)
+
+    for node in U:
+        attract(node)
+
+    while queue or ready:
+        # a tangle is attracted with the strategy of j in it, the nodes of j already attracted keep their strategy
+        while ready:
+            t = ready.pop()
+            for node, move in store.tangle_strategy(t):
+                if node not in in_Z:
+                    rho[node] = move
+            for node in store.tangle_nodes(t):
+                if node not in in_Z:
+                    attract(node)
+        if not queue:
+            break
+        s = queue.popleft()
+        for t in store.escaping_to(s):
+            if t in pending:
+                pending[t] -= 1
+                if pending[t] == 0:
+                    ready.append(t)
+        for sbis in g.get_predecessors(s):
+            if sbis not in in_Z:
+                if g.get_node_player(sbis) == j:
+                    rho[sbis] = s
+                    attract(sbis)
+                else:
+                    out[sbis] -= 1
+                    if out[sbis] == 0:
+                        attract(sbis)
+
+    # the nodes of j in the target set move to the attractor, when they can
+    if strategy is not None:
+        rho.update(strategy)
+    for node in U:
+        if g.get_node_player(node) == j and node not in rho:
+            for succ in g.get_successors(node):
+                if succ in in_Z:
+                    rho[node] = succ
+                    break
+    return Z, rho
+
+
+def extract_tangles(g, Z, rho, j):
+    """
+    Extracts the new tangles of a region : the bottom strongly connected components (with at least one edge) of the
+    region restricted to the strategy of player j, the opponent keeping all its edges in g.
+    :param g: the game graph.
+    :param Z: the region, a tangle attractor for player j of the nodes of the highest priority of g.
+    :param rho: the strategy of j in the region.
+    :param j: the player of the region.
+    :return: the list of the tangles, as pairs (nodes, strategy of j).
+    """
+    in_Z = set(Z)
+    restricted = Graph()
+    leaks = set()  # nodes of the opponent which can leave the region in g
+    for node in Z:
+        restricted.add_node(node, (g.get_node_player(node), 0))
+    for node in Z:
+        if g.get_node_player(node) == j:
+            successors = [rho[node]] if node in rho else []
+        else:
+            successors = g.get_successors(node)
+        for succ in successors:
+            if succ in in_Z:
+                restricted.add_successor(node, succ)
+            else:
+                leaks.add(node)
+
+    tangles = []
+    component_of = {}
+    for i, component in enumerate(ops.strongly_connected_components(restricted)):
+        for node in component:
+            component_of[node] = i
+        bottom = all(node not in leaks and all(component_of.get(succ) == i for succ in restricted.get_successors(node))
+                     for node in component)
+        if bottom and (len(component) > 1 or component[0] in restricted.get_successors(component[0])):
+            tangles.append((component, {node: rho[node] for node in component if g.get_node_player(node) == j}))
+    return tangles
+
+
+def tangle_search(g, store):
+    """
+    Searches a dominion with tangle learning. The game is decomposed into regions : the tangle attractor of the nodes
+    of the highest priority, then the one of the highest priority of the rest of the game, and so on. The tangles of
+    the regions are learned and the decomposition is repeated until a tangle without escape, a dominion, is found.
+    :param g: the game in which the dominion is searched (it must not be empty).
+    :param store: the learned tangles (see TangleStore) following g, the new tangles are added to it.
+    :return: the dominion, the player alpha winning it and the strategy of alpha in it.
+    """
+    while True:
+        learned = []
+        h = g
+        store.reset()  # the regions are removed from h, the store follows it
+        while len(h.get_nodes()) != 0:
+            p = max(h.get_node_priority(node) for node in h.get_nodes())
+            alpha = p % 2
+            U = [node for node in h.get_nodes() if h.get_node_priority(node) == p]
+            Z, rho = tangle_attractor(h, U, alpha, store)
+            for nodes, sigma in extract_tangles(h, Z, rho, alpha):
+                members = set(nodes)
+                escapes = set(succ for node in nodes if g.get_node_player(node) != alpha
+                              for succ in g.get_successors(node) if succ not in members)
+                if not escapes:
+                    store.reset()
+                    for tangle in learned:
+                        store.add(*tangle)
+                    return nodes, alpha, sigma
+                learned.append((alpha, nodes, sigma, escapes))
+            in_Z = set(Z)
+            h = h.subgame([node for node in h.get_nodes() if node not in in_Z], Z)
+            store.exclude(Z)
+        for tangle in learned:
+            store.add(*tangle)
+
+
+def strong_parity_solver_tangle_learning(g):
+    """
+    Strong parity games solver based on tangle learning. A dominion is searched (see tangle_search), its tangle
+    attractor for the player winning it is added to the winning region of this player and the search is repeated in
+    the rest of the game. The learned tangles are kept between the searches (those losing nodes are discarded) so the
+    work done to find them is not repeated.
+    :param g: the game to solve.
+    :return: the solution in the following format : (W_0, sigma_0), (W_1, sigma_1).
+    """
+    W = ([], [])  # winning regions of player 0 and 1
+    strat = (defaultdict(lambda: -1), defaultdict(lambda: -1))  # winning strategies of player 0 and 1
+    store = TangleStore()
+
+    while len(g.get_nodes()) != 0:
+        D, alpha, sigma = tangle_search(g, store)
+        A, rho = tangle_attractor(g, D, alpha, store, sigma)
+        W[alpha].extend(A)
+        strat[alpha].update(rho)
+        store.discard(A)
+        in_A = set(A)
+        g = g.subgame([node for node in g.get_nodes() if node not in in_A], A)
+
+    return (W[0], strat[0]), (W[1], strat[1])
+
 def strong_parity_antichain_based(graph, start_index):
     """
     Implementation of the antichain-based algorithm for parity games.
@@ -332,6 +1263,23 @@ def strong_parity_antichain_based(graph, start_index):
         return symbolic_strong_parity_solver(g, nbr_nodes,0)
 
 
+def strong_parity_solver_native(graph, start_index):
+    """
+    Implementation of the recursive algorithm for parity games in the C library.
+    Performs a check on the numbering used in the game graph before transforming it into a C graph, then the game is
+    solved by a single call to the C library which returns the winning regions and strategies.
+    :param graph: the python game arena of the parity game we want to solve.
+    :param start_index: the start index for the numbering of nodes in the game, the nodes must be numbered from
+    start_index to start_index + n - 1 (see tools.operations.create_c_graph).
+    :return: the solution in the following format : (W_0, sigma_0), (W_1, sigma_1).
+    """
+    g, nbr_nodes = ops.create_c_graph(graph, start_index)
+
+    solution = ops.read_solution_from_c(zielonka_c(g), nbr_nodes, start_index)
+    destroyGraph_c(g)
+    return solution
+
+
 def symbolic_strong_parity_solver(graph, nbr_nodes,increment):
     """
     Solves the parity game with game arena graph. Requires the number of nodes in the game and an increment.
@@ -356,74 +1304,97 @@ def symbolic_strong_parity_solver(graph, nbr_nodes,increment):
     return W0, W1
 
 
-def up(node, priority, max_counter):
+def counter_weights(max_counter):
+    """
+    Weights of the counters in the mixed-radix encoding of the states of the reduction from parity to safety games.
+    The counters [counter_1, ..., counter_k] are encoded as the integer sum of counter_i * weight_i, where counter_i
+    ranges from 0 to max_counter[i] and weight_i is the product of (max_counter[l] + 1) for l < i, so every vector of
+    counters has a distinct encoding and the encoding of [0, ..., 0] is 0.
+    :param max_counter: the maximum value for each counter
+    :return: the list of the weights of the counters, followed by the number of distinct encodings
+    """
+    weights = [1]
+    for maximum in max_counter:
+        weights.append(weights[-1] * (maximum + 1))
+    return weights
+
+
+def up(counters, priority, max_counter, weights):
     """
-    Up function as defined in the reduction from parity to safety games.
-    :param node: the counters of a node (a list [counter_1, ..., counter_k])
+    Up function as defined in the reduction from parity to safety games, on encoded counters.
+    :param counters: the encoding of the counters of a node (see counter_weights)
     :param priority: the priority we consider
     :param max_counter: the maximum value for each counter
-    :return: the result of up(node, priority)
+    :param weights: the weights of the counters (see counter_weights)
+    :return: the encoding of up(node, priority), -1 if a counter is in overflow
     """
     # Getting the concerned counter
     concerned_counter = priority // 2
 
-    if (priority % 2 == 0):
-        # even priority resets the first few counters to 0
-        succ = (concerned_counter)*[0]+node[concerned_counter:]
-    else:
-        if (node[concerned_counter] == max_counter[concerned_counter]):
-            # Counter is in overflow, the result is the overflow special value
-            return "-"
-        else:
-            succ = node[:concerned_counter] + [int(node[concerned_counter])+1] + node[concerned_counter+1:]
-
-    return succ
+    if priority % 2 == 0:
+        # even priority resets the first few counters to 0, they are the lowest digits of the encoding
+        return counters - counters % weights[concerned_counter]
+    if counters // weights[concerned_counter] % (max_counter[concerned_counter] + 1) == max_counter[concerned_counter]:
+        # Counter is in overflow, the result is the overflow special value
+        return -1
+    return counters + weights[concerned_counter]
 
 
-def createSafetyGame(previous_graph,start_nodes, max_counter):
+def createSafetyGame(previous_graph, start_nodes, max_counter):
     """
-    Creates the safety game obtained by the reduction from parity to safety games.
+    Creates the safety game obtained by the reduction from parity to safety games. A state [node_id, counter_1, ...,
+    counter_k] is encoded as the integer node_id * r + c where c is the encoding of its counters (see counter_weights)
+    and r the number of encodings of the counters, so node_id, c = divmod(state, r). The states are numbered in the
+    order in which they are created, state 0 being the special state used for overflows, and the arena of the safety
+    game is a CompactGraph whose successors are appended to arrays while the states are explored.
     :param previous_graph: the game arena of the parity game
     :type previous_graph: Graph
-    :param start_nodes: the starting set of nodes for the construction
+    :param start_nodes: the nodes of the parity game whose states [node_id, 0, ..., 0] start the construction
     :param max_counter: the maximum value for each counters in the safety game obtained by the reduction
-    :return: the arena of the safety game obtained by the reduction
-    """
-    # node ids in the safety game is the str representation of their list [node_id, counter_1, ..., counter_k]
-    queue = deque() # used to track newly added nodes
-    size = len(max_counter)
-    fill = defaultdict(lambda: -1)  # used to track nodes which are already created
-    g = Graph() # the graph of the safety game
-    g.add_node("-",(0,0)) # the graph contains the special value used for overflows
-    for node_safety in start_nodes:
-        queue.append(node_safety) # Adds the node from the starting set to the queue
-        node_safety_st = str(node_safety) # String representation of the node ([node_id, counter_1, ..., counter_k])
-        fill[node_safety_st] = 1 # the nodes have already been considered
-    while queue:
-        node_safety = queue.popleft() # remove a node from the queue
-        node_parity = int(node_safety[0]) # get the node id in the parity game
-        node_safety_st = str(node_safety) # get the string representation of the node in the safety game
-        g.add_node(node_safety_st,previous_graph.get_nodes_descriptors()[node_parity]) # Adds the node to the safety game
-
-        # consider every successor of the node using the up function and its successors in the parity game
+    :return: the arena of the safety game obtained by the reduction and the list of the encoded state of each of its
+    nodes (-1 for the overflow state)
+    """
+    weights = counter_weights(max_counter)
+    radix = weights[-1]
+    states = [-1]  # encoded state of each node of the safety game, node 0 is the overflow state
+    visited = {}  # node of each encoded state which is already created
+    players = array('b', [0])  # the overflow state has no successor, it belongs to player 0 with priority 0
+    priorities = array('i', [0])
+    succ_offsets = array('i', [0, 0])
+    succ_targets = array('i')
+
+    for node_parity in start_nodes:
+        state = node_parity * radix
+        if state not in visited:
+            visited[state] = len(states)
+            states.append(state)
+
+    # the states are explored in the order of their numbers, so their successors are stored in CSR order
+    current = 1
+    while current < len(states):
+        node_parity, counters = divmod(states[current], radix)
+        priority = previous_graph.get_node_priority(node_parity)
+        players.append(previous_graph.get_node_player(node_parity))
+        priorities.append(priority)
+
+        # the up function only depends on the state, its successors differ by their node in the parity game
+        successor_counters = up(counters, priority, max_counter, weights)
         for succ in previous_graph.get_successors(node_parity):
-            successor_safety_counter = up(node_safety[1:],previous_graph.get_node_priority(node_parity), max_counter)
-            # performs the up function on the counters (position 0 is the node id) and correct priority in the safety game
-            if (successor_safety_counter == "-"):
-                successor_safety = successor_safety_counter
+            if successor_counters == -1:
+                target = 0
             else:
-                # If not the infinity sink and not already considered in the queue
-                successor_safety = str([succ] + successor_safety_counter)
-
-                if (fill[successor_safety] != 1):
-                    fill[successor_safety] = 1 # if it was not already created, it is now and it is added to the queue
-                    queue.append([succ]+successor_safety_counter)
-
-            # adds the newly created successor
-            g.add_successor(node_safety_st, successor_safety)
-            g.add_predecessor(successor_safety, node_safety_st)
-    return g
+                state = succ * radix + successor_counters
+                target = visited.get(state)
+                if target is None:
+                    # if it was not already created, it is now and it will be explored
+                    target = len(states)
+                    visited[state] = target
+                    states.append(state)
+            succ_targets.append(target)
+        succ_offsets.append(len(succ_targets))
+        current += 1
 
+    return CompactGraph(players, [priorities], succ_offsets, succ_targets), states
 
 
 def reduction_to_safety_parity_solver(graph):
@@ -451,31 +1422,25 @@ def reduction_to_safety_parity_solver(graph):
             position = graph.get_node_priority(node) // 2
             max_counter[position] = max_counter[position]+1
 
-    # Then we build the start counter for each node, we only build the part reachable from (v, 0, ..., 0) for all v
-    # For convenience, we label the nodes using the str representation of their list  : [v, c_1, c_2, ..., c_k]
-    # This is a unique identifier for each node.
-    # The overflow is simply written "-"
-
-    # Start nodes for construction : (v, 0, ..., 0)
-    start_nodes = []
-    for node in graph.get_nodes():
-        start_nodes.append([node]+[0]*nbr_counters)
-    transformed_graph = createSafetyGame(graph, start_nodes, max_counter) # creates the safety game from the start nodes
+    # Then we build the safety game, we only build the part reachable from (v, 0, ..., 0) for all v
+    # The states (v, c_1, c_2, ..., c_k) are encoded as integers (see createSafetyGame), the overflow is state 0
+    transformed_graph, states = createSafetyGame(graph, graph.get_nodes(), max_counter)
+    radix = counter_weights(max_counter)[-1]
 
-    W1bis, W2bis = reachability.attractor(transformed_graph,["-"],1) # attractor for player 2 of the nodes in overflow
+    # attractor for player 2 of the nodes in overflow
+    W1bis, W2bis = reachability.attractor(transformed_graph, [0], 1)
     W1 = []
     W2 = []
 
-    empty_counters = [0]*nbr_counters # [0, ..., 0]
-    # checks if the nodes [v, 0, ..., 0] belongs to the attractor or not and creates the winning regions
+    # checks if the nodes [v, 0, ..., 0] belongs to the attractor or not and creates the winning regions, their counters
+    # are encoded as 0 (there is no counter when every priority is even, which compressed priorities make common)
     for node in W1bis:
-        if node != "-":
-            node_list = ast.literal_eval(node)
-            if node_list[-nbr_counters:] == empty_counters:
-                W2.append(node_list[0])
+        if node != 0:
+            node_parity, counters = divmod(states[node], radix)
+            if counters == 0:
+                W2.append(node_parity)
     for node in W2bis:
-        if node != "-":
-            node_list = ast.literal_eval(node)
-            if node_list[-nbr_counters:] == empty_counters:
-                W1.append(node_list[0])
+        node_parity, counters = divmod(states[node], radix)
+        if counters == 0:
+            W1.append(node_parity)
     return W1, W2
\ No newline at end of file
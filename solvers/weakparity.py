@@ -1,7 +1,9 @@
-from collections import defaultdict
+from collections import defaultdict, deque
 
+from bitarray import bitarray
+
+from graph import PriorityIndex
 from solvers import reachability as rs
-from tools import operations as ops
 
 
 def weak_parity_solver(g):
@@ -12,7 +14,8 @@ def weak_parity_solver(g):
     """
 
     h = g  # the game we work on
-    i = ops.max_priority(h)  # Maximum priority occurring in g
+    index = PriorityIndex(g)  # nodes of each priority, the nodes of Ak are removed from it along with the sub-games
+    i = index.max_priority()  # Maximum priority occurring in g
 
     W0 = []  # winning region for player 0
     W1 = []  # winning region for player 1
@@ -24,7 +27,7 @@ def weak_parity_solver(g):
         current_player = k % 2  # get current player
 
         # calling the reachability solver on the game h with target set "nodes of priority k" and for the current player
-        (Ak, eta), (Bk, nu) = rs.reachability_solver(h, ops.i_priority_node(h, k), current_player)
+        (Ak, eta), (Bk, nu) = rs.reachability_solver(h, index.nodes(k), current_player)
 
         # depending on the current player, we add the nodes of Ak in a winning region and update strategies
         if current_player == 0:
@@ -37,6 +40,59 @@ def weak_parity_solver(g):
             sigma1.update(eta)
             sigma0.update(nu)
 
-        h = h.subgame(Bk)  # updates the current game (only keeping nodes in Bk)
+        h = h.subgame(Bk, Ak)  # updates the current game (only keeping nodes in Bk)
+        index.remove(Ak)
 
     return (W0, sigma0), (W1, sigma1)
+
+
+def weak_parity_solver_no_strategies(g):
+    """
+    Weak parity games solver which only computes the winning regions. The algorithm is the same as the one of
+    weak_parity_solver but the sub-games are never built : the nodes removed from the game are marked in a bitarray and
+    the number of successors of each node which are not removed is kept up to date, each edge being visited once when
+    its target is removed. Only the priorities occurring in g are considered. The solver runs in O(|V| + |E|) (plus the
+    sort of the priorities).
+    :param g: the game to solve.
+    :return: the winning regions W_0 and W_1 (the same sets as weak_parity_solver, possibly in another order).
+    """
+    nodes = g.get_nodes()
+    W = ([], [])  # winning regions of player 0 and 1
+    if not nodes:
+        return W
+
+    # nodes of each priority
+    priorities = defaultdict(list)
+    for node in nodes:
+        priorities[g.get_node_priority(node)].append(node)
+
+    removed = bitarray(max(nodes) + 1)
+    removed.setall(False)
+    out = rs.init_out(g)  # number of successors which are not removed, only decremented values are stored
+    queue = deque()
+
+    # considering the priorities occurring in g in decreasing order
+    for k in sorted(priorities, reverse=True):
+        j = k % 2  # current player
+        region = W[j]
+
+        # the attractor for player j of the nodes of priority k which are not removed yet
+        for node in priorities[k]:
+            if not removed[node]:
+                removed[node] = True
+                region.append(node)
+                queue.append(node)
+
+        while queue:
+            s = queue.popleft()
+            for sbis in g.get_predecessors(s):
+                if not removed[sbis]:
+                    # every predecessor of a removed node loses a successor, the counter of a node of player j is
+                    # only used once it belongs to the opponent of the current player
+                    out[sbis] -= 1
+                    if g.get_node_player(sbis) == j or out[sbis] == 0:
+                        removed[sbis] = True
+                        region.append(sbis)
+                        queue.append(sbis)
+
+    return W
@@ -1,6 +1,7 @@
 from tools import file_handler as io
 from tools import operations as op
 from tools import generators as gen
+from tools import optimizations
 from solvers import generalizedparity as gp
 """
 Test module for generalized parity games.
@@ -93,6 +94,23 @@ def double_priority():
     (a,c) = gp.generalized_parity_solver(g)
     return op.are_lists_equal(a , []) and op.are_lists_equal(c , [4, 5, 6, 7, 3, 1, 2])
 
+def double_priority_compressed():
+    """
+    Solves a graph in which the priorities are twice the same, after the compression of both priority functions.
+    """
+    g = optimizations.compress_priorities(io.load_generalized_from_file("assets/generalized parity/double_priority.txt"))
+    (a,c) = gp.generalized_parity_solver(g)
+    return g.nodes[2] == (0, 2, 1) and g.nodes[5] == (0, 2, 1) and g.nodes[1] == (0, 1, 0) and \
+           op.are_lists_equal(a , []) and op.are_lists_equal(c , [4, 5, 6, 7, 3, 1, 2])
+
+def counter_example_scc():
+    """
+    Solves the counter example component by component.
+    """
+    g = io.load_generalized_compact_from_file("assets/generalized parity/counter_example.txt")
+    (a,c) = gp.generalized_parity_solver_scc(g)
+    return op.are_lists_equal(a , []) and op.are_lists_equal(c , [1, 2, 3])
+
 def counter_example():
     """
     Solves a graph which is one of the counter examples for the naive algorithms.
@@ -103,6 +121,22 @@ def counter_example():
     (a,c) = gp.generalized_parity_solver(g)
     return op.are_lists_equal(a , []) and op.are_lists_equal(c , [1, 2, 3])
 
+def outer_targets():
+    """
+    Solves a random game in which the attractors of sub-games are computed towards nodes of the outer game, on both
+    graph representations and component by component : the sub-games of the array-backed graph are views which must
+    behave like the copies of the sub-games of the graph.
+    """
+    path = "assets/generalized parity/outer_targets.txt"
+    W_0 = [5, 6, 9, 10, 14, 16, 17, 18, 19, 20]
+    W_1 = [0, 1, 2, 3, 4, 7, 8, 11, 12, 13, 15, 21]
+    for a, c in [gp.generalized_parity_solver(io.load_generalized_from_file(path)),
+                 gp.generalized_parity_solver(io.load_generalized_compact_from_file(path)),
+                 gp.generalized_parity_solver_scc(io.load_generalized_compact_from_file(path))]:
+        if not (op.are_lists_equal(a, W_0) and op.are_lists_equal(c, W_1)):
+            return False
+    return True
+
 def simple_example():
     """
     Solves a graph which is a simple example for the algorithm.
@@ -292,7 +326,8 @@ def launch_tests():
     :return: true if all tests succeeded.
     """
     return figure56() and example_1() and example_2() and example_3() and example_4() and example_5() and worstcase1() \
-           and worstcase2() and complementary_priorities() and double_priority() and counter_example() \
+           and worstcase2() and complementary_priorities() and double_priority() and double_priority_compressed() \
+           and counter_example() and counter_example_scc() and outer_targets() \
            and simple_example() and simple_example2() and simple_example3() and figure56_doubled() and example_1_doubled() \
             and example_2_doubled() and example_3_doubled() and example_4_doubled() and example_5_doubled() \
             and worstcase1_doubled() and worstcase2_doubled() and figure56_opposite() and example_1_opposite() \
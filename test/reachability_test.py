@@ -1,5 +1,6 @@
 from tools import file_handler as io
 from solvers import reachability as rs
+from solvers import reachability_numpy as rn
 
 """
 Test module for reachability games.
@@ -25,9 +26,64 @@ def example_1():
     return W1 == [8, 7, 4] and sig1 == {8: 3, 7: 8} and W0 == [1, 2, 3, 5, 6] and sig0 == {1: 5, 3: 3, 6: 5}
 
 
+def figure32_compact():
+    """
+    Solves the reachability game from figure 3.2 using the array-backed graph.
+    """
+    fig32_graph = io.load_compact_from_file("assets/reachability/figure32.txt")
+    (W0, sig0), (W1, sig1) = rs.reachability_solver(fig32_graph, [1], 0)
+    return W0 == [1, 2, 3, 5] and sig0 == {1: 1, 2: 1, 5: 2} and W1 == [4, 6] and sig1 == {4: 6, 6: 4}
+
+
+def figure32_numpy():
+    """
+    Solves the reachability game from figure 3.2 using the vectorized attractor engine.
+    """
+    fig32_graph = io.load_compact_from_file("assets/reachability/figure32.txt")
+    (W0, sig0), (W1, sig1) = rn.reachability_solver(fig32_graph, [1], 0)
+    return W0 == [1, 2, 3, 5] and sig0 == {1: 1, 2: 1, 5: 2} and W1 == [4, 6] and sig1 == {4: 6, 6: 4}
+
+
+def example_1_numpy():
+    """
+    Solves a simple example using the vectorized attractor engine, on both graph representations.
+    """
+    for fig51_graph in [io.load_from_file("assets/reachability/fig51.txt"),
+                        io.load_compact_from_file("assets/reachability/fig51.txt")]:
+        (W1, sig1), (W0, sig0) = rn.reachability_solver(fig51_graph, [8], 1)
+        if not (W1 == [8, 7, 4] and sig1 == {8: 3, 7: 8} and W0 == [1, 2, 3, 5, 6] and sig0 == {1: 5, 3: 3, 6: 5}):
+            return False
+    W, Wbis = rn.attractor(io.load_compact_from_file("assets/reachability/fig51.txt"), [8], 1)
+    return W == [8, 7, 4] and Wbis == [1, 2, 3, 5, 6]
+
+
+def figure32_native():
+    """
+    Solves the reachability game from figure 3.2 using the C library.
+    """
+    fig32_graph = io.load_from_file("assets/reachability/figure32.txt")
+    (W0, sig0), (W1, sig1) = rs.reachability_solver_native(fig32_graph, [1], 0, 1)
+    return W0 == [1, 2, 3, 5] and sig0 == {1: 1, 2: 1, 5: 2} and W1 == [4, 6] and sig1 == {4: 6, 6: 4}
+
+
+def subgame_view_outer_targets():
+    """
+    Computes attractors in a sub-game of a simple example, whose target sets also contain nodes which are not in the
+    sub-game : the view of the array-backed graph gives the same results as the copy of the sub-game.
+    """
+    copy = io.load_from_file("assets/reachability/fig51.txt").subgame([1, 2, 3, 4, 5, 6])
+    view = io.load_compact_from_file("assets/reachability/fig51.txt").subgame([1, 2, 3, 4, 5, 6])
+    for U, j in [([8], 1), ([7, 8], 1), ([2, 7], 0), ([5, 8], 0), ([5], 1)]:
+        if rs.attractor(view, U, j) != rs.attractor(copy, U, j):
+            return False
+    return view.get_predecessors(8) == copy.get_predecessors(8) == [] and \
+           view.get_successors(7) == copy.get_successors(7) == []
+
+
 def launch_tests():
     """
     Launches all tests.
     :return: true if all tests succeeded.
     """
-    return figure32() and example_1()
+    return figure32() and example_1() and figure32_compact() and figure32_numpy() and example_1_numpy() and \
+           figure32_native() and subgame_view_outer_targets()
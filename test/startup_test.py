@@ -0,0 +1,55 @@
+import json
+import subprocess
+import sys
+
+"""
+Test module for the startup time of the command line interface.
+The modules used by the solve mode are imported in a new interpreter, which must not import numpy, the benchmarks
+(and matplotlib) or the tests, nor load the C library.
+"""
+
+SOLVE_MODULES = ["solver", "tools.batch", "tools.file_handler", "tools.operations", "solvers.reachability",
+                 "solvers.weakparity", "solvers.strongparity", "solvers.generalizedparity"]
+
+HEAVY_MODULES = ["matplotlib", "numpy", "benchmarks", "test"]
+
+_PROBE = """
+import json, sys
+for module in %r:
+    __import__(module)
+import antichains.library_linker as linker
+print(json.dumps({"library_loaded": linker.lib.handle is not None,
+                  "modules": sorted(name for name in sys.modules if sys.modules[name] is not None)}))
+"""
+
+
+def _import_solve_modules():
+    """
+    Imports the modules of the solve mode in a new interpreter.
+    :return: a dictionary containing whether the C library was loaded and the imported modules.
+    """
+    output = subprocess.check_output([sys.executable, "-c", _PROBE % SOLVE_MODULES])
+    return json.loads(output.splitlines()[-1])
+
+
+def solve_imports_are_light():
+    """
+    Checks that the solve mode does not import the benchmarks, the tests, matplotlib or numpy.
+    """
+    probe = _import_solve_modules()
+    return [name for name in probe["modules"] if name.split(".")[0] in HEAVY_MODULES] == []
+
+
+def solve_imports_do_not_load_library():
+    """
+    Checks that the C library is still not loaded after the modules of the solve mode are imported.
+    """
+    return not _import_solve_modules()["library_loaded"]
+
+
+def launch_tests():
+    """
+    Launches all tests.
+    :return: true if all tests succeeded.
+    """
+    return solve_imports_are_light() and solve_imports_do_not_load_library()
@@ -1,9 +1,22 @@
+import json
+import os
+import shutil
+import tempfile
+from StringIO import StringIO
+
 from bitarray import bitarray
 
+from graph import Graph, CompactGraph, PriorityIndex, RemovalMask
 from tools import file_handler as io
 from solvers import strongparity as sp
+from solvers import reachability
+from solvers import decomposition
 from solvers import generalizedparity as gp
 from tools import operations as ops
+from tools import optimizations
+from tools import generators
+from tools import batch
+from tools import server
 """
 Test module for strong parity games.
 Some examples are solved by our algorithm and we verify the solution. 
@@ -84,6 +97,450 @@ def worstcase2():
     return a == [] and b == {} and c == [6, 8, 9, 7, 5, 4, 0, 2, 1, 3] and d == {0: 4, 2: 4, 4: 5, 6: 7, 8: 6}
 
 
+"""
+Recursive algorithm on the array-backed graph
+"""
+
+def figure56_compact():
+    """
+    Solves the strong parity game from figure 5.6.
+    """
+    fig56_graph = io.load_compact_from_file("assets/strong parity/figure56.txt")
+    (a, b), (c, d) = sp.strong_parity_solver(fig56_graph)
+    return (a == [2, 4, 1, 6]) and b == {2: 2, 4: 1} and c == [5, 3] and d == {5: 5}
+
+
+def example_3_compact():
+    """
+    Solves a simple example.
+    """
+    g = io.load_compact_from_file("assets/strong parity/example_3.txt")
+    (a, b), (c, d) = sp.strong_parity_solver(g)
+    return (a == [2, 1, 3, 4]) and b == {4: 4, 2: 4, 1: 2} and c == [6, 7, 5] and d == {7: 6, 6: 6, 5: 6}
+
+
+def example_3_pgsolver_format():
+    """
+    Solves the same example written with a header on two lines, a start statement, optional names (one of them
+    containing ';'), several statements on one line and no final ';'. It is read in chunks of a few characters.
+    """
+    g = io.load_compact_from_file("assets/strong parity/example_3_pgsolver.txt", chunk_size=8)
+    (a, b), (c, d) = sp.strong_parity_solver(g)
+    h = io.load_from_file("assets/strong parity/example_3_pgsolver.txt", chunk_size=8)
+    (e, f), (i, j) = sp.strong_parity_solver(h)
+    return (a == [2, 1, 3, 4]) and b == {4: 4, 2: 4, 1: 2} and c == [6, 7, 5] and d == {7: 6, 6: 6, 5: 6} and \
+           e == a and f == b and i == c and j == d
+
+
+def example_3_newlines():
+    """
+    Solves the same example written without any ';' : statements end with a newline, except one whose successor list
+    continues on the next line. It is read in chunks of a few characters and at once.
+    """
+    path = "assets/strong parity/example_3_newlines.txt"
+    results = [sp.strong_parity_solver(io.load_compact_from_file(path, chunk_size=8)),
+               sp.strong_parity_solver(io.load_compact_from_file(path)),
+               sp.strong_parity_solver(io.load_from_file(path, chunk_size=8)),
+               sp.strong_parity_solver(io.load_compact_from_string(open(path).read()))]
+    return all(result == (([2, 1, 3, 4], {4: 4, 2: 4, 1: 2}), ([6, 7, 5], {7: 6, 6: 6, 5: 6})) for result in results)
+
+
+def example_3_binary():
+    """
+    Solves the same example after writing it in the binary arena format and loading it, with its arrays read from the
+    file and with its arrays over the memory-mapped file.
+    """
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "example_3.bin")
+    try:
+        io.convert_to_binary_arena("assets/strong parity/example_3.txt", path)
+        binary = io.is_binary_arena(path)
+        g = io.load_binary_arena(path)
+        h = io.load_binary_arena(path, mapped=True)
+    finally:
+        shutil.rmtree(directory)
+    (a, b), (c, d) = sp.strong_parity_solver(g)
+    (e, f), (i, j) = sp.strong_parity_solver(h)
+    return binary and (a == [2, 1, 3, 4]) and b == {4: 4, 2: 4, 1: 2} and c == [6, 7, 5] and \
+           d == {7: 6, 6: 6, 5: 6} and e == a and f == b and i == c and j == d
+
+
+def batch_recursive():
+    """
+    Solves every example on a pool of two processes and compares the records with the solutions computed in the
+    current process.
+    """
+    paths = batch.list_games("assets/strong parity")
+    options = {'target': None, 'safe': None, 'wp': False, 'parity_algorithm': 'recursive', 'gp': False}
+    output = StringIO()
+    errors = batch.solve_batch(paths, options, output, 2)
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    if errors != 0 or sorted(record["file"] for record in records) != paths:
+        return False
+    for record in records:
+        (a, b), (c, d) = sp.strong_parity_solver(io.load_compact_from_file(record["file"]))
+        if record["W_0"] != sorted(a) or record["W_1"] != sorted(c) or record["algorithm"] != "recursive" or \
+                record["sigma_0"] != dict((str(k), v) for k, v in b.iteritems()) or \
+                record["sigma_1"] != dict((str(k), v) for k, v in d.iteritems()):
+            return False
+    return True
+
+
+def server_requests():
+    """
+    Sends requests to the server mode through a pipe : the example given as a file and as a string, solved by two
+    algorithms, and an invalid request.
+    """
+    with open("assets/strong parity/example_3.txt") as f:
+        game = f.read()
+    requests = [{"id": 1, "file": "assets/strong parity/example_3.txt", "objective": "parity"},
+                {"id": 2, "game": game, "objective": "parity", "algorithm": "safety"},
+                {"id": 3, "game": game, "objective": "unknown"}]
+    read, write = os.pipe()
+    os.write(write, "".join(json.dumps(request) + "\n" for request in requests))
+    os.close(write)
+    output = StringIO()
+    with os.fdopen(read) as input:
+        server.serve(input, output, workers=2)
+    responses = dict((response["id"], response) for response in map(json.loads, output.getvalue().splitlines()))
+    return len(responses) == 3 and responses[1]["W_0"] == [1, 2, 3, 4] and responses[1]["W_1"] == [5, 6, 7] and \
+           responses[1]["sigma_1"] == {"5": 6, "6": 6, "7": 6} and responses[2]["W_0"] == [1, 2, 3, 4] and \
+           "sigma_0" not in responses[2] and "error" in responses[3]
+
+
+def worstcase2_compact():
+    """
+    Solves a worst case graph G_n for n = 2.
+    """
+    g = io.load_compact_from_file("assets/strong parity/worstcase_2.txt")
+    (a, b), (c, d) = sp.strong_parity_solver(g)
+    return a == [] and b == {} and c == [6, 8, 9, 7, 5, 4, 0, 2, 1, 3] and d == {0: 4, 2: 4, 4: 5, 6: 7, 8: 6}
+
+def example_3_compressed():
+    """
+    Solves a simple example after compressing its priorities in place.
+    """
+    g = io.load_compact_from_file("assets/strong parity/example_3.txt")
+    optimizations.compress_priorities(g, in_place=True)
+    (a, b), (c, d) = sp.strong_parity_solver(g)
+    return list(g.priorities[0][1:]) == [1, 2, 2, 2, 2, 1, 2] and sorted(a) == [1, 2, 3, 4] and \
+           sorted(c) == [5, 6, 7] and b == {4: 4, 2: 4, 1: 2} and d == {7: 6, 6: 6, 5: 6}
+
+
+def worstcase2_priority_index():
+    """
+    Removes and restores nodes of a worst case graph G_n for n = 2 in its priority index.
+    """
+    g = io.load_compact_from_file("assets/strong parity/worstcase_2.txt")
+    index = PriorityIndex(g)
+    full = index.max_priority() == 8 and index.nodes(1) == [8, 9] and index.nodes(0) == [3, 4] and len(index) == 10
+    index.remove([5, 8])
+    index.remove([6, 9, 7])
+    removed = index.max_priority() == 5 and index.nodes(1) == [] and index.nodes(8) == [] and len(index) == 5
+    index.restore([6, 9, 7])
+    partial = index.max_priority() == 7 and index.nodes(1) == [9]
+    index.restore([5, 8])
+    restored = index.max_priority() == 8 and index.nodes(1) == [8, 9] and index.nodes(6) == [7] and len(index) == 10
+    return full and removed and partial and restored
+
+
+def worstcase2_nested_subgames():
+    """
+    Creates nested sub-games of a worst case graph G_n for n = 2, including two sub-games of the same game which are
+    used after each other was created and a sub-game of a sub-game which was replaced by its sibling.
+    """
+    g = io.load_compact_from_file("assets/strong parity/worstcase_2.txt")
+    first = g.subgame([1, 2, 3, 4, 5, 6])
+    inner = first.subgame([1, 2, 3])
+    second = g.subgame([3, 4, 5, 6, 7, 8])
+    deeper = inner.subgame([2, 3])
+    nodes = sorted(first.get_nodes()) == [1, 2, 3, 4, 5, 6] and sorted(second.get_nodes()) == [3, 4, 5, 6, 7, 8]
+    membership = [node for node in xrange(11) if first.has_node(node)] == [1, 2, 3, 4, 5, 6] and \
+                 [node for node in xrange(11) if inner.has_node(node)] == [1, 2, 3] and \
+                 [node for node in xrange(11) if second.has_node(node)] == [3, 4, 5, 6, 7, 8] and \
+                 [node for node in xrange(11) if deeper.has_node(node)] == [2, 3]
+    edges = all(first.get_successors(node) == [succ for succ in g.get_successors(node) if 1 <= succ <= 6] and
+                second.get_predecessors(node) == [pred for pred in g.get_predecessors(node) if 3 <= pred <= 8]
+                for node in xrange(3, 7))
+    return nodes and membership and edges
+
+
+def worstcase2_subgame_degrees():
+    """
+    Requests the out-degrees of nested sub-games of a worst case graph G_n for n = 2, which share the out-degrees of
+    the arena, in an order going up and down the nesting, and checks the arena gets its own out-degrees back.
+    """
+    g = io.load_compact_from_file("assets/strong parity/worstcase_2.txt")
+    arena = list(g.out_degrees())
+    removed = [0, 9]
+    first = g.subgame([1, 2, 3, 4, 5, 6, 7, 8], removed)
+    removed.append(8)  # the sub-game keeps its own list of removed nodes
+    inner = first.subgame([1, 2, 3, 4])
+    deeper = inner.subgame([1, 2], [3, 4])
+
+    def degrees(sub, nodes):
+        return [sub.out_degrees()[node] for node in nodes]
+
+    nested = degrees(deeper, [1, 2]) == [1, 1] and degrees(first, [1, 5, 8]) == [2, 1, 1] and \
+             degrees(inner, [1, 3, 4]) == [1, 2, 1] and degrees(deeper, [1, 2]) == [1, 1]
+    second = g.subgame([5, 6, 7, 8, 9])
+    siblings = degrees(second, [5, 6, 8]) == [2, 1, 2] and degrees(inner, [2, 3, 4]) == [2, 2, 1]
+    return nested and siblings and list(g.out_degrees()) == arena
+
+
+def many_priorities():
+    """
+    Solves a path of 1100 nodes of distinct priorities ending with a loop, the priorities decreasing towards the loop.
+    The recursive algorithm removes one node per level, so the recursion is deeper than the recursion limit.
+    """
+    n = 1100
+    g = CompactGraph.from_node_list(range(n), [i % 2 for i in range(n)], [[i + 1 for i in range(n)]], [1] * n,
+                                    [0] + range(n - 1))
+    (a, b), (c, d) = sp.strong_parity_solver(g)
+    strategies = a == [] and b == {} and sorted(c) == range(n) and d == dict((i, i - 1) for i in range(1, n, 2))
+    W_0, W_1 = sp.strong_parity_solver_no_strategies(g)
+    regions = W_0 == [] and sorted(W_1) == range(n)
+    removed = bitarray(n)
+    removed.setall(False)
+    (a, b), (c, d) = sp.strong_parity_solver_non_removed(g, removed)
+    non_removed = a == [] and sorted(c) == range(n) and d == dict((i, i - 1) for i in range(1, n, 2))
+    return strategies and regions and non_removed
+
+"""
+Recursive algorithm applied to the strongly connected components
+"""
+
+def figure56_scc():
+    """
+    Solves the strong parity game from figure 5.6 component by component.
+    """
+    g = io.load_from_file("assets/strong parity/figure56.txt")
+    (a, b), (c, d) = sp.strong_parity_solver_scc(g)
+    return sorted(a) == [1, 2, 4, 6] and b == {2: 2, 4: 1} and sorted(c) == [3, 5] and d == {5: 5}
+
+
+def worstcase2_scc():
+    """
+    Solves a worst case graph G_n for n = 2 component by component.
+    """
+    g = io.load_compact_from_file("assets/strong parity/worstcase_2.txt")
+    (a, b), (c, d) = sp.strong_parity_solver_scc(g)
+    return a == [] and b == {} and sorted(c) == range(10) and d == {0: 4, 2: 4, 4: 5, 6: 7, 8: 6}
+
+
+def long_path_scc():
+    """
+    Solves a path of 5000 nodes ending with a loop, which has 5000 components and is deeper than the recursion limit.
+    """
+    n = 5000
+    g = CompactGraph.from_node_list(range(n), [i % 2 for i in range(n)], [[1] * (n - 1) + [2]], [1] * n,
+                                    range(1, n) + [n - 1])
+    (a, b), (c, d) = sp.strong_parity_solver_scc(g)
+    return sorted(a) == range(n) and c == [] and b[0] == 1 and b[n - 2] == n - 1 and len(b) == n / 2
+
+
+def independent_components_parallel():
+    """
+    Solves a game made of two independent cycles, large enough to be solved by worker processes, and of a node with
+    an edge to each cycle. The maximal priority of the first cycle is even and the one of the second cycle is odd.
+    """
+    m = decomposition.PARALLEL_SIZE
+    n = 2 * m + 1
+    targets = [(i + 1) % m for i in range(m)] + [m + (i + 1) % m for i in range(m)] + [0, m]
+    priorities = [i % 4 * 2 for i in range(m)] + [i % 3 * 2 + 1 for i in range(m)] + [0]
+    g = CompactGraph.from_node_list(range(n), [i % 2 for i in range(n)], [priorities], [1] * (2 * m) + [2], targets)
+    (a, b), (c, d) = sp.strong_parity_solver_scc(g, 2)
+    return sorted(a) == range(m) + [2 * m] and sorted(c) == range(m, 2 * m) and b[2 * m] == 0 and b[0] == 1 and \
+           d[m + 1] == m + 2
+
+"""
+Priority promotion algorithm
+"""
+
+def figure56_promotion():
+    """
+    Solves the strong parity game from figure 5.6 with priority promotions.
+    """
+    g = io.load_from_file("assets/strong parity/figure56.txt")
+    (a, b), (c, d) = sp.strong_parity_solver_promotion(g)
+    return sorted(a) == [1, 2, 4, 6] and b == {2: 2, 4: 1} and sorted(c) == [3, 5] and d == {5: 5}
+
+
+def example_3_promotion():
+    """
+    Solves the strong parity game from example 3 with priority promotions.
+    """
+    g = io.load_from_file("assets/strong parity/example_3.txt")
+    (a, b), (c, d) = sp.strong_parity_solver_promotion(g)
+    return sorted(a) == [1, 2, 3, 4] and b == {1: 2, 2: 4, 4: 4} and sorted(c) == [5, 6, 7] and \
+           d == {5: 6, 6: 6, 7: 6}
+
+
+def worstcase2_promotion():
+    """
+    Solves a worst case graph G_n for n = 2 with priority promotions.
+    """
+    g = io.load_compact_from_file("assets/strong parity/worstcase_2.txt")
+    (a, b), (c, d) = sp.strong_parity_solver_promotion(g)
+    return a == [] and b == {} and sorted(c) == range(10) and d == {0: 4, 2: 4, 4: 5, 6: 7, 8: 6}
+
+"""
+Tangle learning algorithm
+"""
+
+def figure56_tangle_learning():
+    """
+    Solves the strong parity game from figure 5.6 with tangle learning.
+    """
+    g = io.load_from_file("assets/strong parity/figure56.txt")
+    (a, b), (c, d) = sp.strong_parity_solver_tangle_learning(g)
+    return sorted(a) == [1, 2, 4, 6] and b == {2: 2, 4: 1} and sorted(c) == [3, 5] and d == {5: 5}
+
+
+def example_3_tangle_learning():
+    """
+    Solves the strong parity game from example 3 with tangle learning.
+    """
+    g = io.load_from_file("assets/strong parity/example_3.txt")
+    (a, b), (c, d) = sp.strong_parity_solver_tangle_learning(g)
+    return sorted(a) == [1, 2, 3, 4] and b == {1: 2, 2: 4, 4: 4} and sorted(c) == [5, 6, 7] and \
+           d == {5: 6, 6: 6, 7: 6}
+
+
+def worstcase2_tangle_learning():
+    """
+    Solves a worst case graph G_n for n = 2 with tangle learning.
+    """
+    g = io.load_compact_from_file("assets/strong parity/worstcase_2.txt")
+    (a, b), (c, d) = sp.strong_parity_solver_tangle_learning(g)
+    return a == [] and b == {} and sorted(c) == range(10) and d == {0: 4, 2: 4, 4: 5, 6: 7, 8: 6}
+
+
+def tangle_attracted_through_escapes():
+    """
+    Learns a tangle of player 0 (a cycle 1 <-> 2 in which player 1 can escape to 3) and checks that the tangle
+    attractor of 3 attracts it with its strategy, that excluding nodes hides it until the store is reset, and that it is
+    kept once its escape 3 is removed and discarded once 2 is removed.
+    """
+    g = Graph()
+    g.add_node(1, (0, 2))
+    g.add_node(2, (1, 0))
+    g.add_node(3, (0, 1))
+    for node, succ in [(1, 2), (2, 1), (2, 3), (3, 3)]:
+        g.add_successor(node, succ)
+        g.add_predecessor(succ, node)
+    store = sp.TangleStore()
+    t = store.add(0, [1, 2], {1: 2}, [3])
+    Z, rho = sp.tangle_attractor(g, [3], 0, store)
+    attracted = sorted(Z) == [1, 2, 3] and rho == {1: 2, 3: 3} and store.tangle_strategy(t) == [(1, 2)]
+    store.exclude([3])
+    excluded = store.tangles(0) == [t] and store.escapes_inside(t) == 0
+    store.exclude([1])
+    excluded = excluded and store.tangles(0) == []
+    store.reset()
+    excluded = excluded and store.tangles(0) == [t] and store.escapes_inside(t) == 1
+    store.discard([3])
+    kept = store.tangles(0) == [t]
+    store.discard([2])
+    return attracted and excluded and kept and store.tangles(0) == []
+
+"""
+Quasi-polynomial recursive algorithm
+"""
+
+def figure56_quasi_polynomial():
+    """
+    Solves the strong parity game from figure 5.6 with the quasi-polynomial algorithm.
+    """
+    g = io.load_from_file("assets/strong parity/figure56.txt")
+    a, c = sp.strong_parity_solver_quasi_polynomial(g)
+    return sorted(a) == [1, 2, 4, 6] and sorted(c) == [3, 5]
+
+
+def example_3_quasi_polynomial():
+    """
+    Solves the strong parity game from example 3 with the quasi-polynomial algorithm.
+    """
+    g = io.load_from_file("assets/strong parity/example_3.txt")
+    a, c = sp.strong_parity_solver_quasi_polynomial(g)
+    return sorted(a) == [1, 2, 3, 4] and sorted(c) == [5, 6, 7]
+
+
+def worstcase_quasi_polynomial():
+    """
+    Solves worst case graphs G_n of the recursive algorithm with the quasi-polynomial algorithm and compares the
+    winning regions with the ones of the recursive algorithm.
+    """
+    for n in range(2, 6):
+        g = generators.strong_parity_worst_case(n)
+        a, c = sp.strong_parity_solver_quasi_polynomial(g)
+        b, d = sp.strong_parity_solver_no_strategies(g)
+        if sorted(a) != sorted(b) or sorted(c) != sorted(d):
+            return False
+    return True
+
+"""
+Small progress measures algorithm
+"""
+
+def figure56_progress_measures():
+    """
+    Solves the strong parity game from figure 5.6 with small progress measures.
+    """
+    g = io.load_from_file("assets/strong parity/figure56.txt")
+    (a, b), (c, d) = sp.strong_parity_solver_progress_measures(g)
+    return sorted(a) == [1, 2, 4, 6] and b == {2: 2, 4: 1} and sorted(c) == [3, 5] and d == {5: 5}
+
+
+def example_3_progress_measures():
+    """
+    Solves the strong parity game from example 3 with small progress measures.
+    """
+    g = io.load_from_file("assets/strong parity/example_3.txt")
+    (a, b), (c, d) = sp.strong_parity_solver_progress_measures(g)
+    return sorted(a) == [1, 2, 3, 4] and b == {1: 2, 2: 4, 4: 4} and sorted(c) == [5, 6, 7] and \
+           d == {5: 6, 6: 6, 7: 6}
+
+
+def worstcase2_progress_measures():
+    """
+    Solves a worst case graph G_n for n = 2 with small progress measures.
+    """
+    g = io.load_compact_from_file("assets/strong parity/worstcase_2.txt")
+    (a, b), (c, d) = sp.strong_parity_solver_progress_measures(g)
+    return a == [] and b == {} and sorted(c) == range(10) and d == {0: 1, 2: 4, 4: 5, 6: 7, 8: 6}
+
+"""
+Strategy improvement algorithm
+"""
+
+def figure56_strategy_improvement():
+    """
+    Solves the strong parity game from figure 5.6 with strategy improvement.
+    """
+    g = io.load_from_file("assets/strong parity/figure56.txt")
+    (a, b), (c, d) = sp.strong_parity_solver_strategy_improvement(g)
+    return sorted(a) == [1, 2, 4, 6] and b == {2: 2, 4: 1} and sorted(c) == [3, 5] and d == {5: 5}
+
+
+def example_3_strategy_improvement():
+    """
+    Solves the strong parity game from example 3 with strategy improvement.
+    """
+    g = io.load_from_file("assets/strong parity/example_3.txt")
+    (a, b), (c, d) = sp.strong_parity_solver_strategy_improvement(g)
+    return sorted(a) == [1, 2, 3, 4] and b == {1: 2, 2: 4, 4: 4} and sorted(c) == [5, 6, 7] and \
+           d == {5: 6, 6: 6, 7: 6}
+
+
+def worstcase2_strategy_improvement():
+    """
+    Solves a worst case graph G_n for n = 2 with strategy improvement.
+    """
+    g = io.load_compact_from_file("assets/strong parity/worstcase_2.txt")
+    (a, b), (c, d) = sp.strong_parity_solver_strategy_improvement(g)
+    return a == [] and b == {} and sorted(c) == range(10) and d == {0: 4, 2: 4, 4: 5, 6: 7, 8: 6}
+
 """
 Recursive algorithm with the removed list optimization
 """
@@ -166,6 +623,30 @@ def worstcase2_removed_optimization():
     (a, b), (c, d) = sp.strong_parity_solver_non_removed(g, removed)
     return a == [] and b == {} and c == [6, 8, 9, 7, 5, 4, 0, 2, 1, 3] and d == {0: 4, 2: 4, 4: 5, 6: 7, 8: 6}
 
+
+def worstcase2_removal_mask():
+    """
+    Removes and puts back nodes of a worst case graph G_n for n = 2 in a removal mask, then checks that the solver
+    leaves the removed nodes and the out-degrees it is given as they were.
+    """
+    g = io.load_from_file("assets/strong parity/worstcase_2.txt")
+    removed = bitarray([False] * len(g.nodes))
+    removed[9] = True
+    mask = RemovalMask(removed, len(g.nodes))
+    mask.remove([5, 8])
+    mask.remove([6, 7])
+    journal = len(mask) == 5 and removed.count(True) == 5
+    undone = mask.undo() == [6, 7] and len(mask) == 7 and not removed[6] and removed[8]
+    mask.undo()
+    restored = len(mask) == 9 and removed.tolist() == [False] * 9 + [True]
+
+    degrees = reachability.init_out_non_removed(g, removed)
+    initial = dict(degrees)
+    (a, b), (c, d) = sp.strong_parity_solver_non_removed(g, removed, degrees)
+    solved = a == [] and sorted(c) == range(9) and removed.tolist() == [False] * 9 + [True] and \
+             all(degrees[node] == initial[node] for node in initial)
+    return journal and undone and restored and solved
+
 "Antichain-based algorithm"
 
 def figure56_antichain_algorithm():
@@ -238,6 +719,61 @@ def worstcase2_antichain_algorithm():
     (a, c) = sp.strong_parity_antichain_based(g,0)
     return ops.are_lists_equal(a , [] ) and ops.are_lists_equal(c, [6, 8, 9, 7, 5, 4, 0, 2, 1, 3])
 
+"""
+Recursive algorithm in the C library
+"""
+
+def figure56_native():
+    """
+    Solves the strong parity game from figure 5.6.
+    """
+    fig56_graph = io.load_from_file("assets/strong parity/figure56.txt")
+    (a, b), (c, d) = sp.strong_parity_solver_native(fig56_graph, 1)
+    return ops.are_lists_equal(a, [2, 4, 1, 6]) and b == {2: 2, 4: 1} and ops.are_lists_equal(c, [5, 3]) and \
+           d == {5: 5}
+
+
+def example_3_native():
+    """
+    Solves a simple example.
+    """
+    g = io.load_compact_from_file("assets/strong parity/example_3.txt")
+    (a, b), (c, d) = sp.strong_parity_solver_native(g, 1)
+    return ops.are_lists_equal(a, [2, 1, 3, 4]) and b == {1: 2, 2: 4, 4: 4} and ops.are_lists_equal(c, [6, 7, 5]) \
+           and d == {5: 6, 6: 6, 7: 6}
+
+
+def worstcase2_native():
+    """
+    Solves a worst case graph G_n for n = 2.
+    """
+    g = io.load_from_file("assets/strong parity/worstcase_2.txt")
+    (a, b), (c, d) = sp.strong_parity_solver_native(g, 0)
+    return ops.are_lists_equal(a, []) and b == {} and ops.are_lists_equal(c, [6, 8, 9, 7, 5, 4, 0, 2, 1, 3]) and \
+           d == {0: 4, 2: 4, 4: 5, 6: 7, 8: 6}
+
+def shifted_ids_native():
+    """
+    Solves games whose node ids start at 2 with the C library, on both graph representations, and checks a game whose
+    ids are not contiguous is rejected instead of being solved with nodes which do not exist.
+    """
+    g = Graph()
+    for node, player, priority, successors in [(2, 0, 1, [3]), (3, 1, 2, [4, 2]), (4, 0, 3, [2])]:
+        g.add_node(node, (player, priority))
+        for succ in successors:
+            g.add_successor(node, succ)
+            g.add_predecessor(succ, node)
+    for g in [g, CompactGraph.from_graph(g)]:
+        (a, b), (c, d) = sp.strong_parity_solver_native(g, min(g.get_nodes()))
+        (e, f), (i, j) = sp.strong_parity_solver(g)
+        if not (ops.are_lists_equal(a, e) and b == f and ops.are_lists_equal(c, i) and d == j):
+            return False
+    try:
+        sp.strong_parity_solver_native(io.load_compact_from_string("parity 4;\n2 1 0 4;\n4 2 1 2;\n"), 2)
+    except ValueError:
+        return True
+    return False
+
 """
 Reduction to safety algorithm
 """
@@ -312,6 +848,22 @@ def worstcase2_reduction_to_safety():
     (a, c) = sp.reduction_to_safety_parity_solver(g)
     return ops.are_lists_equal(a , [] ) and ops.are_lists_equal(c, [6, 8, 9, 7, 5, 4, 0, 2, 1, 3])
 
+
+def safety_game_encoding():
+    """
+    Checks the mixed-radix encoding of the counters of the reduction to safety on two counters ranging from 0 to 2
+    and from 0 to 1, and the states of the safety game of a simple example.
+    """
+    weights = sp.counter_weights([2, 1])
+    # [2, 1] is reset to [0, 1] by priority 2, [1, 0] becomes [1, 1] with priority 3 and overflows with priority 1
+    up = sp.up(5, 2, [2, 1], weights) == 3 and sp.up(1, 3, [2, 1], weights) == 4 and sp.up(2, 1, [2, 1], weights) == -1 \
+         and sp.up(4, 3, [2, 1], weights) == -1 and sp.up(5, 4, [2, 1], weights) == 0
+    g = io.load_from_file("assets/strong parity/example_1.txt")
+    safety_game, states = sp.createSafetyGame(g, g.get_nodes(), [1])
+    decoded = sorted(divmod(state, 2) for state in states[1:])
+    return weights == [1, 3, 6] and up and states[0] == -1 and len(safety_game.get_nodes()) == len(states) and \
+           decoded == sorted(set(decoded)) and all((node, 0) in decoded for node in g.get_nodes())
+
 def launch_tests():
     """
     Launches all tests.
@@ -319,17 +871,36 @@ def launch_tests():
     """
     recursive =  figure56() and example_1() and example_2() and example_3() and example_4() and example_5() and \
                  worstcase1() and worstcase2()
+    compact = figure56_compact() and example_3_compact() and example_3_pgsolver_format() and example_3_newlines() and \
+              example_3_binary() and worstcase2_compact() and example_3_compressed() and \
+              worstcase2_priority_index() and worstcase2_nested_subgames() and \
+              worstcase2_subgame_degrees() and many_priorities()
     removed_optimization = figure56_removed_optimization() and example_1_removed_optimization() and \
                       example_2_removed_optimization() and example_3_removed_optimization() and \
                       example_4_removed_optimization() and example_5_removed_optimization() and \
-                      worstcase1_removed_optimization() and worstcase2_removed_optimization()
+                      worstcase1_removed_optimization() and worstcase2_removed_optimization() and \
+                      worstcase2_removal_mask()
     reduction_to_safety = figure56_reduction_to_safety() and example_1_reduction_to_safety() and \
                       example_2_reduction_to_safety() and example_3_reduction_to_safety() and \
                       example_4_reduction_to_safety() and example_5_reduction_to_safety() and \
-                      worstcase1_reduction_to_safety() and worstcase2_reduction_to_safety()
+                      worstcase1_reduction_to_safety() and worstcase2_reduction_to_safety() and \
+                      safety_game_encoding()
     antichain_based = figure56_antichain_algorithm() and example_1_antichain_algorithm() and \
                       example_2_antichain_algorithm() and example_3_antichain_algorithm() and \
                       example_4_antichain_algorithm() and example_5_antichain_algorithm() and \
                       worstcase1_antichain_algorithm() and worstcase2_antichain_algorithm()
-
-    return recursive and removed_optimization and reduction_to_safety and antichain_based
\ No newline at end of file
+    native = figure56_native() and example_3_native() and worstcase2_native() and shifted_ids_native()
+    scc = figure56_scc() and worstcase2_scc() and long_path_scc() and independent_components_parallel()
+    promotion = figure56_promotion() and example_3_promotion() and worstcase2_promotion()
+    tangle_learning = figure56_tangle_learning() and example_3_tangle_learning() and worstcase2_tangle_learning() and \
+                      tangle_attracted_through_escapes()
+    quasi_polynomial = figure56_quasi_polynomial() and example_3_quasi_polynomial() and worstcase_quasi_polynomial()
+    progress_measures = figure56_progress_measures() and example_3_progress_measures() and \
+                        worstcase2_progress_measures()
+    strategy_improvement = figure56_strategy_improvement() and example_3_strategy_improvement() and \
+                           worstcase2_strategy_improvement()
+    parallel = batch_recursive() and server_requests()
+
+    return recursive and compact and removed_optimization and reduction_to_safety and antichain_based and native and \
+           scc and promotion and tangle_learning and quasi_polynomial and progress_measures and \
+           strategy_improvement and parallel
\ No newline at end of file
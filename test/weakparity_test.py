@@ -22,9 +22,43 @@ def example_1():
     return a == [3, 6, 2] and b == {1: 5, 3: 3, 6: 1} and c == [8, 7, 4, 5, 1] and d == {8: 3, 5: 1, 7: 8}
 
 
+def figure41_compact():
+    """
+    Solves the weak parity game from figure 4.1 using the array-backed graph.
+    """
+    g = io.load_compact_from_file("assets/weak parity/figure41.txt")
+    (a, b), (c, d) = wp.weak_parity_solver(g)
+    return a == [3] and b == {1: 2, 5: 5} and c == [4, 5, 1, 2] and d == {4: 4, 2: 1, 3: 3}
+
+
+def figure41_no_strategies():
+    """
+    Solves the weak parity game from figure 4.1 without computing the strategies.
+    """
+    g = io.load_from_file("assets/weak parity/figure41.txt")
+    a, b = wp.weak_parity_solver_no_strategies(g)
+    return sorted(a) == [3] and sorted(b) == [1, 2, 4, 5]
+
+
+def example_1_no_strategies():
+    g = io.load_from_file("assets/weak parity/example_1.txt")
+    a, b = wp.weak_parity_solver_no_strategies(g)
+    return sorted(a) == [2, 3, 6] and sorted(b) == [1, 4, 5, 7, 8]
+
+
+def example_1_compact_no_strategies():
+    """
+    Solves the weak parity game from example 1 without computing the strategies using the array-backed graph.
+    """
+    g = io.load_compact_from_file("assets/weak parity/example_1.txt")
+    a, b = wp.weak_parity_solver_no_strategies(g)
+    return sorted(a) == [2, 3, 6] and sorted(b) == [1, 4, 5, 7, 8]
+
+
 def launch_tests():
     """
     Launches all tests.
     :return: true if all tests succeeded.
     """
-    return figure41() and example_1()
+    return (figure41() and example_1() and figure41_compact() and figure41_no_strategies() and
+            example_1_no_strategies() and example_1_compact_no_strategies())
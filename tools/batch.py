@@ -0,0 +1,213 @@
+"""
+This module solves many games at once : the games listed in a directory or a manifest are solved on a pool of worker
+processes and a result record is written for each of them, as a line of JSON, as soon as it is solved. The interpreter,
+the C library and the solvers are only loaded once per worker.
+"""
+import json
+import multiprocessing
+import os
+import traceback
+
+from tools import file_handler
+from tools.timer import Timer
+
+
+def solve_game(g, options):
+    """
+    Solves a game for the objective selected by the options of the solve mode of solver.py.
+    :param g: the game graph.
+    :param options: a dictionary with the keys target (PLAYER and TARGET_SET of a reachability game), safe (SAFE_SET of
+    a safety game), wp (strategies or regions), parity_algorithm and gp, only one of them selects an objective (the
+    others are None or False), and optionally compress (the priorities are compressed before solving a parity game) and
+    component_workers (the number of processes solving independent components with the scc algorithms).
+    :return: a tuple (solution, player, strategies) where strategies is True if solution is of the form
+    (W_player, sigma_player), (W_opponent, sigma_opponent) and False if it is of the form (W_0, W_1).
+    """
+    # only the solver of the objective is imported
+
+    # the priorities are compressed in a copy of the priorities, g keeps the original ones
+    if options.get('compress') and options['target'] is None and options['safe'] is None:
+        from tools import optimizations
+        g = optimizations.compress_priorities(g)
+
+    # Reachability (target and player is set)
+    if options['target'] is not None:
+        from solvers import reachability
+        player = int(options['target'][0])  # getting player (as int)
+        target = map(int, options['target'][1].split(","))  # getting node ids in target (transforming them into int)
+        return reachability.reachability_solver(g, target, player), player, True
+
+    # Safety (safe set provided), player 1 has the reachability objective
+    if options['safe'] is not None:
+        from solvers import reachability
+        safe_set = set(map(int, options['safe'][0].split(",")))  # getting node ids in safe set
+        # the target set contains every node not in the safe set
+        target_set = [node for node in g.get_nodes() if node not in safe_set]
+        return reachability.reachability_solver(g, target_set, 1), 1, True
+
+    # Weak parity
+    if options['wp']:
+        from solvers import weakparity
+        if options['wp'] == 'regions':
+            return weakparity.weak_parity_solver_no_strategies(g), 0, False
+        return weakparity.weak_parity_solver(g), 0, True
+
+    # Strong parity (an algorithm is chosen)
+    if options['parity_algorithm'] is not None:
+        from solvers import strongparity
+        if options['parity_algorithm'] == 'recursive':
+            return strongparity.strong_parity_solver(g), 0, True
+        if options['parity_algorithm'] == 'safety':
+            return strongparity.reduction_to_safety_parity_solver(g), 0, False
+        if options['parity_algorithm'] == 'antichain':
+            # assumes indexes start with 1
+            return strongparity.strong_parity_antichain_based(g, 1), 0, False
+        if options['parity_algorithm'] == 'scc':
+            # recursive algorithm applied to the strongly connected components, bottom-up
+            return strongparity.strong_parity_solver_scc(g, options.get('component_workers')), 0, True
+        if options['parity_algorithm'] == 'promotion':
+            return strongparity.strong_parity_solver_promotion(g), 0, True
+        if options['parity_algorithm'] == 'tangle':
+            return strongparity.strong_parity_solver_tangle_learning(g), 0, True
+        if options['parity_algorithm'] == 'quasi-polynomial':
+            return strongparity.strong_parity_solver_quasi_polynomial(g), 0, False
+        if options['parity_algorithm'] == 'progress-measures':
+            return strongparity.strong_parity_solver_progress_measures(g), 0, True
+        if options['parity_algorithm'] == 'strategy-improvement':
+            return strongparity.strong_parity_solver_strategy_improvement(g), 0, True
+        if options['parity_algorithm'] == 'native':
+            # recursive algorithm implemented in the C library, nodes are numbered from 0 or 1
+            return strongparity.strong_parity_solver_native(g, min(g.get_nodes())), 0, True
+        raise ValueError("Unknown parity algorithm : " + str(options['parity_algorithm']))
+
+    # Generalized parity
+    if options['gp']:
+        from solvers import generalizedparity
+        if options['gp'] == 'scc':
+            # classical algorithm applied to the strongly connected components, bottom-up
+            return generalizedparity.generalized_parity_solver_scc(g, options.get('component_workers')), 0, False
+        return generalizedparity.generalized_parity_solver(g), 0, False
+
+    raise ValueError("No objective selected")
+
+
+def objective_name(options):
+    """
+    :param options: the options selecting the objective (see solve_game).
+    :return: the name of the objective and of the algorithm used to solve it.
+    """
+    if options['target'] is not None:
+        return "reachability", "attractor"
+    if options['safe'] is not None:
+        return "safety", "attractor"
+    if options['wp']:
+        return "weak parity", "regions" if options['wp'] == 'regions' else "weak parity"
+    if options['parity_algorithm'] is not None:
+        return "parity", options['parity_algorithm']
+    return "generalized parity", "scc" if options['gp'] == 'scc' else "classical"
+
+
+def list_games(source):
+    """
+    Lists the games to solve.
+    :param source: a directory (every file it contains is a game) or a manifest, i.e. a text file containing the path
+    of one game per line (relative paths are relative to the directory of the manifest, empty lines and lines
+    starting with '#' are ignored).
+    :return: the list of paths of the games.
+    """
+    if os.path.isdir(source):
+        names = sorted(name for name in os.listdir(source) if not name.startswith("."))
+        return [os.path.join(source, name) for name in names if os.path.isfile(os.path.join(source, name))]
+
+    directory = os.path.dirname(source)
+    paths = []
+    with open(source, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                paths.append(os.path.join(directory, line))
+    return paths
+
+
+def solve_file(task):
+    """
+    Loads and solves a game.
+    :param task: a tuple (path, options) where options selects the objective (see solve_game).
+    :return: the result record of the game, a dictionary.
+    """
+    path, options = task
+    return solve_record({"file": path}, lambda: file_handler.load_arena(path, options['gp']), options)
+
+
+def solve_record(record, load, options):
+    """
+    Loads and solves a game and completes its result record. Errors are reported in the record instead of being raised
+    so one game cannot stop the others.
+    :param record: the record of the game, a dictionary.
+    :param load: a function without parameters returning the game graph.
+    :param options: the options selecting the objective (see solve_game).
+    :return: the record.
+    """
+    record["objective"], record["algorithm"] = objective_name(options)
+    try:
+        with Timer(verbose=False) as loading:
+            g = load()
+        with Timer(verbose=False) as solving:
+            solution, player, strategies = solve_game(g, options)
+    except Exception as e:
+        record["error"] = "".join(traceback.format_exception_only(type(e), e)).strip()
+        return record
+
+    if strategies:
+        (W_player, sigma_player), (W_opponent, sigma_opponent) = solution
+    else:
+        (W_player, W_opponent), sigma_player, sigma_opponent = solution, None, None
+    if player == 1:
+        W_player, W_opponent = W_opponent, W_player
+        sigma_player, sigma_opponent = sigma_opponent, sigma_player
+    record["nodes"] = len(g.get_nodes())
+    record["load_time"] = loading.interval
+    record["solve_time"] = solving.interval
+    record["W_0"] = sorted(int(node) for node in W_player)
+    record["W_1"] = sorted(int(node) for node in W_opponent)
+    if strategies:
+        # json objects only have string keys
+        record["sigma_0"] = dict((str(node), int(succ)) for node, succ in sigma_player.iteritems())
+        record["sigma_1"] = dict((str(node), int(succ)) for node, succ in sigma_opponent.iteritems())
+    return record
+
+
+def solve_batch(paths, options, output, workers=None):
+    """
+    Solves games on a pool of worker processes and writes their result records to output, one line of JSON per game,
+    in the order in which they are solved.
+    :param paths: the paths of the games.
+    :param options: the options selecting the objective (see solve_game).
+    :param output: a file-like object in which the records are written.
+    :param workers: the number of worker processes (the number of CPUs by default). With one worker the games are
+    solved in the current process.
+    :return: the number of games which could not be solved.
+    """
+    tasks = [(path, options) for path in paths]
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+
+    if workers == 1:
+        records = (solve_file(task) for task in tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers)
+        records = pool.imap_unordered(solve_file, tasks)
+
+    errors = 0
+    try:
+        for record in records:
+            if "error" in record:
+                errors += 1
+            output.write(json.dumps(record, sort_keys=True) + "\n")
+            output.flush()
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    return errors
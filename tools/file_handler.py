@@ -1,62 +1,377 @@
-from graph import Graph
+import ctypes
+import json
+import mmap
+import os
+import re
+import struct
+from StringIO import StringIO
+from array import array
+
+from graph import Graph, CompactGraph
 
 """
 This module handles file reading (to load graph) and writing (to write the solution).
 """
 
-def load_from_file(path):
+CHUNK_SIZE = 1 << 20  # number of characters read at once when parsing a file
+
+_NAME = re.compile(r'"[^"]*"')
+_HEADER = re.compile(r'\s*(?:parity|start)\b(\s+\d+[ \t]*;?)?')
+_SUCCESSORS = re.compile(r'\d+(?:\s*,\s*\d+)*$')
+
+
+def load_from_file(path, chunk_size=CHUNK_SIZE):
     """
     Loads a game graph from a file specified by the path.
     The file must be in PGSolver format.
     :param path: path to the file.
+    :param chunk_size: number of characters read at once.
     :return: a Graph g corresponding to the game graph in the file.
     """
-    with open(path, 'r') as f:
-        g = Graph()
-        next(f)
-        for line in f:
-            split_line = line.split(" ")
-            node = int(split_line[0])
-            priority = int(split_line[1])
+    return _load_graph(path, False, chunk_size)
 
-            if split_line[2] == "0":
-                g.add_node(node, (0, priority))
-            else:
-                g.add_node(node, (1, priority))
+def load_generalized_from_file(path, chunk_size=CHUNK_SIZE):
+    """
+    Loads a generalized parity game graph from a file specified by the path.
+    The file must be in PGSolver format for generalized parity.
+    :param path: path to the file.
+    :param chunk_size: number of characters read at once.
+    :return: a Graph g corresponding to the game graph in the file.
+    """
+    return _load_graph(path, True, chunk_size)
 
-            for succ in split_line[3].split(","):
-                g.add_successor(node, int(succ))
-                g.add_predecessor(int(succ), node)
+def load_compact_from_file(path, chunk_size=CHUNK_SIZE):
+    """
+    Loads a game graph from a file specified by the path into an array-backed CompactGraph.
+    The file must be in PGSolver format.
+    :param path: path to the file.
+    :param chunk_size: number of characters read at once.
+    :return: a CompactGraph g corresponding to the game graph in the file.
+    """
+    return _load_compact(path, False, chunk_size)
 
-    return g
 
-def load_generalized_from_file(path):
+def load_generalized_compact_from_file(path, chunk_size=CHUNK_SIZE):
     """
-    Loads a generalized parity game graph from a file specified by the path.
+    Loads a generalized parity game graph from a file specified by the path into an array-backed CompactGraph.
     The file must be in PGSolver format for generalized parity.
     :param path: path to the file.
-    :return: a Graph g corresponding to the game graph in the file.
+    :param chunk_size: number of characters read at once.
+    :return: a CompactGraph g corresponding to the game graph in the file.
     """
-    with open(path, 'r') as f:
-        g = Graph()
-        next(f)
-        for line in f:
-            split_line = line.split(" ")
-            node = int(split_line[0])
-            priorities = []
-            for prio in split_line[1].split(","):
-                priorities += [int(prio)]
-            if split_line[2] == "0":
-                g.add_node(node, tuple([0]+priorities))
-            else:
-                g.add_node(node, tuple([1]+priorities))
+    return _load_compact(path, True, chunk_size)
+
 
-            for succ in split_line[3].split(","):
-                g.add_successor(node, int(succ))
-                g.add_predecessor(int(succ), node)
+def load_arena(path, generalized=False):
+    """
+    Loads a game graph in the array-backed representation from a file in the binary arena format (whose arrays are read
+    without parsing) or in PGSolver format.
+    :param path: path to the file.
+    :param generalized: if True, a file in PGSolver format is in the format for generalized parity.
+    :return: a CompactGraph g corresponding to the game graph in the file.
+    """
+    if is_binary_arena(path):
+        return load_binary_arena(path)
+    return _load_compact(path, generalized, CHUNK_SIZE)
+
+
+def load_compact_from_string(text, generalized=False):
+    """
+    Loads a game graph given as a string in PGSolver format into an array-backed CompactGraph.
+    :param text: the content of a file in PGSolver format.
+    :param generalized: if True, the string is in PGSolver format for generalized parity.
+    :return: a CompactGraph g corresponding to the game graph in the string.
+    """
+    return _load_compact(StringIO(text), generalized, CHUNK_SIZE)
 
+
+def _load_graph(path, generalized, chunk_size):
+    """
+    Builds a Graph from the nodes of a PGSolver file.
+    :param path: path to the file.
+    :param generalized: if True, the priority field contains one priority per priority function.
+    :param chunk_size: number of characters read at once.
+    :return: a Graph g corresponding to the game graph in the file.
+    """
+    g = Graph()
+    for ids, players, priorities, degrees, targets in _read_nodes(path, generalized, chunk_size):
+        position = 0
+        for i in xrange(len(ids)):
+            node = ids[i]
+            g.add_node(node, tuple([players[i]] + [node_priorities[i] for node_priorities in priorities]))
+            for succ in targets[position:position + degrees[i]]:
+                g.add_successor(node, succ)
+                g.add_predecessor(succ, node)
+            position += degrees[i]
     return g
 
+
+def _load_compact(path, generalized, chunk_size):
+    """
+    Fills flat arrays (ids, players, priorities, out-degrees and successors) with the content of a PGSolver file and
+    builds a CompactGraph from them. Only these arrays and one chunk of the file are in memory at the same time.
+    :param path: path to the file, or a file object.
+    :param generalized: if True, the priority field contains one priority per priority function.
+    :param chunk_size: number of characters read at once.
+    :return: a CompactGraph g corresponding to the game graph in the file.
+    """
+    ids = array('i')
+    players = array('b')
+    priorities = None
+    degrees = array('i')
+    targets = array('i')
+    for block_ids, block_players, block_priorities, block_degrees, block_targets in \
+            _read_nodes(path, generalized, chunk_size):
+        ids.extend(block_ids)
+        players.extend(block_players)
+        if priorities is None:
+            priorities = [array('i') for _ in block_priorities]
+        for f in xrange(len(priorities)):
+            priorities[f].extend(block_priorities[f])
+        degrees.extend(block_degrees)
+        targets.extend(block_targets)
+
+    if priorities is None:
+        priorities = [array('i')]
+    return CompactGraph.from_node_list(ids, players, priorities, degrees, targets)
+
+
+def _read_nodes(path, generalized, chunk_size):
+    """
+    Parses a PGSolver file one block of statements at a time. The file is read by chunks of chunk_size characters,
+    each chunk is cut after its last ';' or newline and the rest is kept for the next chunk. Statements end with ';' or
+    with a newline and may span several lines, the headers ("parity n;" and "start n;") and node names are ignored.
+    :param path: path to the file, or a file object.
+    :param generalized: if True, the priority field contains one priority per priority function.
+    :param chunk_size: number of characters read at once.
+    :return: a generator of tuples (ids, players, priorities, degrees, targets) of arrays, one per block, where
+    priorities is a list of one array per priority function.
+    """
+    if isinstance(path, basestring):
+        with open(path, 'r') as f:
+            for block in _read_nodes(f, generalized, chunk_size):
+                yield block
+        return
+
+    f = path
+    nbr_functions = None if generalized else 1
+    header = True
+    rest = ""
+    while True:
+        chunk = f.read(chunk_size)
+        data = rest + chunk
+        if chunk:
+            # the block ends with the last ';' or newline which is not part of a name
+            cut = max(data.rfind(';'), data.rfind('\n')) + 1
+            while data.count('"', 0, cut) % 2 == 1:
+                quote = data.rfind('"', 0, cut)
+                cut = max(data.rfind(';', 0, quote), data.rfind('\n', 0, quote)) + 1
+            rest = data[cut:]
+            data = data[:cut]
+        if '"' in data:
+            data = _NAME.sub(' ', data)
+        if header:
+            match = _HEADER.match(data)
+            while match and match.group(1):
+                data = data[match.end():]
+                match = _HEADER.match(data)
+            if match and chunk:
+                # the number of the header is in the next chunk
+                rest = data + rest
+                continue
+            header = data.isspace() or not data
+        if data and not data.isspace():
+            tokens, tail = _split_statements(data, not chunk)
+            rest = tail + rest
+            if tokens:
+                block = _parse_nodes(tokens, nbr_functions)
+                nbr_functions = len(block[2])
+                yield block
+        if not chunk:
+            break
+
+
+def _split_statements(data, final):
+    """
+    Splits a block of node statements "id priority player successors" without names into their fields. A statement
+    ends with ';', or with a newline once it has its four fields and its successor list does not end with ','.
+    :param data: the block.
+    :param final: if True, the block is the end of the file and its last statement may not end with ';'.
+    :return: a tuple (tokens, tail) where tokens holds the four fields of each complete statement and tail is the
+    beginning of the last statement if it continues in the next block.
+    """
+    tokens = data.replace(';', ' ').split()
+    segments = data.replace(';', '\n').splitlines()
+    if len(tokens) == 4 * (len(segments) - segments.count('')):
+        # four fields per line or per ';' : the fields are already in order, unless a statement on several lines is
+        # balanced by a successor list with spaces, which leaves a ',' at the edge of a field
+        joined = " ".join(tokens) + " "
+        if ", " not in joined and " ," not in joined:
+            return tokens, ""
+
+    # statements on several lines or spaces in the successor lists : statements are split one by one
+    tokens = []
+    fields = []
+    statements = data.split(';')
+    for s, statement in enumerate(statements):
+        lines = statement.split('\n')
+        for l, line in enumerate(lines):
+            fields.extend(line.split())
+            ended = l == len(lines) - 1 and s < len(statements) - 1
+            if fields and (ended or len(fields) >= 4 and not fields[-1].endswith(',')):
+                tokens.extend(_statement_fields(fields))
+                fields = []
+    if fields and final:
+        tokens.extend(_statement_fields(fields))
+        fields = []
+    return tokens, " ".join(fields + [""])
+
+
+def _statement_fields(fields):
+    """
+    :param fields: the whitespace-separated fields of a statement.
+    :return: the four fields of the statement, the successors being joined in one field.
+    """
+    if len(fields) < 4 or not _SUCCESSORS.match(" ".join(fields[3:])):
+        raise ValueError("Invalid node specification : " + " ".join(fields))
+    return fields[:3] + ["".join(fields[3:])]
+
+
+def _parse_nodes(tokens, nbr_functions):
+    """
+    Parses the fields of a block of node statements.
+    :param tokens: the fields "id priority player successors" of each statement.
+    :param nbr_functions: the number of priorities of each node, None to take the one of the first node.
+    :return: a tuple (ids, players, priorities, degrees, targets) of arrays, priorities is a list of arrays.
+    """
+    ids = array('i', _parse_integers(tokens[0::4]))
+    players = array('b', _parse_integers(tokens[2::4]))
+    successors = tokens[3::4]
+    degrees = array('i', [succ.count(",") + 1 for succ in successors])
+    targets = array('i', _parse_integers(successors))
+
+    if nbr_functions is None:
+        nbr_functions = tokens[1].count(",") + 1
+    all_priorities = array('i', _parse_integers(tokens[1::4]))
+    if len(all_priorities) != nbr_functions * len(ids):
+        raise ValueError("Every node must have " + str(nbr_functions) + " priorities")
+    priorities = [all_priorities[f::nbr_functions] for f in xrange(nbr_functions)]
+
+    return ids, players, priorities, degrees, targets
+
+
+def _parse_integers(fields):
+    """
+    Parses comma-separated integers. The fields are joined and decoded at once by the json module, which is much
+    faster than converting them one by one.
+    :param fields: a list of strings, each containing one or more comma-separated integers.
+    :return: the list of integers.
+    """
+    text = ",".join(fields)
+    try:
+        return json.loads("[" + text + "]")
+    except ValueError:
+        # leading zeros are not valid json
+        return [int(value) for value in text.split(",")]
+
+BINARY_MAGIC = "PGARENA\0"
+BINARY_VERSION = 1
+
+# magic, version, number of node ids n, number of edges m, number of priority functions k, first node id, number of nodes
+_BINARY_HEADER = struct.Struct("=8s6i")
+
+# type code of the array holding the values of each ctypes type of the binary format
+_TYPECODES = {ctypes.c_int32: 'i', ctypes.c_int8: 'b'}
+
+
+def is_binary_arena(path):
+    """
+    :param path: path to a file.
+    :return: True if the file is an arena in the binary format (see write_binary_arena).
+    """
+    with open(path, 'rb') as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def write_binary_arena(g, path):
+    """
+    Writes a game graph to a file specified by the path in the binary arena format. The file contains a header
+    followed by the arrays of the CompactGraph, in native byte order : the k priority arrays (n int32 each), the
+    successor offsets (n+1 int32) and targets (m int32), the predecessor offsets (n+1 int32) and targets (m int32) and
+    the players (n int8). The predecessors are stored so that loading the arena does not need any computation.
+    :param g: a CompactGraph or a Graph whose node ids are non-negative integers.
+    :param path: the file to which we write the arena.
+    """
+    if not isinstance(g, CompactGraph):
+        g = CompactGraph.from_graph(g)
+    nodes = g.node_list
+    first = nodes[0] if len(nodes) else 0
+    with open(path, 'wb') as f:
+        f.write(_BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(g.players), len(g.succ_targets),
+                                    len(g.priorities), first, len(nodes)))
+        for values in g.priorities + [g.succ_offsets, g.succ_targets, g.pred_offsets, g.pred_targets]:
+            array('i', values).tofile(f)
+        array('b', g.players).tofile(f)
+
+
+def convert_to_binary_arena(path, binary_path, generalized=False):
+    """
+    Converts a file in PGSolver format into the binary arena format.
+    :param path: path to the file in PGSolver format.
+    :param binary_path: path to the binary file to create.
+    :param generalized: if True, the file is in PGSolver format for generalized parity.
+    """
+    write_binary_arena(_load_compact(path, generalized, CHUNK_SIZE), binary_path)
+
+
+def load_binary_arena(path, mapped=False):
+    """
+    Loads a game graph from a file in the binary arena format (see write_binary_arena). Nothing is parsed : each array
+    of the CompactGraph is read from the file at once into an array of the array module, the sequence the solvers index
+    the fastest. If mapped is True, the file is memory-mapped instead and the arrays are ctypes arrays over the mapping :
+    nothing is copied and pages are read from the disk when they are accessed, which suits arenas which do not fit in
+    memory, but indexing a ctypes array is slower than indexing an array (the solvers run about 20% slower). The
+    mapping is copy-on-write, so the file is never modified.
+    :param path: path to the file.
+    :param mapped: if True, the arrays are views of the memory-mapped file instead of copies.
+    :return: a CompactGraph g corresponding to the game graph in the file.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(_BINARY_HEADER.size)
+        if len(header) < _BINARY_HEADER.size:
+            raise ValueError(path + " is not a binary arena")
+        magic, version, n, m, k, first, nbr_nodes = _BINARY_HEADER.unpack(header)
+        if magic != BINARY_MAGIC:
+            raise ValueError(path + " is not a binary arena")
+        if version != BINARY_VERSION:
+            raise ValueError(path + " has an unsupported version or was written with another byte order")
+
+        # type and length of the arrays following the header
+        layout = [(ctypes.c_int32, n)] * k + [(ctypes.c_int32, n + 1), (ctypes.c_int32, m), (ctypes.c_int32, n + 1),
+                                              (ctypes.c_int32, m), (ctypes.c_int8, n)]
+        if os.fstat(f.fileno()).st_size != _BINARY_HEADER.size + sum(ctypes.sizeof(ctype) * length
+                                                                     for ctype, length in layout):
+            raise ValueError(path + " is truncated")
+        views = []
+        if mapped:
+            # ctypes arrays over the mapping, each of them keeps a reference to it
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+            offset = _BINARY_HEADER.size
+            for ctype, length in layout:
+                views.append((ctype * length).from_buffer(mapping, offset))
+                offset += ctypes.sizeof(ctype) * length
+        else:
+            for ctype, length in layout:
+                values = array(_TYPECODES[ctype])
+                values.fromfile(f, length)
+                views.append(values)
+    priorities = views[:k]
+    succ_offsets, succ_targets, pred_offsets, pred_targets, players = views[k:]
+
+    # node ids are usually contiguous, the list of nodes then needs no pass over the players
+    node_list = xrange(first, n) if nbr_nodes == n - first else None
+    return CompactGraph(players, priorities, succ_offsets, succ_targets, pred_offsets, pred_targets, node_list)
+
 def write_solution_to_file(g, solution, player, path):
     """
     Writes the solution of a game in dot format to a file specified by the path.
@@ -3,8 +3,10 @@ This module contains general-purpose functions used in several of our algorithms
 """
 import ctypes
 import collections
+from array import array
 
-from antichains.library_linker import createGraph_c, addEdge_c, displayGraph_c
+from antichains.library_linker import createGraph_c, displayGraph_c, free_solution_c
+from graph import CompactGraph
 
 
 def opponent(j):
@@ -65,9 +67,8 @@ def i_priority_node_non_removed(g, i, removed):
     :param i: the requested priority.
     :return: a list of nodes of priority i in g except for the removed nodes.
     """
-    nodes = {k: v for k, v in g.nodes.iteritems() if not removed[k]}
     # get all node indexes in node tuple (index, (node_player, node_priority)) when node_priority is i
-    return [k for k, v in nodes.iteritems() if v[1] == i]
+    return [k for k, v in g.nodes.iteritems() if v[1] == i and not removed[k]]
 
 
 def max_priority_non_removed(g, removed):
@@ -77,10 +78,62 @@ def max_priority_non_removed(g, removed):
     :param g: a game graph.
     :return: the maximum priority in g except for the removed nodes.
     """
-    nodes = {k: v for k, v in g.nodes.items() if not removed[k]}
-    # get maximum node tuple (index, (node_player, node_priority)) according to its priority, then select its priority
-    return max(nodes.items(), key=lambda item: item[1][1])[1][1]
+    # maximum priority of the node tuples (index, (node_player, node_priority)) which are not removed, the solvers
+    # which call this at every recursion level use a graph.PriorityIndex instead
+    return max(v[1] for k, v in g.nodes.iteritems() if not removed[k])
+
+
 
+def strongly_connected_components(g):
+    """
+    Computes the strongly connected components of game graph g with Tarjan's algorithm. The depth-first search uses an
+    explicit stack so long paths do not reach the recursion limit of python.
+    :param g: a game graph.
+    :return: the list of components (lists of nodes) in reverse topological order : a component only has edges to
+    itself and to the components before it in the list, so the first one is a bottom component.
+    """
+    index = {}  # order in which the nodes are visited
+    low = {}  # smallest index of a node on the stack reachable from the node
+    on_stack = set()
+    stack = []
+    components = []
+
+    for root in g.get_nodes():
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(g.get_successors(root)))]  # nodes being visited and their successors left to consider
+
+        while work:
+            node, successors = work[-1]
+            for succ in successors:
+                if succ not in index:
+                    # the successor is visited before the other successors of node
+                    index[succ] = low[succ] = len(index)
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(g.get_successors(succ))))
+                    break
+                elif succ in on_stack and index[succ] < low[node]:
+                    low[node] = index[succ]
+            else:
+                # every successor of node was considered
+                work.pop()
+                if work and low[node] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node]
+                if low[node] == index[node]:
+                    # node is the root of a component, which is on top of the stack
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.remove(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
 
 
 def update_strategy(strat1, strat2):
@@ -134,26 +187,8 @@ def transform_graph_into_c(g):
     :param g: a game graph.
     :return: a game graph in c format and the number of nodes in that graph.
     """
-    # nbr of nodes in the graph is needed by the c structure
-    nbr_nodes = len(g.get_nodes())
-    # the c structure needs players (0 for player 0 and 1 for player 1) and priorities as arrays
-    priorities = [0]*nbr_nodes
-    players = [0]*nbr_nodes
-
-    # need to create every node before creating the edges. /!\ nodes are numbered from 0 to nbr_nodes-1 in the C struct
-    for node in g.get_nodes():
-        priorities[node-1] = g.nodes[node][1]
-        players[node-1] = g.nodes[node][0]
-
-    # creating the c graph
-    dir_graph = createGraph_c(nbr_nodes,(ctypes.c_int * len(priorities))(*priorities),(ctypes.c_int * len(players))(*players))
-
-    # adding every edge
-    for node in g.get_nodes():
-        for succ in g.get_successors(node):
-            addEdge_c(dir_graph, node-1, succ-1)
-
-    return dir_graph, nbr_nodes
+    # /!\ nodes are numbered from 0 to nbr_nodes-1 in the C struct
+    return create_c_graph(g, 1)
 
 def transform_graph_into_c_spec(g):
     """
@@ -162,27 +197,83 @@ def transform_graph_into_c_spec(g):
     :param g: a game graph.
     :return: a game graph in c format and the number of nodes in that graph.
     """
-    # nbr of nodes in the graph is needed by the c structure
-    nbr_nodes = len(g.get_nodes())
-    # the c structure needs players (0 for player 0 and 1 for player 1) and priorities
-    priorities = [0]*nbr_nodes
-    players = [0]*nbr_nodes
-
-    # need to create every node before creating the edges.
     # here nodes are already numbered from 0
-    for node in g.get_nodes():
-        priorities[node] = g.nodes[node][1]
-        players[node] = g.nodes[node][0]
+    return create_c_graph(g, 0)
 
-    # creating the c graph
-    dir_graph = createGraph_c(nbr_nodes,(ctypes.c_int * len(priorities))(*priorities),(ctypes.c_int * len(players))(*players))
+def create_c_graph(g, start_index):
+    """
+    Creates the C structure of a game graph with a single call to the c library. The graph is given to the library
+    as flat arrays : players (0 for player 0 and 1 for player 1), priorities and successors in compressed sparse row
+    format. A CompactGraph already stores its arrays in that format, they are passed to the library without
+    conversion.
+    :param g: a game graph whose nodes are numbered from start_index to start_index + n - 1.
+    :param start_index: the id of the first node, ids are shifted so nodes are numbered from 0 in the C struct.
+    :return: a game graph in c format and the number of nodes in that graph.
+    :raise ValueError: if the node ids are not start_index to start_index + n - 1.
+    """
+    # nbr of nodes in the graph is needed by the c structure
+    nodes = g.get_nodes()
+    nbr_nodes = len(nodes)
+
+    # the ids are distinct, so they are contiguous if the smallest and the largest ones are n - 1 apart
+    if nbr_nodes and (min(nodes) != start_index or max(nodes) != start_index + nbr_nodes - 1):
+        raise ValueError("The C library needs nodes numbered from " + str(start_index) + " to " +
+                         str(start_index + nbr_nodes - 1))
+
+    if isinstance(g, CompactGraph) and len(g.players) == start_index + nbr_nodes:
+        priorities = c_int_array(g.priorities[0], start_index)
+        players = c_int_array(array('i', g.players[start_index:]))
+        succ_offsets = c_int_array(g.succ_offsets, start_index)
+        succ_targets = c_int_array(g.succ_targets)
+    else:
+        priorities = array('i', [0]) * nbr_nodes
+        players = array('i', [0]) * nbr_nodes
+        succ_offsets = array('i', [0]) * (nbr_nodes + 1)
+        succ_targets = array('i')
+        for i in xrange(nbr_nodes):
+            node = i + start_index
+            priorities[i] = g.get_node_priority(node)
+            players[i] = g.get_node_player(node)
+            succ_targets.extend(g.get_successors(node))
+            succ_offsets[i + 1] = len(succ_targets)
+        priorities = c_int_array(priorities)
+        players = c_int_array(players)
+        succ_offsets = c_int_array(succ_offsets)
+        succ_targets = c_int_array(succ_targets)
+
+    # the arrays are copied by the c library, ctypes only needs to point to their memory
+    dir_graph = createGraph_c(nbr_nodes, priorities, players, succ_offsets, succ_targets, start_index)
+    return dir_graph, nbr_nodes
 
-    # adding every edge
-    for node in g.get_nodes():
-        for succ in g.get_successors(node):
-            addEdge_c(dir_graph, node, succ)
+def c_int_array(values, start=0):
+    """
+    :param values: an array of integers ('i' typecode) or a ctypes array of c_int.
+    :param start: the position of the first integer to keep.
+    :return: a ctypes array sharing the memory of values[start:].
+    """
+    return (ctypes.c_int * (len(values) - start)).from_buffer(values, start * ctypes.sizeof(ctypes.c_int))
+
+def read_solution_from_c(res, nbr_nodes, increment):
+    """
+    Reads a solution computed by the C library (by the attractor or zielonka functions) and frees it. Such a solution
+    is an array of 2*nbr_nodes integers : the player winning each node followed by the successor chosen in each node
+    by the strategy of the player winning it (-1 if the node belongs to the other player).
+    :param res: the array returned by the C library.
+    :param nbr_nodes: number of nodes in the graph.
+    :param increment: used when nodes were re-indexed so their numbering starts with 0 in the C graph.
+    :return: the solution in the following format : (W_0, sigma_0), (W_1, sigma_1).
+    """
+    regions = ([], [])
+    strategies = (collections.defaultdict(lambda: -1), collections.defaultdict(lambda: -1))
+    for i in range(nbr_nodes):
+        player = res[i]
+        regions[player].append(i + increment)
+        successor = res[nbr_nodes + i]
+        if successor != -1:
+            strategies[player][i + increment] = successor + increment
+    free_solution_c(res)
+    return (regions[0], strategies[0]), (regions[1], strategies[1])
 
-    return dir_graph, nbr_nodes
 
 def are_lists_equal(list1, list2):
     """
@@ -1,29 +1,72 @@
 """
 This module contains functions used to optimize the run time of several of our algorithms.
 """
-import copy
+from array import array
 
+from graph import CompactGraph
 
-def compress_priorities(g):
+
+def compression_map(priorities):
     """
-    :param g: a game arena
-    :return: the game arena g in which the priorities have been compressed.
+    Computes the compression of a priority function : consecutive priorities (in the order of the priorities occurring
+    in the game) of the same parity are merged and the gaps between priorities are removed. The parity of each priority
+    is kept and the smallest priority becomes 0 or 1, so the winner of every play is unchanged. The occurring
+    priorities are ordered by counting when they are dense and sorted otherwise, so this runs in linear time.
+    :param priorities: the priority of every node according to the priority function.
+    :return: a dictionary mapping each occurring priority to its compressed value.
     """
-    g_copy = copy.deepcopy(g)
-    nodes = g_copy.get_nodes_descriptors()  # Nodes from g
-    priorities = sorted(nodes.iteritems(), key=lambda x:x[1][1]) # sorts nodes per priority
-    current = priorities[0][1][1]
-    if current % 2 == 0:
-        start = 0
+    present = set(priorities)
+    if not present:
+        return {}
+    low, high = min(present), max(present)
+    if high - low < 4 * len(present):
+        ordered = [p for p in xrange(low, high + 1) if p in present]  # counting, the range is small
     else:
-        start = 1
-    val = start
-    for elem in priorities:
-        if(elem[1][1] % 2 == start):
-            g_copy.nodes[elem[0]] = tuple([elem[1][0], val])
+        ordered = sorted(present)
+
+    mapping = {}
+    parity = ordered[0] % 2
+    value = parity
+    for p in ordered:
+        if p % 2 != parity:
+            value += 1
+            parity = 1 - parity
+        mapping[p] = value
+    return mapping
+
+
+def compress_priorities(g, in_place=False):
+    """
+    Compresses every priority function of a game (see compression_map). The game is never deep-copied : the
+    priorities are rewritten in place or, if in_place is False, in a copy of the priorities only.
+    :param g: a game arena (a Graph or a CompactGraph).
+    :param in_place: if True, the priorities of g are modified.
+    :return: the game arena g in which the priorities have been compressed (g itself if in_place is True).
+    """
+    nodes = g.get_nodes()
+    if not nodes:
+        return g
+
+    if isinstance(g, CompactGraph):
+        if in_place:
+            priorities = g.priorities
         else:
-            val += 1
-            start = ((start + 1) %2)
-            g_copy.nodes[elem[0]] = tuple([elem[1][0], val])
+            # the copy shares every array of g except the priorities
+            priorities = [array('i', function) for function in g.priorities]
+            g = CompactGraph(g.players, priorities, g.succ_offsets, g.succ_targets, g.pred_offsets, g.pred_targets,
+                             g.node_list)
+        for function in priorities:
+            mapping = compression_map([function[node] for node in nodes])
+            for node in nodes:
+                function[node] = mapping[function[node]]
+        return g
 
-    return g_copy
\ No newline at end of file
+    if not in_place:
+        g = g.subgame(nodes)  # a copy of the nodes and edges of g
+    descriptors = g.get_nodes_descriptors()  # (player, priority_1, ..., priority_k) for each node
+    nbr_functions = len(descriptors[nodes[0]]) - 1
+    mappings = [compression_map([descriptors[node][i] for node in nodes]) for i in xrange(1, nbr_functions + 1)]
+    for node in nodes:
+        current = descriptors[node]
+        descriptors[node] = (current[0],) + tuple(mappings[i][current[i + 1]] for i in xrange(nbr_functions))
+    return g
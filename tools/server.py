@@ -0,0 +1,223 @@
+"""
+This module implements the server mode : requests are read as lines of JSON from an input stream, the games are solved
+by a fixed number of worker processes which stay alive between requests (the C library and the solvers are loaded
+once) and a response is written as a line of JSON for each request, as soon as it is answered.
+
+A request is a JSON object containing :
+- "id" : any value, copied in the response.
+- "file" : the path to an arena (in PGSolver or binary format), or "game" : the content of a file in PGSolver format.
+- "objective" : one of "reachability", "safety", "weak parity", "parity" and "generalized parity".
+- "player" and "target" (a list of nodes) for a reachability objective, "safe" (a list of nodes) for a safety objective
+  and optionally "algorithm" (one of the algorithms of the solve mode, recursive by default) for a parity objective
+  or ("strategies" or "regions", strategies by default) for a weak parity objective or ("classical" or "scc", classical
+  by default) for a generalized parity objective.
+- optionally "compress" : true to compress the priorities before solving a parity game.
+- optionally "timeout" : the number of seconds after which the request is abandoned (overrides the server timeout).
+
+The response is the result record of the game (see tools.batch.solve_record) along with the id of the request. A
+request which is malformed, which arrives when the queue is full or which times out is answered with a record
+containing an error field. A worker solving a request which times out (or which crashes) is replaced by a new one.
+"""
+import collections
+import json
+import multiprocessing
+import os
+import select
+import time
+
+from tools import batch
+from tools import file_handler
+
+PARITY_ALGORITHMS = ['recursive', 'safety', 'antichain', 'native', 'scc', 'promotion', 'tangle',
+                     'quasi-polynomial', 'progress-measures', 'strategy-improvement']
+WEAK_PARITY_ALGORITHMS = ['strategies', 'regions']
+GENERALIZED_PARITY_ALGORITHMS = ['classical', 'scc']
+
+
+def request_options(request):
+    """
+    Translates the objective of a request into the options of the solve mode.
+    :param request: the request, a dictionary.
+    :return: the options selecting the objective (see tools.batch.solve_game).
+    """
+    options = {'target': None, 'safe': None, 'wp': None, 'parity_algorithm': None, 'gp': False,
+               'compress': bool(request.get("compress", False))}
+    objective = request.get("objective")
+    if objective == "reachability":
+        options['target'] = [str(int(request["player"])), ",".join(str(int(node)) for node in request["target"])]
+    elif objective == "safety":
+        options['safe'] = [",".join(str(int(node)) for node in request["safe"])]
+    elif objective == "weak parity":
+        algorithm = request.get("algorithm", "strategies")
+        if algorithm not in WEAK_PARITY_ALGORITHMS:
+            raise ValueError("Unknown weak parity algorithm : " + str(algorithm))
+        options['wp'] = algorithm
+    elif objective == "parity":
+        algorithm = request.get("algorithm", "recursive")
+        if algorithm not in PARITY_ALGORITHMS:
+            raise ValueError("Unknown parity algorithm : " + str(algorithm))
+        options['parity_algorithm'] = algorithm
+    elif objective == "generalized parity":
+        algorithm = request.get("algorithm", "classical")
+        if algorithm not in GENERALIZED_PARITY_ALGORITHMS:
+            raise ValueError("Unknown generalized parity algorithm : " + str(algorithm))
+        options['gp'] = algorithm
+    else:
+        raise ValueError("Unknown objective : " + str(objective))
+    if ("file" in request) == ("game" in request):
+        raise ValueError("A request contains either a file or a game")
+    return options
+
+
+def solve_request(task):
+    """
+    Loads and solves the game of a request.
+    :param task: a tuple (request, options).
+    :return: the response to the request, a dictionary.
+    """
+    request, options = task
+    if "game" in request:
+        load = lambda: file_handler.load_compact_from_string(request["game"], options['gp'])
+    else:
+        load = lambda: file_handler.load_arena(request["file"], options['gp'])
+    return batch.solve_record({"id": request.get("id")}, load, options)
+
+
+def _work(connection):
+    """
+    Main function of a worker process : solves the tasks received on the connection until it is closed.
+    :param connection: the end of a pipe shared with the server.
+    """
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            return
+        connection.send(solve_request(task))
+
+
+class Worker(object):
+    """
+    A worker process and the request it is solving.
+    """
+
+    def __init__(self):
+        self.connection, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_work, args=(child,))
+        self.process.daemon = True
+        self.process.start()
+        child.close()
+        self.request = None
+        self.deadline = None
+
+    def start(self, task, timeout):
+        """
+        Sends a task to the worker.
+        :param task: a tuple (request, options).
+        :param timeout: the number of seconds the worker has to solve it, None for no limit.
+        """
+        self.request = task[0]
+        self.deadline = time.time() + timeout if timeout is not None else None
+        self.connection.send(task)
+
+    def stop(self):
+        """
+        Terminates the worker process.
+        """
+        self.connection.close()
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+
+
+def serve(input, output, workers=1, queue_size=16, timeout=None):
+    """
+    Answers the requests read from input until it is closed and every request is answered.
+    :param input: a file object from which the requests are read, one per line.
+    :param output: a file object in which the responses are written, one per line.
+    :param workers: the number of worker processes.
+    :param queue_size: the maximal number of requests waiting for a worker, other requests are rejected.
+    :param timeout: the default number of seconds after which a request is abandoned, None for no limit.
+    """
+    pool = [Worker() for _ in xrange(workers)]
+    pending = collections.deque()
+    fd = input.fileno()
+    closed = False
+    buffered = ""
+
+    def respond(record):
+        output.write(json.dumps(record, sort_keys=True) + "\n")
+        output.flush()
+
+    def dispatch():
+        for worker in pool:
+            if not pending:
+                return
+            if worker.request is None:
+                task, task_timeout = pending.popleft()
+                worker.start(task, task_timeout)
+
+    def accept(line):
+        if not line.strip():
+            return
+        request = {}
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                request = {}
+                raise ValueError("A request is a JSON object")
+            options = request_options(request)
+            request_timeout = float(request["timeout"]) if "timeout" in request else timeout
+        except (KeyError, TypeError, ValueError) as e:
+            respond({"id": request.get("id"), "error": "Invalid request : " + str(e)})
+            return
+        if len(pending) >= queue_size:
+            respond({"id": request.get("id"), "error": "Queue is full"})
+            return
+        pending.append(((request, options), request_timeout))
+        dispatch()
+
+    try:
+        while not closed or pending or any(worker.request is not None for worker in pool):
+            busy = [worker for worker in pool if worker.request is not None]
+            deadlines = [worker.deadline for worker in busy if worker.deadline is not None]
+            wait = max(0, min(deadlines) - time.time()) if deadlines else None
+            sources = [worker.connection for worker in busy] + ([] if closed else [fd])
+            readable = select.select(sources, [], [], wait)[0]
+
+            if fd in readable:
+                # the input is read without buffering so select only reports the requests which were not read yet
+                data = os.read(fd, 1 << 16)
+                if data:
+                    lines = (buffered + data).split("\n")
+                    buffered = lines.pop()
+                else:
+                    closed = True
+                    lines = [buffered]
+                for line in lines:
+                    accept(line)
+
+            for i in xrange(len(pool)):
+                worker = pool[i]
+                if worker not in busy:
+                    continue
+                if worker.connection in readable:
+                    try:
+                        respond(worker.connection.recv())
+                        worker.request = None
+                        continue
+                    except EOFError:
+                        error = "Worker stopped"
+                elif worker.deadline is not None and time.time() >= worker.deadline:
+                    error = "Timeout"
+                else:
+                    continue
+                # the worker is stopped while solving the request and is replaced
+                respond({"id": worker.request.get("id"), "error": error})
+                worker.stop()
+                pool[i] = Worker()
+
+            dispatch()
+    finally:
+        for worker in pool:
+            worker.stop()